@@ -2,17 +2,24 @@ import os
 import logging
 import sys
 from datetime import datetime, timedelta
-import africastalking
+import click
 from flask import Flask, request, jsonify, render_template_string
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
+from flask_migrate import Migrate, upgrade
 from flask_cors import CORS
 from dotenv import load_dotenv
 from src.models import db, User, Pregnancy, Appointment, Reminder, MessageLog
-from src.services.ussd_service import USSDService
-from src.services.sms_service import SMSService
-from src.services.ai_service import AIService
-from src.utils.language_utils import LanguageDetector
+from src.services.ai_service import classification_cache_stats, get_conversation_store, get_fuzzy_index
+from src.services.alert_service import get_alert_journal, start_alert_flusher
+from src.services.emergency_ingress import get_ingress_journal, start_ingress_flusher
+from src.services.llm_backend import get_llm_gateway
+from src.services.language_switch import get_language_tracker
+from src.services.container import get_services
+from src.utils.response_cache import get_response_cache
+from src.utils.lexicon_bundle import compile_bundle, get_lexicon_store, LEXICON_PATH
+from src.utils.phone import normalize_phone, phone_cache_stats
+from src.jobs.backfill_labels import backfill_message_labels
+from src.jobs.pregnancy_weeks import recompute_pregnancy_weeks
 
 # Load environment variables
 load_dotenv()
@@ -40,44 +47,23 @@ else:
 
 # Initialize extensions
 db.init_app(app)
-migrate = Migrate(app, db)
+migrate = Migrate(app, db, render_as_batch=True)
 
-# Initialize Africa's Talking with enhanced error handling
-username = os.getenv('AFRICASTALKING_USERNAME')
-api_key = os.getenv('AFRICASTALKING_API_KEY')
-environment = os.getenv('AFRICASTALKING_ENVIRONMENT', 'sandbox')
-shortcode = os.getenv('AFRICASTALKING_SHORTCODE', '985')
+# Services (and Africa's Talking) are built on first use, not at import.
+# The schema is migrated by the release step (`flask init-db`), not by every worker.
+services = get_services()
 
-# Initialize Africa's Talking with proper credentials
-if username and api_key and api_key != 'test_api_key_for_development':
-    try:
-        africastalking.initialize(username, api_key)
-        logger.info(f"✅ Africa's Talking initialized successfully!")
-        logger.info(f"   Username: {username}")
-        logger.info(f"   Environment: {environment}")
-        logger.info(f"   Shortcode: {shortcode}")
-        at_initialized = True
-    except Exception as e:
-        logger.error(f"⚠️  Africa's Talking initialization failed: {str(e)}")
-        logger.error("   Please check your credentials and try again")
-        at_initialized = False
-else:
-    logger.warning("⚠️  Running in development mode without valid Africa's Talking credentials")
-    at_initialized = False
-
-# Initialize services
-ussd_service = USSDService()
-sms_service = SMSService()
-ai_service = AIService()
+# Drain journalled emergency alerts into the database in the background
+try:
+    start_alert_flusher(app)
+except Exception as e:
+    logger.error(f"❌ Emergency alert flusher failed to start: {str(e)}")
 
-# Create database tables
-with app.app_context():
-    try:
-        db.create_all()
-        logger.info("✅ Database tables created/verified successfully")
-    except Exception as e:
-        logger.error(f"❌ Database initialization failed: {str(e)}")
-language_detector = LanguageDetector()
+# Apply emergencies answered at ingress (logs, users, alerts) in the background
+try:
+    start_ingress_flusher(app)
+except Exception as e:
+    logger.error(f"❌ Emergency ingress flusher failed to start: {str(e)}")
 
 @app.route('/')
 def home():
@@ -101,7 +87,7 @@ def ussd_callback():
         logger.info(f"📞 USSD Request: SessionID={session_id}, Phone={phone_number}, Text='{text}'")
         
         # Process USSD request
-        response = ussd_service.handle_request(
+        response = services.ussd.handle_request(
             session_id=session_id,
             phone_number=phone_number,
             text=text,
@@ -134,7 +120,7 @@ def sms_callback():
             return jsonify({"status": "error", "message": "Missing required parameters"}), 400
         
         # Process SMS
-        response_data = sms_service.handle_incoming_sms(
+        response_data = services.sms.handle_incoming_sms(
             from_number=from_number,
             to_number=to_number,
             text=text,
@@ -187,7 +173,7 @@ def test_sms():
             return jsonify({"error": "Phone number is required"}), 400
         
         # Send test SMS
-        result = sms_service.send_sms(phone_number, message)
+        result = services.sms.send_sms(phone_number, message)
         
         if result:
             return jsonify({
@@ -222,7 +208,7 @@ def test_sms_response():
             text = request.args.get('text', 'hi')
         
         # Clean phone number
-        clean_phone = sms_service._clean_phone_number(from_number)
+        clean_phone = normalize_phone(from_number)
         
         # Get or create user
         user = User.query.filter_by(phone_number=clean_phone).first()
@@ -238,7 +224,7 @@ def test_sms_response():
             db.session.commit()
         
         # Generate AI response
-        ai_response = sms_service._process_sms_content(text.lower(), user)
+        ai_response = services.sms._process_sms_content(text.lower(), user)
         
         # Log for debugging
         logger.info(f"🧪 Test SMS: '{text}' → '{ai_response[:50]}...'")
@@ -447,7 +433,7 @@ def test_dashboard():
 def send_reminders():
     """Endpoint to manually trigger reminder sending (for testing)"""
     try:
-        sent_count = sms_service.send_scheduled_reminders()
+        sent_count = services.sms.send_scheduled_reminders()
         return jsonify({
             "status": "success",
             "reminders_sent": sent_count
@@ -476,16 +462,16 @@ def chat_with_ai():
             return jsonify({"error": "Phone number is required"}), 400
         
         # Clean phone number
-        clean_phone = ussd_service._clean_phone_number(phone_number)
+        clean_phone = normalize_phone(phone_number)
         
         # Get or create user
-        user = ussd_service._get_or_create_user(clean_phone)
+        user = services.ussd._get_or_create_user(clean_phone)
         
         # Get conversation history if provided
         conversation_history = data.get('conversation_history', [])
         
         # Process message with AI
-        response = ai_service.chat_with_ai(message, user, conversation_history)
+        response = services.ai.chat_with_ai(message, user, conversation_history)
         
         return jsonify({
             "status": "success",
@@ -897,10 +883,10 @@ def health_check():
     
     # Check Africa's Talking status
     at_status = {
-        "status": "configured" if at_initialized else "not_configured",
-        "username": username,
-        "environment": environment,
-        "shortcode": shortcode
+        "status": "configured" if services.at_initialized else "not_configured",
+        "username": services.at_username,
+        "environment": services.at_environment,
+        "shortcode": services.at_shortcode
     }
       # System information
     system_info = {
@@ -955,6 +941,18 @@ def system_stats():
             },
             "messages": {
                 "total": MessageLog.query.count() if 'MessageLog' in globals() else 0
+            },
+            "classification_cache": classification_cache_stats(),
+            "fuzzy_triage": get_fuzzy_index().stats(),
+            "llm": get_llm_gateway().stats() if get_llm_gateway() else None,
+            "response_cache": get_response_cache().stats(),
+            "conversations": get_conversation_store().stats(),
+            "lexicon": get_lexicon_store().stats(),
+            "language_switch": get_language_tracker().stats(),
+            "phone_cache": phone_cache_stats(),
+            "journals": {
+                "alerts": get_alert_journal().stats(),
+                "emergency_ingress": get_ingress_journal().stats()
             }
         }
         
@@ -970,6 +968,51 @@ def system_stats():
             "timestamp": datetime.utcnow().isoformat()
         }), 500
 
+@app.cli.command('init-db')
+def init_db_command():
+    """Migrate the database to the current schema (run once per release, not in every worker)"""
+    upgrade()
+    logger.info("✅ Database schema migrated successfully")
+
+@app.cli.command('backfill-labels')
+@click.option('--chunk-size', default=5000, help='Rows read and written per chunk')
+@click.option('--workers', default=None, type=int, help='Classifier processes (0 = in-process)')
+@click.option('--after-id', default=0, help='Resume after this message_logs id')
+def backfill_labels_command(chunk_size, workers, after_id):
+    """Re-label incoming messages with the current keyword lexicon"""
+    labelled = backfill_message_labels(chunk_size=chunk_size, workers=workers, after_id=after_id)
+    logger.info(f"✅ Labelled {labelled} incoming messages")
+
+@app.cli.command('recompute-weeks')
+@click.option('--chunk-size', default=50000, help='Pregnancies updated per statement')
+def recompute_weeks_command(chunk_size):
+    """Refresh weeks_pregnant and past-term flags from due dates (run nightly)"""
+    changed = recompute_pregnancy_weeks(chunk_size=chunk_size)
+    logger.info(f"✅ Updated gestational weeks for {changed} pregnancies")
+
+@app.cli.command('send-weekly-updates')
+def send_weekly_updates_command():
+    """Text every active pregnancy its week-by-week content (run daily)"""
+    sent = services.sms.send_weekly_updates()
+    logger.info(f"✅ Sent {sent} weekly pregnancy updates")
+
+@app.cli.command('train-langid')
+@click.option('--output', default=None, help='Model path (defaults to LANGID_MODEL_PATH)')
+@click.option('--log-limit', default=50000, help='Most recent incoming messages to learn from')
+def train_langid_command(output, log_limit):
+    """Train the language identifier from bundled text and message logs (restart workers to load it)"""
+    from src.jobs.train_langid import train_language_model
+    examples = train_language_model(output, log_limit)
+    logger.info(f"✅ Trained language model on {examples} examples")
+
+@app.cli.command('compile-lexicon')
+@click.option('--source', default=None, help='JSON bundle (defaults to src/data/lexicon.json)')
+@click.option('--output', default=None, help=f'Artifact path (defaults to {LEXICON_PATH})')
+def compile_lexicon_command(source, output):
+    """Compile the keyword and content bundle; running workers pick it up without a restart"""
+    version = compile_bundle(source, output)
+    logger.info(f"✅ Compiled lexicon version {version} to {output or LEXICON_PATH}")
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({"error": "Not found"}), 404
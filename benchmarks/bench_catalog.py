@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Message Catalog Benchmark for MAMA-AI
+Compares the original get_translation, which rebuilt a dict literal of every
+message on each call, with lookups in the compiled catalog, and times
+placeholder rendering against str.format.
+
+Usage: python benchmarks/bench_catalog.py [rounds]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROUNDS = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+os.environ.setdefault('LEXICON_PATH', os.path.join(tempfile.mkdtemp(), 'lexicon.bin'))
+
+from src.utils.catalog import get_catalog, render
+from src.utils.lexicon_bundle import get_lexicon, load_source
+
+KEYS = [('en', 'main_menu'), ('sw', 'health_menu'), ('en', 'invalid_choice'), ('sw', 'settings_menu')]
+PARAMS = {'date': '2026-11-02 09:00', 'type': 'scan', 'location': 'Kibera Health Centre'}
+
+
+def legacy_get_translation():
+    """The original function: a dict literal of every message, rebuilt per call"""
+    translations = load_source()['translations']
+    literal = '{' + ', '.join(
+        f"{lang!r}: {{" + ', '.join(f"{key!r}: {text!r}" for key, text in table.items()) + '}'
+        for lang, table in translations.items()
+    ) + '}'
+    namespace = {}
+    exec(
+        "def get_translation(language, key, default_text):\n"
+        f"    translations = {literal}\n"
+        "    return translations.get(language, {}).get(key, default_text)\n",
+        namespace
+    )
+    return namespace['get_translation']
+
+
+def per_call(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e9
+
+
+def main():
+    print("📖 MAMA-AI Message Catalog Benchmark")
+    print("=" * 60)
+
+    legacy = legacy_get_translation()
+    catalog = get_catalog()
+    lexicon = get_lexicon()
+    lang, key = KEYS[0]
+    rounds = ROUNDS
+    assert legacy(lang, key, '') == render(lang, key) == catalog.template(lang, key).text
+
+    print(f"{'lookup':<42} {'ns/call':>10}")
+    rows = [
+        ("dict literal rebuilt per call (old)", lambda: legacy(lang, key, '')),
+        ("mapped message table (binary search)", lambda: lexicon.messages[lang].get(key)),
+        ("render(lang, key) incl. live-lexicon check", lambda: render(lang, key)),
+        ("catalog table lookup", lambda: catalog.template(lang, key)),
+    ]
+    for name, fn in rows:
+        print(f"{name:<42} {per_call(fn, rounds):>10.0f}")
+
+    hop = sum(per_call(lambda: legacy(l, k, ''), rounds // 10) for l, k in KEYS)
+    print(f"\n{len(KEYS)} lookups per USSD hop, old:   {hop / 1000:8.2f} µs")
+    hop = sum(per_call(lambda: render(l, k), rounds // 10) for l, k in KEYS)
+    print(f"{len(KEYS)} lookups per USSD hop, render: {hop / 1000:8.2f} µs")
+
+    text = catalog.template('sw', 'next_appointment').text
+    assert render('sw', 'next_appointment', **PARAMS) == text.format(**PARAMS)
+    print(f"\n{'placeholders (3 fields)':<42} {'ns/call':>10}")
+    print(f"{'str.format on the raw text':<42} {per_call(lambda: text.format(**PARAMS), rounds):>10.0f}")
+    print(f"{'render(sw, next_appointment, ...)':<42} "
+          f"{per_call(lambda: render('sw', 'next_appointment', **PARAMS), rounds):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
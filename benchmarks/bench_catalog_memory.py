@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Message Catalog Memory Benchmark for MAMA-AI
+Measures what a worker's RSS grows by when it loads a four-language message
+catalog: decoded from JSON into per-process dicts and parsed up front (the
+old translations section) versus mapped from the binary artifact, with a
+language's messages parsed only as they are first rendered. Each case runs
+in a fresh interpreter; RssFile pages of the mapped artifact are shared by
+every worker through the page cache.
+
+Usage: python benchmarks/bench_catalog_memory.py [messages_per_language]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.utils.lexicon_bundle import compile_bundle, load_source
+
+MESSAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+LANGUAGES = ('en', 'sw', 'luo', 'ki')
+# Messages a worker typically renders per language: the menus plus the advice users ask for
+IN_USE = 200
+
+# Runs in the child: set up, then print RSS deltas (kB) around the measured step
+CHILD = r"""
+import gc, json, sys
+sys.path.insert(0, {root!r})
+from src.utils.catalog import Catalog
+from src.utils.lexicon_bundle import Lexicon
+
+def rss():
+    fields = {{}}
+    with open('/proc/self/status') as status:
+        for line in status:
+            name, _, value = line.partition(':')
+            if name in ('VmRSS', 'RssAnon', 'RssFile'):
+                fields[name] = int(value.split()[0])
+    return fields
+
+mode, path, used, count = sys.argv[1], sys.argv[2], sys.argv[3].split(','), int(sys.argv[4])
+keys = ['main_menu'] + ['advice_%05d' % index for index in range(count - 1)]
+gc.collect()
+before = rss()
+if mode == 'json':
+    with open(path, encoding='utf-8') as source:
+        catalog = Catalog(json.load(source)['translations'])
+else:
+    lexicon = Lexicon.open(path)
+    catalog = Catalog(lexicon.messages, check=False)
+for lang in used:
+    for key in keys:
+        catalog.template(lang, key)
+gc.collect()
+after = rss()
+print(json.dumps({{name: after[name] - before[name] for name in after}}))
+"""
+
+
+def synthetic_bundle(messages):
+    """The bundled lexicon plus `messages` advice entries in every language"""
+    bundle = load_source()
+    base = list(bundle['translations']['en'].values()) + list(bundle['translations']['sw'].values())
+    translations = {}
+    for lang in LANGUAGES:
+        table = dict(bundle['translations'].get(lang, bundle['translations']['en']))
+        for index in range(messages):
+            table[f'advice_{index:05d}'] = f"[{lang} {index}] {base[index % len(base)]}"
+        translations[lang] = table
+    for lang in LANGUAGES[1:]:
+        # Other languages must not add keys English lacks
+        translations['en'].update({key: text for key, text in translations[lang].items()
+                                   if key not in translations['en']})
+    bundle['translations'] = translations
+    return bundle
+
+
+def measure(mode, path, used, count):
+    result = subprocess.run([sys.executable, '-c', CHILD.format(root=ROOT), mode, path, ','.join(used), str(count)],
+                            check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main():
+    print("🧠 MAMA-AI Message Catalog Memory Benchmark")
+    print("=" * 72)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        source = os.path.join(workdir, 'lexicon.json')
+        artifact = os.path.join(workdir, 'lexicon.bin')
+        with open(source, 'w', encoding='utf-8') as out:
+            json.dump(synthetic_bundle(MESSAGES), out, ensure_ascii=False)
+        compile_bundle(source, artifact)
+
+        print(f"{len(LANGUAGES)} languages x {MESSAGES} messages; "
+              f"JSON {os.path.getsize(source) / 1024:.0f} kB, artifact {os.path.getsize(artifact) / 1024:.0f} kB")
+        print(f"\n{'per-worker RSS growth (kB)':<44} {'VmRSS':>8} {'RssAnon':>8} {'RssFile':>8}")
+        cases = [
+            ("JSON dicts, all parsed up front (before)", 'json', LANGUAGES[:1], 1),
+            (f"mapped, 1 language, {IN_USE} messages used", 'mapped', LANGUAGES[:1], IN_USE),
+            (f"mapped, 4 languages, {IN_USE} messages used", 'mapped', LANGUAGES, IN_USE),
+            (f"mapped, 4 languages, every message used", 'mapped', LANGUAGES, MESSAGES + 1),
+        ]
+        for name, mode, used, count in cases:
+            growth = measure(mode, source if mode == 'json' else artifact, used, count)
+            print(f"{name:<44} {growth['VmRSS']:>8} {growth['RssAnon']:>8} {growth['RssFile']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Emergency Ingress Benchmark for MAMA-AI
+Times the reply to a USSD emergency symptom report on the old path (log,
+look up the user, triage, log the reply) and on the ingress fast path (screen
+the raw text, answer from the fixed reply, journal the rest), while every
+database statement is slowed down to mimic a loaded or failing database.
+
+Usage: python benchmarks/bench_emergency_ingress.py [requests]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event
+from src.models import db
+from src.services import alert_service, emergency_ingress
+from src.services.ussd_service import USSDService
+from src.utils.phone import normalize_phone
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+DB_DELAYS_MS = (0, 5, 50)
+TEXT = '2*1*I have severe bleeding'
+
+
+def legacy_request(ussd, session_id, phone_number, text):
+    """The old order of work: everything before the emergency check touches the database"""
+    ussd._log_message(phone_number, "USSD", "incoming", text, session_id)
+    user = ussd._get_or_create_user(normalize_phone(phone_number))
+    response = ussd._handle_deep_menu(text.split('*'), user, session_id)
+    ussd._log_message(phone_number, "USSD", "outgoing", response, session_id)
+    return response
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    print("🚨 MAMA-AI Emergency Ingress Benchmark")
+    print("=" * 72)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        alert_service.ALERT_JOURNAL_PATH = os.path.join(workdir, 'alerts.jsonl')
+        emergency_ingress.EMERGENCY_INGRESS_JOURNAL_PATH = os.path.join(workdir, 'ingress.jsonl')
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            ussd = USSDService()
+            delay = [0.0]
+            event.listen(db.engine, 'before_cursor_execute', lambda *args: time.sleep(delay[0]))
+
+            # Warm the lexicon, catalog, matchers and language model
+            legacy_request(ussd, 'warm', '0700000000', TEXT)
+            ussd.handle_request('warm', '0700000000', TEXT, '*384#')
+
+            print(f"{REQUESTS} emergency reports per case, reply latency in ms")
+            print(f"{'db delay/stmt':<14} {'path':<26} {'p50':>8} {'p99':>8}")
+            for delay_ms in DB_DELAYS_MS:
+                delay[0] = delay_ms / 1000
+                for name, handle in [
+                    ("log + lookup first (old)", lambda i: legacy_request(ussd, f's{i}', f'07{i:08d}', TEXT)),
+                    ("ingress fast path", lambda i: ussd.handle_request(f's{i}', f'07{i:08d}', TEXT, '*384#')),
+                ]:
+                    samples = []
+                    for index in range(REQUESTS):
+                        start = time.perf_counter()
+                        handle(index)
+                        samples.append((time.perf_counter() - start) * 1000)
+                    p50, p99 = percentiles(samples)
+                    print(f"{str(delay_ms) + ' ms':<14} {name:<26} {p50:>8.2f} {p99:>8.2f}")
+
+            delay[0] = 0.0
+            start = time.perf_counter()
+            applied = emergency_ingress.get_ingress_journal().flush()
+            print(f"\nbackground flush applied {applied} journalled emergencies in "
+                  f"{(time.perf_counter() - start) * 1000:.0f} ms")
+            alert_service.reset_alert_journal()
+            emergency_ingress.reset_ingress_journal()
+
+
+if __name__ == "__main__":
+    main()
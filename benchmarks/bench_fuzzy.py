@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Typo-Tolerant Triage Benchmark for MAMA-AI
+Measures build time, per-message lookup cost and typo recall of the
+deletion index for several edit-distance settings.
+
+Usage: python benchmarks/bench_fuzzy.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.common_words import KNOWN_WORDS
+from src.utils.fuzzy_index import DeletionIndex
+from src.services.ai_service import _triage_lexicon
+from src.utils.lexicon_bundle import Lexicon
+
+TYPOS = [
+    ("bleedin since morning", 'high_risk'),
+    ("damu nyngi inatoka", 'emergency'),
+    ("bad hedache today", 'high_risk'),
+    ("maumivo makali tumboni", 'emergency'),
+    ("blured vision and dizzy", 'emergency'),
+    ("my water brok", 'emergency'),
+    ("reduced movment of baby", 'high_risk'),
+    ("contractons every 5 minutes", 'high_risk'),
+]
+CLEAN = [
+    "I never feel at home in the evenings",
+    "hello, when is my next clinic visit?",
+    "naweza kula mayai wakati wa ujauzito",
+    "my baby is kicking a lot this evening, is that normal",
+    "thank you for the reminder yesterday",
+    "I am selling vegetables at the market",
+    "we went camping and the kitchen was smelling of smoke",
+]
+CONFIGS = [
+    {'max_distance': 1, 'min_length': 6, 'min_length_2': 10},
+    {'max_distance': 2, 'min_length': 6, 'min_length_2': 10},
+    {'max_distance': 2, 'min_length': 5, 'min_length_2': 8},
+]
+ROUNDS = 500
+
+
+def main():
+    print("🔎 MAMA-AI Typo-Tolerant Triage Benchmark")
+    print("=" * 78)
+    print(f"{'config':<34} {'build ms':>9} {'µs/msg':>8} {'recall':>8} {'false hits':>11}")
+
+    for config in CONFIGS:
+        start = time.perf_counter()
+        index = DeletionIndex(_triage_lexicon(Lexicon.from_source()), known_words=KNOWN_WORDS, **config)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        messages = [text for text, _ in TYPOS] + CLEAN
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for message in messages:
+                index.find_all(message)
+        per_message = (time.perf_counter() - start) / (ROUNDS * len(messages)) * 1e6
+
+        recalled = sum(
+            1 for text, tier in TYPOS
+            if tier in {match.label for match in index.find_all(text)}
+        )
+        false_hits = sum(1 for text in CLEAN if index.find_all(text))
+
+        label = ', '.join(f"{key}={value}" for key, value in config.items())
+        label = label.replace('max_distance', 'd').replace('min_length_2', 'len2').replace('min_length', 'len1')
+        print(f"{label:<34} {build_ms:>9.2f} {per_message:>8.1f} "
+              f"{recalled:>5}/{len(TYPOS)} {false_hits:>8}/{len(CLEAN)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Worker Boot (Import Time) Benchmark for MAMA-AI
+Imports `app` in fresh interpreters, as a gunicorn worker does, and
+compares it with the same import preceded by the eager NLTK imports that
+language_utils used to do. Also lists the slowest imports from
+`python -X importtime`.
+
+Usage: python benchmarks/bench_import_time.py [runs]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+EAGER_NLTK = "import nltk; from nltk.corpus import stopwords; from nltk.tokenize import word_tokenize; "
+TOP_IMPORTS = 10
+
+
+def boot_env(workdir):
+    """Environment that keeps the databases, journal and artifacts out of the repo"""
+    env = dict(os.environ)
+    env.update({
+        'PYTHONPATH': ROOT,
+        'DATABASE_URL': f"sqlite:///{os.path.join(workdir, 'boot.db')}",
+        'ALERT_JOURNAL_PATH': os.path.join(workdir, 'alerts.jsonl'),
+        'EMERGENCY_INGRESS_JOURNAL_PATH': os.path.join(workdir, 'ingress.jsonl'),
+        'LEXICON_PATH': os.path.join(workdir, 'lexicon.bin'),
+        'LANGID_MODEL_PATH': os.path.join(workdir, 'langid.npz'),
+    })
+    return env
+
+
+def time_import(code, workdir, runs):
+    """Best time to run code in a fresh interpreter, measured inside it"""
+    timed = f"import time; start = time.perf_counter(); {code}; print(time.perf_counter() - start)"
+    best = None
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', timed], cwd=workdir, env=boot_env(workdir),
+                                check=True, capture_output=True, text=True)
+        elapsed = float(result.stdout.split()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def slowest_imports(workdir):
+    """(cumulative µs, module) for the imports made directly by app that cost the most"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            cwd=workdir, env=boot_env(workdir), check=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        # importtime indents nested imports by two spaces per level
+        depth = (len(module) - len(module.lstrip(' ')) - 1) // 2
+        if depth == 1:
+            rows.append((int(cumulative), module.strip()))
+    return sorted(rows, reverse=True)[:TOP_IMPORTS]
+
+
+def main():
+    print("⏱️  MAMA-AI Worker Boot Benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        lazy = time_import("import app", workdir, RUNS)
+        eager = time_import(EAGER_NLTK + "import app", workdir, RUNS)
+        nltk_enabled = 'nltk' in subprocess.run(
+            [sys.executable, '-c', "import sys, app; print(' '.join(sys.modules))"],
+            cwd=workdir, env=boot_env(workdir), check=True, capture_output=True, text=True
+        ).stdout.split()
+
+        print(f"import app (NLTK lazy):       {lazy * 1000:8.0f} ms")
+        print(f"import app (NLTK eager, old): {eager * 1000:8.0f} ms")
+        print(f"Saved per worker boot:        {(eager - lazy) * 1000:8.0f} ms "
+              f"({(eager - lazy) / eager:.0%} of the old import)")
+        print(f"nltk imported by app:         {'yes' if nltk_enabled else 'no'}")
+
+        print(f"\nSlowest imports made by app (cumulative):")
+        for cumulative, module in slowest_imports(workdir):
+            print(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Language Identification Benchmark for MAMA-AI
+Compares the character n-gram naive Bayes model with the old keyword-list
+detector on held-out SMS-style messages (including Sheng and code-switched
+text), and measures single-text latency and batch throughput.
+
+Usage: python benchmarks/bench_language_id.py
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.language_id import NgramLanguageModel, bundled_corpus
+
+# Not in the training data; code-switched messages are labelled by their matrix language
+HELD_OUT = [
+    ("I have a terrible stomach ache", 'en'),
+    ("my ankles look puffy tonight", 'en'),
+    ("is it ok to drink tea while pregnant", 'en'),
+    ("the nurse said my blood pressure is high", 'en'),
+    ("she told me to come back next week", 'en'),
+    ("I keep getting cramps in my legs", 'en'),
+    ("please remind me about my scan", 'en'),
+    ("can my sister come with me to the clinic", 'en'),
+    ("I lost my clinic card", 'en'),
+    ("feeling much better today thanks", 'en'),
+    ("what time does the hospital open", 'en'),
+    ("my mama says I should rest more", 'en'),
+    ("nilienda hospitali jana usiku", 'sw'),
+    ("tumbo linauma sana tangu asubuhi", 'sw'),
+    ("naomba ushauri kuhusu chakula", 'sw'),
+    ("mtoto wangu hachezi kama kawaida", 'sw'),
+    ("nimepata homa kali leo", 'sw'),
+    ("daktari aliniambia nipumzike", 'sw'),
+    ("nataka kujua kama ni salama kusafiri", 'sw'),
+    ("dada yangu atanisindikiza kliniki", 'sw'),
+    ("nimekuwa nikitapika siku tatu", 'sw'),
+    ("niko na shida ya kupumua", 'sw'),
+    ("msee leo naskia poa kiasi", 'sw'),
+    ("sina doh ya kwenda clinic leo", 'sw'),
+    ("nimeona damu kidogo asubuhi hii", 'sw'),
+    ("bibi yangu anasema nile mboga", 'sw'),
+    ("nikona headache tangu jana", 'sw'),
+    ("mtoto amekuwa akikick sana usiku", 'sw'),
+    ("nimebook appointment ya wiki ijayo", 'sw'),
+    ("si nitaenda kesho morning", 'sw'),
+]
+ROUNDS = 200
+
+
+class KeywordDetector:
+    """The detector this model replaced: counts hits in two fixed word lists"""
+
+    swahili_keywords = [
+        'habari', 'mambo', 'salam', 'shikamoo', 'hujambo',
+        'maumivu', 'damu', 'mtoto', 'mama', 'daktari',
+        'hospitali', 'ugonjwa', 'afya', 'maji', 'chakula',
+        'ujauzito', 'mimba', 'kujifungua', 'kitanda',
+        'dawa', 'vidole', 'miguu', 'kichwa', 'tumbo'
+    ]
+    english_keywords = [
+        'hello', 'hi', 'good', 'morning', 'afternoon',
+        'pain', 'blood', 'baby', 'mother', 'doctor',
+        'hospital', 'sick', 'health', 'water', 'food',
+        'pregnancy', 'pregnant', 'delivery', 'birth',
+        'medicine', 'fingers', 'legs', 'head', 'stomach'
+    ]
+
+    def detect_language(self, text):
+        words = re.findall(r'\b\w+\b', text.lower())
+        swahili_count = sum(1 for word in words if word in self.swahili_keywords)
+        english_count = sum(1 for word in words if word in self.english_keywords)
+        return 'sw' if swahili_count > english_count else 'en'
+
+
+def main():
+    print("🌍 MAMA-AI Language Identification Benchmark")
+    print("=" * 64)
+
+    start = time.perf_counter()
+    texts, labels = zip(*bundled_corpus())
+    model = NgramLanguageModel.train(texts, labels)
+    train_ms = (time.perf_counter() - start) * 1000
+    print(f"Trained on {len(texts)} texts, {len(model.vocabulary):,} features in {train_ms:.0f} ms")
+
+    baseline = KeywordDetector()
+    messages = [text for text, _ in HELD_OUT]
+    print(f"\n{'detector':<22} {'accuracy':>9} {'cold µs':>8} {'µs/text':>8} {'batch µs/text':>14}")
+
+    rows = [
+        ('keyword lists', baseline.detect_language, None, lambda: None),
+        ('n-gram naive Bayes', lambda text: model.predict(text)[0],
+         lambda batch: [lang for lang, _ in model.predict_batch(batch)],
+         model._word_cache.clear),
+    ]
+    for name, detect, detect_batch, clear_cache in rows:
+        # Cold: every word of the text is new to the per-word score cache
+        start = time.perf_counter()
+        for text in messages:
+            clear_cache()
+            detect(text)
+        cold = (time.perf_counter() - start) / len(messages) * 1e6
+
+        correct = sum(1 for text, lang in HELD_OUT if detect(text) == lang)
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for text in messages:
+                detect(text)
+        single = (time.perf_counter() - start) / (ROUNDS * len(messages)) * 1e6
+
+        batch = '-'
+        if detect_batch:
+            bulk = messages * 100
+            assert detect_batch(messages) == [detect(text) for text in messages]
+            start = time.perf_counter()
+            for _ in range(ROUNDS // 20):
+                detect_batch(bulk)
+            batch = f"{(time.perf_counter() - start) / (ROUNDS // 20 * len(bulk)) * 1e6:.1f}"
+
+        print(f"{name:<22} {correct:>5}/{len(HELD_OUT)} {cold:>8.1f} {single:>8.1f} {batch:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Phone Number Normalizer Benchmark for MAMA-AI
+Normalizes 1M Kenyan numbers two ways: webhook traffic (gateway-formatted
+numbers from a set of active users) through the cached single-number path,
+and a mixed-format import list through normalize_many. Both are compared
+with the old per-character cleanup and an uncached phonenumbers parse.
+
+Usage: python benchmarks/bench_phone.py [numbers]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.phone import _parse, normalize_many, normalize_phone, phone_cache_stats, reset_phone_cache
+
+NUMBERS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+DISTINCT = NUMBERS // 5
+# Users texting in during a cache lifetime; fits the default PHONE_CACHE_SIZE
+ACTIVE_USERS = 50_000
+# The uncached parser is timed on a sample and reported per number
+PARSE_SAMPLE = 50_000
+FORMS = ('0{}', '+254{}', '254{}', '0{} ', '+254 {}', '{}')
+
+
+def legacy_clean(phone_number):
+    """The old _clean_phone_number"""
+    clean = ''.join(c for c in phone_number if c.isdigit() or c == '+')
+    if not clean.startswith('+'):
+        if clean.startswith('0'):
+            clean = '+254' + clean[1:]
+        elif clean.startswith('254'):
+            clean = '+' + clean
+        else:
+            clean = '+254' + clean
+    return clean
+
+
+def subscribers(count, seed=7):
+    rng = random.Random(seed)
+    return [f"7{rng.randrange(10 ** 8):08d}" for _ in range(count)]
+
+
+def import_list(count, distinct, seed=7):
+    """count numbers drawn from `distinct` subscribers, each written in a random form"""
+    rng = random.Random(seed)
+    people = subscribers(distinct, seed)
+    numbers = []
+    for _ in range(count):
+        national = rng.choice(people)
+        numbers.append(rng.choice(FORMS).format(national[:3] + ' ' + national[3:] if rng.random() < 0.2 else national))
+    return numbers
+
+
+def webhook_traffic(count, users, seed=11):
+    """count inbound messages from `users` active users, as the gateway formats them"""
+    rng = random.Random(seed)
+    people = ['+254' + national for national in subscribers(users, seed)]
+    return [rng.choice(people) for _ in range(count)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    print("📱 MAMA-AI Phone Number Normalizer Benchmark")
+    print("=" * 80)
+
+    traffic = webhook_traffic(NUMBERS, ACTIVE_USERS)
+    imports = import_list(NUMBERS, DISTINCT)
+    sample = imports[:PARSE_SAMPLE]
+    print(f"webhook traffic: {len(traffic):,} messages from {ACTIVE_USERS:,} users")
+    print(f"import list:     {len(imports):,} numbers, {len(set(imports)):,} distinct strings, "
+          f"{DISTINCT:,} subscribers")
+
+    reset_phone_cache()
+    single_seconds, _ = timed(lambda: [normalize_phone(number) for number in traffic])
+    bulk_seconds, bulk = timed(lambda: normalize_many(imports))
+    assert bulk[:PARSE_SAMPLE] == [_parse(number, 'KE') for number in sample]
+
+    rows = [
+        ("webhook", "per-character cleanup (old, +254 only)",
+         timed(lambda: [legacy_clean(number) for number in traffic])[0], NUMBERS),
+        ("webhook", "normalize_phone (cached)", single_seconds, NUMBERS),
+        ("import", "per-character cleanup (old, +254 only)",
+         timed(lambda: [legacy_clean(number) for number in imports])[0], NUMBERS),
+        ("import", "phonenumbers parse, uncached", timed(lambda: [_parse(n, 'KE') for n in sample])[0], PARSE_SAMPLE),
+        ("import", "normalize_many", bulk_seconds, NUMBERS),
+    ]
+    print(f"\n{'input':<8} {'path':<40} {'numbers/s':>12} {'µs/number':>10} {'per 1M':>8}")
+    for workload, name, seconds, count in rows:
+        per_number = seconds / count
+        print(f"{workload:<8} {name:<40} {1 / per_number:>12,.0f} {per_number * 1e6:>10.2f} "
+              f"{per_number * 1e6:>6.1f} s")
+    stats = phone_cache_stats()
+    print(f"\nsingle-path cache: {stats['hits']:,} hits, {stats['misses']:,} misses")
+
+
+if __name__ == "__main__":
+    main()
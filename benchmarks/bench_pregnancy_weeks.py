@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Gestational Week Recompute Benchmark for MAMA-AI
+Loads N active pregnancies into a throwaway SQLite database and compares the
+chunked set-based UPDATE with loading and saving ORM objects one by one.
+The ORM loop runs on a sample and is extrapolated to N rows.
+
+Usage: python benchmarks/bench_pregnancy_weeks.py [rows] [orm_sample]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert
+from src.models import db, User, Pregnancy
+from src.jobs.pregnancy_weeks import gestational_week, recompute_pregnancy_weeks
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+ORM_SAMPLE = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+INSERT_BATCH = 50_000
+TODAY = date.today()
+
+
+def seed(rows):
+    """Insert one user and `rows` pregnancies with due dates spread over ten months"""
+    rng = random.Random(42)
+    db.session.execute(insert(User), [{'id': 1, 'phone_number': '+254700000000'}])
+    now = datetime.utcnow()
+    for start in range(0, rows, INSERT_BATCH):
+        db.session.execute(insert(Pregnancy), [
+            {'user_id': 1, 'due_date': TODAY + timedelta(days=rng.randint(-30, 280)),
+             'weeks_pregnant': None, 'is_active': True, 'created_at': now, 'updated_at': now}
+            for _ in range(min(INSERT_BATCH, rows - start))
+        ])
+    db.session.commit()
+
+
+def orm_one_by_one(limit):
+    """The naive job: load every pregnancy and assign its week in Python"""
+    for pregnancy in Pregnancy.query.filter_by(is_active=True).limit(limit):
+        # +1 so every sampled row really is written, as on a first run
+        pregnancy.weeks_pregnant = gestational_week(pregnancy.due_date, TODAY) + 1
+        pregnancy.is_past_term = pregnancy.due_date <= TODAY - timedelta(days=14)
+    db.session.commit()
+
+
+def main():
+    print("📅 MAMA-AI Gestational Week Recompute Benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp, 'weeks.db')}"
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            start = time.perf_counter()
+            seed(ROWS)
+            print(f"Seeded {ROWS:,} active pregnancies in {time.perf_counter() - start:.1f}s")
+
+            start = time.perf_counter()
+            changed = recompute_pregnancy_weeks(today=TODAY)
+            set_based = time.perf_counter() - start
+            print(f"Set-based UPDATE, first run:    {set_based:8.2f}s  ({changed:,} rows changed)")
+
+            start = time.perf_counter()
+            changed = recompute_pregnancy_weeks(today=TODAY + timedelta(days=1))
+            nightly = time.perf_counter() - start
+            print(f"Set-based UPDATE, next night:   {nightly:8.2f}s  ({changed:,} rows changed)")
+
+            sample = min(ORM_SAMPLE, ROWS)
+            start = time.perf_counter()
+            orm_one_by_one(sample)
+            per_row = (time.perf_counter() - start) / sample
+            estimate = per_row * ROWS
+            print(f"ORM one by one ({sample:,} sampled): {estimate:8.2f}s  estimated for {ROWS:,} rows")
+            print(f"Speed-up over ORM loop: {estimate / set_based:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Phrase Translation Benchmark for MAMA-AI
+Compares the old translate_text (lower-case the text, then one str.replace
+per phrase) with the single-pass trie regex on templated broadcast messages,
+with the bundled phrase table and with a large synthetic one.
+
+Usage: python benchmarks/bench_translate.py [messages]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.phrase_translator import PhraseTranslator, load_phrase_tables
+from src.utils.weekly_content import WEEKLY_CONTENT
+
+MESSAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+NAMES = ['Amina', 'Wanjiru', 'Achieng', 'Fatuma', 'Njeri', 'Halima', 'Akinyi', 'Zawadi']
+LARGE_TABLE = 2000
+
+
+def legacy_translate(text, translations):
+    """The old implementation"""
+    translated = text.lower()
+    for en_word, sw_word in translations.items():
+        translated = translated.replace(en_word, sw_word)
+    return translated
+
+
+def broadcast(messages):
+    """Personalised weekly-update broadcasts, as the weekly SMS job builds them"""
+    weekly = [content.text.text for content in WEEKLY_CONTENT.values() if content.lang == 'en']
+    return [
+        f"Hello {NAMES[index % len(NAMES)]}! {weekly[index % len(weekly)]} "
+        f"Reply HELP for help, or call your doctor or the hospital if you have pain or bleeding. "
+        f"Your next appointment reminder will follow. Thank you, mother-to-be #{index}."
+        for index in range(messages)
+    ]
+
+
+def synthetic_table(size):
+    """The bundled phrases plus made-up words, to show how each approach scales"""
+    table = dict(load_phrase_tables()['sw'])
+    for index in range(size - len(table)):
+        table[f"term{index:04d}"] = f"neno{index:04d}"
+    return table
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    print("🔤 MAMA-AI Phrase Translation Benchmark")
+    print("=" * 72)
+
+    texts = broadcast(MESSAGES)
+    sample = "Thank you for the HELPFUL answer. Hello Doctor!"
+    bundled = load_phrase_tables()['sw']
+    print(f"old: {legacy_translate(sample, bundled)!r}")
+    print(f"new: {PhraseTranslator(bundled).translate(sample)!r}")
+
+    print(f"\n{len(texts)} broadcast messages, avg {sum(map(len, texts)) // len(texts)} chars")
+    print(f"{'phrase table':<18} {'engine':<34} {'msgs/s':>10} {'µs/msg':>8}")
+    for name, table in [(f"bundled ({len(bundled)})", bundled),
+                        (f"synthetic ({LARGE_TABLE})", synthetic_table(LARGE_TABLE))]:
+        elapsed, compiled = timed(lambda: PhraseTranslator(table))
+        rows = [
+            ("str.replace per phrase (old)", lambda: [legacy_translate(text, table) for text in texts]),
+            ("trie regex, one pass", lambda: [compiled.translate(text) for text in texts]),
+            ("trie regex, translate_many", lambda: compiled.translate_many(texts)),
+        ]
+        for engine, fn in rows:
+            seconds, _ = timed(fn)
+            print(f"{name:<18} {engine:<34} {len(texts) / seconds:>10,.0f} {seconds / len(texts) * 1e6:>8.1f}")
+        print(f"{'':<18} {'(compile: ' + format(elapsed * 1000, '.1f') + ' ms)':<34}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Symptom Triage Benchmark for MAMA-AI
+Compares the cascaded any() substring checks against the compiled
+Aho-Corasick triage automaton for lexicons of 30, 500 and 5,000 terms.
+
+Usage: python benchmarks/bench_triage.py
+"""
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.keyword_matcher import KeywordMatcher
+from src.services.ai_service import SYMPTOM_TOPICS
+from src.utils.lexicon_bundle import load_source
+
+LEXICON_SIZES = (30, 500, 5000)
+MESSAGES = [
+    "I have severe bleeding and feel dizzy",
+    "nina maumivu ya mgongo sana leo",
+    "feeling tired and exhausted all the time",
+    "hello, when is my next clinic visit?",
+    "my baby is kicking a lot this evening, is that normal",
+    "naweza kula mayai wakati wa ujauzito",
+    "I think my water broke, what do I do",
+    "heartburn every night after dinner",
+]
+ROUNDS = 2000
+
+
+def build_lexicon(size, seed=42):
+    """Pad the real lexicon with synthetic terms up to the requested size"""
+    rng = random.Random(seed)
+    tiers = dict(load_source()['triage'])
+    for topic, keywords in SYMPTOM_TOPICS:
+        tiers[topic] = list(keywords)
+
+    total = sum(len(words) for words in tiers.values())
+    names = list(tiers)
+    while total < size:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12)))
+        tiers[rng.choice(names)].append(word)
+        total += 1
+
+    # Trim from the synthetic tail when the real lexicon is already larger
+    while total > size:
+        longest = max(names, key=lambda name: len(tiers[name]))
+        tiers[longest].pop()
+        total -= 1
+
+    return tiers
+
+
+def legacy_triage(text, tiers):
+    """The original implementation: one substring scan per keyword per tier"""
+    text_lower = text.lower()
+    if any(keyword in text_lower for keyword in tiers['emergency']):
+        return 'emergency'
+    if any(keyword in text_lower for keyword in tiers['high_risk']):
+        return 'high_risk'
+    for topic, _ in SYMPTOM_TOPICS:
+        if any(keyword in text_lower for keyword in tiers[topic]):
+            return topic
+    return None
+
+
+def compiled_triage(text, matcher):
+    """Single pass over the text with the compiled automaton"""
+    return matcher.labels(text)
+
+
+def time_it(func, *args):
+    """Return microseconds per message"""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for message in MESSAGES:
+            func(message, *args)
+    elapsed = time.perf_counter() - start
+    return elapsed / (ROUNDS * len(MESSAGES)) * 1e6
+
+
+def main():
+    print("🩺 MAMA-AI Triage Benchmark")
+    print("=" * 60)
+    print(f"{'terms':>8} {'build ms':>10} {'any() µs/msg':>14} {'automaton µs/msg':>18} {'speedup':>9}")
+
+    for size in LEXICON_SIZES:
+        tiers = build_lexicon(size)
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(tiers)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        legacy_us = time_it(legacy_triage, tiers)
+        compiled_us = time_it(compiled_triage, matcher)
+
+        print(f"{size:>8} {build_ms:>10.2f} {legacy_us:>14.2f} {compiled_us:>18.2f} {legacy_us / compiled_us:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Shared Test Fixtures for MAMA-AI
+A Flask app on a throwaway SQLite database, and write-behind journals kept
+under the test's tmp_path.
+"""
+
+import pytest
+from flask import Flask
+from src.models import db
+from src.services import alert_service, emergency_ingress
+
+
+@pytest.fixture
+def bare_app(tmp_path):
+    """App bound to an empty SQLite database, inside its app context"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'test.db'}"
+    db.init_app(app)
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def app(bare_app):
+    """App with every model table created"""
+    db.create_all()
+    return bare_app
+
+
+@pytest.fixture
+def journals(tmp_path, monkeypatch):
+    """Journal alerts and emergency ingress under tmp_path, with fresh suppression windows"""
+    monkeypatch.setattr(alert_service, 'ALERT_JOURNAL_PATH', str(tmp_path / 'alerts.jsonl'))
+    monkeypatch.setattr(emergency_ingress, 'EMERGENCY_INGRESS_JOURNAL_PATH', str(tmp_path / 'ingress.jsonl'))
+    alert_service.reset_alert_journal()
+    emergency_ingress.reset_ingress_journal()
+    yield
+    alert_service.reset_alert_journal()
+    emergency_ingress.reset_ingress_journal()
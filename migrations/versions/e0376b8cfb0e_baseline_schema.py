@@ -0,0 +1,117 @@
+"""baseline schema
+
+The tables as `flask init-db` created them before migrations were added.
+Tables that already exist are left alone, so databases created that way
+upgrade from here like fresh ones.
+
+Revision ID: e0376b8cfb0e
+Revises: 
+Create Date: 2026-10-17 03:25:38.829004
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e0376b8cfb0e'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'message_logs' not in existing:
+        op.create_table('message_logs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('phone_number', sa.String(length=20), nullable=False),
+            sa.Column('message_type', sa.String(length=10), nullable=True),
+            sa.Column('direction', sa.String(length=10), nullable=True),
+            sa.Column('content', sa.Text(), nullable=True),
+            sa.Column('session_id', sa.String(length=100), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+            )
+    if 'users' not in existing:
+        op.create_table('users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('phone_number', sa.String(length=20), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=True),
+            sa.Column('preferred_language', sa.String(length=5), nullable=True),
+            sa.Column('location', sa.String(length=100), nullable=True),
+            sa.Column('emergency_contact', sa.String(length=20), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('phone_number')
+            )
+    if 'appointments' not in existing:
+        op.create_table('appointments',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('appointment_date', sa.DateTime(), nullable=False),
+            sa.Column('appointment_type', sa.String(length=50), nullable=True),
+            sa.Column('location', sa.String(length=200), nullable=True),
+            sa.Column('notes', sa.Text(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('reminder_sent', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+            )
+    if 'emergency_alerts' not in existing:
+        op.create_table('emergency_alerts',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('alert_type', sa.String(length=50), nullable=True),
+            sa.Column('symptoms_reported', sa.Text(), nullable=True),
+            sa.Column('severity_score', sa.Integer(), nullable=True),
+            sa.Column('action_taken', sa.String(length=100), nullable=True),
+            sa.Column('resolved', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+            )
+    if 'pregnancies' not in existing:
+        op.create_table('pregnancies',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('due_date', sa.Date(), nullable=False),
+            sa.Column('weeks_pregnant', sa.Integer(), nullable=True),
+            sa.Column('is_high_risk', sa.Boolean(), nullable=True),
+            sa.Column('health_conditions', sa.Text(), nullable=True),
+            sa.Column('current_symptoms', sa.Text(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+            )
+    if 'reminders' not in existing:
+        op.create_table('reminders',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('reminder_type', sa.String(length=50), nullable=True),
+            sa.Column('message', sa.Text(), nullable=False),
+            sa.Column('scheduled_time', sa.DateTime(), nullable=False),
+            sa.Column('sent', sa.Boolean(), nullable=True),
+            sa.Column('sent_at', sa.DateTime(), nullable=True),
+            sa.Column('frequency', sa.String(length=20), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+            )
+
+
+def downgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_table('reminders')
+    op.drop_table('pregnancies')
+    op.drop_table('emergency_alerts')
+    op.drop_table('appointments')
+    op.drop_table('users')
+    op.drop_table('message_logs')
+    # ### end Alembic commands ###
@@ -0,0 +1,90 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from sqlalchemy import select, update
+from src.models import db, MessageLog
+from src.services.ai_service import classify_text
+
+logger = logging.getLogger(__name__)
+
+
+def _message_text(message_type, content):
+    """Return the part of a logged message that the user actually typed"""
+    content = content or ''
+    if message_type == 'USSD':
+        # USSD logs the whole menu path, e.g. "2*1*severe headache"
+        return content.rsplit('*', 1)[-1]
+    return content
+
+
+def label_rows(rows):
+    """Classify (id, message_type, content) rows into bulk-update dicts"""
+    labels = []
+    for row_id, message_type, content in rows:
+        result = classify_text(_message_text(message_type, content))
+        labels.append({
+            'id': row_id,
+            'intent': result.intent,
+            'triage_tier': result.tier,
+            'matched_keywords': ','.join(result.keywords) or None,
+        })
+    return labels
+
+
+def iter_incoming_chunks(chunk_size, after_id=0):
+    """Stream incoming message rows in primary-key order, one page at a time"""
+    while True:
+        rows = db.session.execute(
+            select(MessageLog.id, MessageLog.message_type, MessageLog.content)
+            .where(MessageLog.direction == 'incoming', MessageLog.id > after_id)
+            .order_by(MessageLog.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+
+        after_id = rows[-1][0]
+        yield [tuple(row) for row in rows]
+
+
+def _write_labels(labels):
+    """Write one chunk of labels back with a single bulk UPDATE"""
+    if labels:
+        db.session.execute(update(MessageLog), labels)
+        db.session.commit()
+    return len(labels)
+
+
+def backfill_message_labels(chunk_size=5000, workers=None, after_id=0):
+    """Re-label incoming MessageLog rows with the current keyword lexicon.
+
+    Rows are read with keyset pagination so memory stays flat, classified
+    across a process pool and written back chunk by chunk. workers=0 runs
+    everything in-process. Must be called inside an app context.
+    """
+    labelled = 0
+    chunks = iter_incoming_chunks(chunk_size, after_id)
+
+    if workers == 0:
+        for rows in chunks:
+            labelled += _write_labels(label_rows(rows))
+        return labelled
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded number of chunks in flight so reads stay streamed
+        max_pending = 2 * workers
+        pending = set()
+
+        for rows in chunks:
+            pending.add(executor.submit(label_rows, rows))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    labelled += _write_labels(future.result())
+                logger.info(f"Labelled {labelled} messages (up to id {rows[-1][0]})")
+
+        for future in pending:
+            labelled += _write_labels(future.result())
+
+    return labelled
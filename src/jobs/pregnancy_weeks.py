@@ -0,0 +1,85 @@
+import logging
+from datetime import date, timedelta
+from sqlalchemy import case, func, or_, select, update
+from src.models import db, Pregnancy
+from src.utils.weekly_content import LAST_WEEK
+
+logger = logging.getLogger(__name__)
+
+TERM_DAYS = 280          # 40 weeks from the last menstrual period to the due date
+PAST_TERM_WEEKS = 42     # post-term from 42+0 weeks
+MAX_WEEKS = LAST_WEEK    # stored weeks stop where weekly content does; is_past_term flags the rest
+
+
+def gestational_week(due_date, today=None):
+    """Completed gestational weeks on today for a pregnancy due on due_date"""
+    today = today or date.today()
+    days_pregnant = TERM_DAYS - (due_date - today).days
+    return min(max(days_pregnant // 7, 0), MAX_WEEKS)
+
+
+def current_week(pregnancy, today=None):
+    """The stored week, or one computed from due_date until the nightly job has run"""
+    if pregnancy.weeks_pregnant is not None:
+        return pregnancy.weeks_pregnant
+    return gestational_week(pregnancy.due_date, today)
+
+
+def weeks_expression(today):
+    """SQL CASE mapping due_date to gestational weeks on today.
+
+    Week w covers due dates in (today + 273 - 7w, today + 280 - 7w], so the
+    mapping is a ladder of plain date comparisons with bound literals. It
+    works the same on SQLite and PostgreSQL without date arithmetic
+    functions.
+    """
+    whens = [
+        (Pregnancy.due_date > today + timedelta(days=TERM_DAYS - 7 - 7 * week), week)
+        for week in range(MAX_WEEKS)
+    ]
+    return case(*whens, else_=MAX_WEEKS)
+
+
+def past_term_expression(today):
+    """SQL condition for pregnancies at or beyond 42+0 weeks on today"""
+    return Pregnancy.due_date <= today - timedelta(days=7 * PAST_TERM_WEEKS - TERM_DAYS)
+
+
+def recompute_pregnancy_weeks(today=None, chunk_size=50000):
+    """Refresh weeks_pregnant and is_past_term for every active pregnancy.
+
+    Runs one set-based UPDATE per primary-key range and commits after each,
+    so no ORM objects are loaded and locks are held briefly. Rows already
+    up to date are left untouched. Returns the number of rows changed.
+    """
+    today = today or date.today()
+    weeks = weeks_expression(today)
+    past_term = past_term_expression(today)
+
+    low, high = db.session.execute(
+        select(func.min(Pregnancy.id), func.max(Pregnancy.id)).where(Pregnancy.is_active == True)
+    ).one()
+    if low is None:
+        return 0
+
+    changed = 0
+    for start in range(low - 1, high, chunk_size):
+        result = db.session.execute(
+            update(Pregnancy)
+            .where(
+                Pregnancy.id > start,
+                Pregnancy.id <= start + chunk_size,
+                Pregnancy.is_active == True,
+                or_(Pregnancy.weeks_pregnant.is_(None),
+                    Pregnancy.weeks_pregnant != weeks,
+                    Pregnancy.is_past_term.is_(None),
+                    Pregnancy.is_past_term != past_term)
+            )
+            .values(weeks_pregnant=weeks, is_past_term=past_term)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        changed += result.rowcount
+
+    logger.info(f"Recomputed gestational weeks for {changed} pregnancies as of {today}")
+    return changed
@@ -0,0 +1,37 @@
+import logging
+from sqlalchemy import select
+from src.models import db, MessageLog, User
+from src.jobs.backfill_labels import _message_text
+from src.utils.language_id import LANGID_MODEL_PATH, NgramLanguageModel, bundled_corpus
+
+logger = logging.getLogger(__name__)
+
+LANGUAGES = ('en', 'sw')
+MIN_WORDS = 2   # menu digits and one-word replies say little about the language
+
+
+def log_corpus(limit=50000):
+    """Recent incoming messages labelled with the sender's preferred language"""
+    rows = db.session.execute(
+        select(MessageLog.message_type, MessageLog.content, User.preferred_language)
+        .join(User, User.phone_number == MessageLog.phone_number)
+        .where(MessageLog.direction == 'incoming', User.preferred_language.in_(LANGUAGES))
+        .order_by(MessageLog.id.desc())
+        .limit(limit)
+    )
+    for message_type, content, lang in rows:
+        text = _message_text(message_type, content)
+        if len(text.split()) >= MIN_WORDS:
+            yield text, lang
+
+
+def train_language_model(path=None, log_limit=50000):
+    """Train the n-gram language model from bundled text and message logs, then save it.
+
+    Returns the number of training examples.
+    """
+    corpus = bundled_corpus() + list(log_corpus(log_limit))
+    texts, labels = zip(*corpus)
+    NgramLanguageModel.train(texts, labels).save(path or LANGID_MODEL_PATH)
+    logger.info(f"Trained language model on {len(corpus)} examples")
+    return len(corpus)
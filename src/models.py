@@ -30,7 +30,9 @@ class Pregnancy(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     due_date = db.Column(db.Date, nullable=False)
-    weeks_pregnant = db.Column(db.Integer)
+    weeks_pregnant = db.Column(db.Integer)  # refreshed nightly from due_date
+    is_past_term = db.Column(db.Boolean, default=False)  # 42+ weeks, needs follow-up
+    weekly_update_week = db.Column(db.Integer)  # last week whose weekly SMS was sent
     is_high_risk = db.Column(db.Boolean, default=False)
     health_conditions = db.Column(db.Text)
     current_symptoms = db.Column(db.Text)
@@ -83,8 +85,15 @@ class MessageLog(db.Model):
     content = db.Column(db.Text)
     session_id = db.Column(db.String(100))
     status = db.Column(db.String(20))
+    intent = db.Column(db.String(30))  # labels written by classification backfill
+    triage_tier = db.Column(db.String(20))
+    matched_keywords = db.Column(db.Text)
+    segments = db.Column(db.Integer)  # SMS parts billed for outgoing messages
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Chat context reads a user's latest turns of one channel on every model call
+    __table_args__ = (db.Index('ix_message_logs_conversation', 'phone_number', 'message_type', 'id'),)
+    
     def __repr__(self):
         return f'<MessageLog {self.id} - {self.message_type}>'
 
@@ -96,9 +105,50 @@ class EmergencyAlert(db.Model):
     alert_type = db.Column(db.String(50))  # severe_bleeding, severe_pain, etc.
     symptoms_reported = db.Column(db.Text)
     severity_score = db.Column(db.Integer)  # 1-10
+    severity_features = db.Column(db.Text)  # feature=points pairs behind the score
     action_taken = db.Column(db.String(100))
+    journal_id = db.Column(db.String(32), unique=True)  # write-behind journal key, makes replay idempotent
+    occurrences = db.Column(db.Integer, default=1)  # repeats folded in during the dedup window
     resolved = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_seen_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def __repr__(self):
         return f'<EmergencyAlert {self.id} - {self.alert_type}>'
+
+# Alert queue order: open alerts, most severe first, oldest first within a score
+db.Index(
+    'ix_emergency_alerts_queue',
+    EmergencyAlert.resolved,
+    EmergencyAlert.severity_score.desc(),
+    EmergencyAlert.created_at
+)
+
+class KickCount(db.Model):
+    __tablename__ = 'kick_counts'
+    
+    # Append-only: one row per USSD movement report, never updated
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    recorded_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    bucket = db.Column(db.SmallInteger, nullable=False)  # 1: under 3, 2: 3-5, 3: over 5 per hour
+    
+    __table_args__ = (db.Index('ix_kick_counts_user_time', 'user_id', 'recorded_at'),)
+    
+    def __repr__(self):
+        return f'<KickCount {self.id} - User {self.user_id}>'
+
+class KickTrend(db.Model):
+    __tablename__ = 'kick_trends'
+    
+    # Rolling aggregates kept up to date on every KickCount insert
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    last_report_on = db.Column(db.Date, nullable=False)
+    day_sums = db.Column(db.String(64), nullable=False)  # 14 daily bucket sums, newest first
+    day_counts = db.Column(db.String(64), nullable=False)  # 14 daily report counts, newest first
+    consecutive_low = db.Column(db.Integer, default=0)  # reports in bucket 1 since the last higher one
+    reports = db.Column(db.Integer, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<KickTrend User {self.user_id}>'
@@ -1,591 +1,462 @@
+import os
 import re
+from collections import namedtuple
 from datetime import datetime
 from src.models import User, Pregnancy, EmergencyAlert
+from src.utils.keyword_matcher import KeywordMatcher
+from src.utils.fuzzy_index import DeletionIndex
+from src.utils.common_words import KNOWN_WORDS
+from src.utils.response_registry import response_text, render_response
+from src.utils.ttl_cache import TTLCache
+from src.utils.weekly_content import USSD_MAX_LENGTH, weekly_content
+from src.utils.response_cache import get_response_cache, question_fingerprint
+from src.utils.conversation_store import ConversationStore, Turn
+from src.utils.lexicon_bundle import get_lexicon
+from src.jobs.pregnancy_weeks import current_week
+from src.services.severity import score_matches
+from src.services.alert_service import record_alert
+from src.services.kick_counts import parse_bucket, record_kick_count, escalate_movement_trend
+from src.services.llm_backend import get_llm_gateway
+from src.services.intent_router import (
+    get_intent_router, reset_intent_router, intents_for, intent_keywords, dispatch
+)
+
+# Common pregnancy discomforts from the intent table, in the order they are checked
+SYMPTOM_TOPICS = tuple(
+    (intent.name, intent_keywords(intent)) for intent in intents_for('symptom')
+)
+
+# Triage tiers from most to least urgent
+TOPIC_TIERS = tuple(topic for topic, _ in SYMPTOM_TOPICS)
+TRIAGE_TIERS = ('emergency', 'high_risk') + TOPIC_TIERS
+
+# (lexicon version, compiled structure); rebuilt once per new bundle version
+_triage_matcher = None
+_fuzzy_index = None
+
+
+def _triage_lexicon(lexicon):
+    triage = dict(lexicon.triage)
+    triage.update(SYMPTOM_TOPICS)
+    return triage
+
+
+def get_triage_matcher():
+    """Return the process-wide triage automaton for the live lexicon version"""
+    global _triage_matcher
+    lexicon = get_lexicon()
+    compiled = _triage_matcher
+    if compiled is None or compiled[0] != lexicon.version:
+        compiled = (lexicon.version, KeywordMatcher(_triage_lexicon(lexicon)))
+        _triage_matcher = compiled
+    return compiled[1]
+
+
+def get_fuzzy_index():
+    """Return the process-wide typo-tolerant triage index for the live lexicon version"""
+    global _fuzzy_index
+    lexicon = get_lexicon()
+    compiled = _fuzzy_index
+    if compiled is None or compiled[0] != lexicon.version:
+        compiled = (lexicon.version, DeletionIndex(
+            _triage_lexicon(lexicon),
+            max_distance=int(os.getenv('FUZZY_MAX_DISTANCE', 1)),
+            min_length=int(os.getenv('FUZZY_MIN_LENGTH', 6)),
+            min_length_2=int(os.getenv('FUZZY_MIN_LENGTH_2', 10)),
+            max_queries=int(os.getenv('FUZZY_MAX_QUERIES', 64)),
+            priority=('emergency',),
+            known_words=KNOWN_WORDS
+        ))
+        _fuzzy_index = compiled
+    return compiled[1]
+
+
+def triage_text(text):
+    """Exact triage hits plus typo-tolerant ones when no emergency was found"""
+    matches = get_triage_matcher().find_all(text)
+    if top_tier(matches) == 'emergency':
+        return matches
+
+    seen = {(match.keyword, match.label) for match in matches}
+    for match in get_fuzzy_index().find_all(text):
+        if (match.keyword, match.label) not in seen:
+            seen.add((match.keyword, match.label))
+            matches.append(match)
+    return matches
+
+
+def top_tier(matches, tiers=TRIAGE_TIERS):
+    """Return the most urgent tier among keyword matches, or None"""
+    found = {match.label for match in matches}
+    for tier in tiers:
+        if tier in found:
+            return tier
+    return None
+
+
+# Keyword hits for one normalized message; positions index into text
+MessageAnalysis = namedtuple('MessageAnalysis', ['text', 'intent_matches', 'triage_matches'])
+
+# Pure classification of a message: no DB access, no response text
+Classification = namedtuple('Classification', ['intent', 'tier', 'keywords'])
+
+# Only the pure keyword analysis is cached; side effects such as emergency
+# alerts run on every message
+_analysis_cache = TTLCache(
+    maxsize=int(os.getenv('CLASSIFICATION_CACHE_SIZE', 10000)),
+    ttl=float(os.getenv('CLASSIFICATION_CACHE_TTL', 3600))
+)
+
+
+def normalize_message(text):
+    """Lower-case and collapse whitespace so equivalent messages share a key"""
+    return ' '.join((text or '').lower().split())
+
+
+def analyze_message(text):
+    """Run the intent and triage matchers over a message, with caching.
+
+    The keyword lexicons cover every language at once, so the key holds
+    no language and a message is analysed once whoever sends it.
+    """
+    normalized = normalize_message(text)
+    # Keyed by lexicon version so a swapped bundle never serves stale hits
+    key = (normalized, get_lexicon().version)
+
+    analysis = _analysis_cache.get(key)
+    if analysis is None:
+        analysis = MessageAnalysis(
+            normalized,
+            tuple(get_intent_router().matcher.find_all(normalized)),
+            tuple(triage_text(normalized))
+        )
+        _analysis_cache.set(key, analysis)
+    return analysis
+
+
+def reset_matchers():
+    """Recompile the keyword lexicons and invalidate cached classifications"""
+    global _triage_matcher, _fuzzy_index
+    _triage_matcher = None
+    _fuzzy_index = None
+    reset_intent_router()
+    _analysis_cache.clear()
+
+
+def classification_cache_stats():
+    """Return hit/miss/eviction counters for the classification cache"""
+    return _analysis_cache.stats()
+
+
+def classify_text(text):
+    """Classify one message into its routed intent and triage tier"""
+    analysis = analyze_message(text)
+    route = get_intent_router().select(analysis.intent_matches, ('sms', 'text'))
+
+    keywords = {match.keyword for match in analysis.intent_matches}
+    keywords.update(match.keyword for match in analysis.triage_matches)
+    return Classification(
+        route.intent.name if route.intent else None,
+        top_tier(analysis.triage_matches),
+        tuple(sorted(keywords))
+    )
+
+
+_conversation_store = None
+
+
+def load_chat_turns(phone_number, limit):
+    """Read a user's recent chat turns from message_logs, for users not buffered here"""
+    from src.models import MessageLog
+    rows = (
+        MessageLog.query
+        .filter_by(phone_number=phone_number, message_type='CHAT')
+        .order_by(MessageLog.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return [
+        Turn('user' if row.direction == 'incoming' else 'assistant', row.content, row.created_at)
+        for row in reversed(rows)
+    ]
+
+
+def get_conversation_store():
+    """Return the process-wide chat history store, keyed by phone number"""
+    global _conversation_store
+    if _conversation_store is None:
+        _conversation_store = ConversationStore(load_chat_turns)
+    return _conversation_store
+
+
+def reset_conversation_store():
+    """Drop buffered conversations so the next use rebuilds the store"""
+    global _conversation_store
+    _conversation_store = None
+
+
+def turns_from_client(conversation_history, limit):
+    """Convert the chat page's [{type: 'user'|'ai', message}] history into turns"""
+    turns = []
+    for item in (conversation_history or [])[-limit:]:
+        if isinstance(item, dict) and item.get('message'):
+            role = 'user' if item.get('type') == 'user' else 'assistant'
+            turns.append(Turn(role, str(item['message']), None))
+    return turns
+
+
+# Answer length the model is asked to keep to on each channel
+CHANNEL_ANSWER_CHARS = {'ussd': 160, 'sms': 300, 'chat': 800}
+LANGUAGE_NAMES = {'en': 'English', 'sw': 'Kiswahili'}
+
+
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def fit_ussd(text, limit=USSD_MAX_LENGTH):
+    """Cut an answer to one USSD screen.
+
+    Whole sentences are kept while they fit; a first sentence that does
+    not fit is cut at a word and ends with an ellipsis.
+    """
+    if len(text) <= limit:
+        return text
+    fitted = ''
+    for sentence in _SENTENCE_END_RE.split(text):
+        candidate = f"{fitted} {sentence}" if fitted else sentence
+        if len(candidate) > limit:
+            break
+        fitted = candidate
+    if fitted:
+        return fitted
+    cut = text[:limit - 1]
+    if ' ' in cut:
+        cut = cut[:cut.rindex(' ')]
+    return cut.rstrip(' ,;:') + '…'
+
+
+def model_system_prompt(lang, channel):
+    """System prompt for model answers in this language and channel"""
+    return (
+        "You are MAMA-AI, a maternal health assistant for pregnant women in Kenya. "
+        f"Reply in {LANGUAGE_NAMES.get(lang, 'English')} using plain text under "
+        f"{CHANNEL_ANSWER_CHARS.get(channel, CHANNEL_ANSWER_CHARS['chat'])} characters. "
+        "Give safe, general guidance and advise visiting a health facility for anything serious."
+    )
+
 
 class AIService:
-    def __init__(self):
-        self.emergency_keywords = [
-            'severe bleeding', 'heavy bleeding', 'damu nyingi', 'bleeding heavily',
-            'severe pain', 'maumivu makali', 'unbearable pain', 'sharp pain',
-            'can\'t breathe', 'difficulty breathing', 'sijui kupumua',
-            'vision problems', 'blurred vision', 'miwani', 'can\'t see',
-            'severe headache', 'maumivu ya kichwa', 'head pounding',
-            'fever', 'homa', 'high temperature', 'hot',
-            'vomiting blood', 'kutapika damu', 'blood in vomit',
-            'water broke', 'maji yamevunjika', 'waters breaking'
-        ]
-        
-        self.high_risk_symptoms = [
-            'bleeding', 'spotting', 'cramping', 'contractions',
-            'reduced movement', 'no movement', 'swelling',
-            'headache', 'dizziness', 'nausea', 'vomiting'
-        ]
+    @property
+    def emergency_keywords(self):
+        return tuple(get_lexicon().triage['emergency'])
+    
+    @property
+    def high_risk_symptoms(self):
+        return tuple(get_lexicon().triage['high_risk'])
+    
+    @property
+    def triage_matcher(self):
+        return get_triage_matcher()
+    
+    @property
+    def router(self):
+        return get_intent_router()
+    
+    def match_symptoms(self, symptoms_text):
+        """Find every triage keyword with its tier and position in one pass"""
+        return analyze_message(symptoms_text).triage_matches
+    
+    def route_message(self, text, contexts):
+        """Route a message using the cached keyword analysis"""
+        return self.router.select(analyze_message(text).intent_matches, contexts)
+    
+    def classify(self, text):
+        """Classify a single message without building a response"""
+        return classify_text(text)
+    
+    def classify_batch(self, texts):
+        """Classify many messages"""
+        return [classify_text(text) for text in texts]
     
     def analyze_symptoms(self, symptoms_text, user):
         """Analyze symptoms and provide appropriate response"""
-        symptoms_lower = symptoms_text.lower()
+        matches = self.match_symptoms(symptoms_text)
+        tier = top_tier(matches)
         
         # Check for emergency symptoms
-        emergency_detected = any(keyword in symptoms_lower for keyword in self.emergency_keywords)
-        
-        if emergency_detected:
-            return self._handle_emergency_symptoms(symptoms_text, user)
+        if tier == 'emergency':
+            return self._handle_emergency_symptoms(symptoms_text, user, matches)
         
         # Check for high-risk symptoms
-        high_risk = any(keyword in symptoms_lower for keyword in self.high_risk_symptoms)
-        
-        if high_risk:
-            return self._handle_high_risk_symptoms(symptoms_text, user)
+        if tier == 'high_risk':
+            return self._handle_high_risk_symptoms(symptoms_text, user, matches)
         
         # Normal symptoms guidance
-        return self._handle_normal_symptoms(symptoms_text, user)
+        return self._handle_normal_symptoms(symptoms_text, user, matches)
     
-    def _handle_emergency_symptoms(self, symptoms, user):
+    def _handle_emergency_symptoms(self, symptoms, user, matches=None):
         """Handle emergency symptoms"""
-        # Create emergency alert
-        from src.models import db
-        alert = EmergencyAlert(
-            user_id=user.id,
-            alert_type='severe_symptoms',
-            symptoms_reported=symptoms,
-            severity_score=9,
-            action_taken='emergency_response_sent'
-        )
-        db.session.add(alert)
-        db.session.commit()
-        
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "🚨 DHARURA! 🚨\n\n"
-                "Dalili hizi ni hatari sana. PIGA simu 911 SASA HIVI au enda hospitali ya karibu.\n\n"
-                "Usibaki nyumbani - hii ni dharura ya kiafya.\n\n"
-                "Tumetuma ujumbe wa dharura kwa anayekuhudumia."
-            )
-        else:
-            return (
-                "🚨 EMERGENCY! 🚨\n\n"
-                "These symptoms are very serious. CALL 911 NOW or go to the nearest hospital immediately.\n\n"
-                "Do not stay home - this is a medical emergency.\n\n"
-                "We've sent an emergency alert to your healthcare provider."
-            )
-    
-    def _handle_high_risk_symptoms(self, symptoms, user):
+        self._record_alert(symptoms, user, matches, 'severe_symptoms', 'emergency_response_sent')
+        return response_text('emergency_symptoms', user.preferred_language)
+    
+    def _handle_high_risk_symptoms(self, symptoms, user, matches=None):
         """Handle high-risk symptoms"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "⚠️ Dalili hizi zinahitaji uchunguzi wa haraka.\n\n"
-                "Wasiliana na daktari wako au enda kliniki ndani ya masaa 24.\n\n"
-                "Dalili za hatari wakati wa ujauzito:\n"
-                "• Kutokwa damu\n"
-                "• Maumivu makali\n"
-                "• Mzunguko mdogo wa mtoto\n"
-                "• Uvimbe mkuu\n\n"
-                "Jihadharini na usisubiri."
-            )
-        else:
-            return (
-                "⚠️ These symptoms require prompt medical attention.\n\n"
-                "Contact your healthcare provider or visit a clinic within 24 hours.\n\n"
-                "Warning signs during pregnancy:\n"
-                "• Any bleeding\n"
-                "• Severe pain\n"
-                "• Reduced baby movement\n"
-                "• Severe swelling\n\n"
-                "Don't wait - seek care promptly."
-            )
-    
-    def _handle_normal_symptoms(self, symptoms, user):
+        self._record_alert(symptoms, user, matches, 'high_risk_symptoms', 'urgent_care_advised')
+        return response_text('high_risk_symptoms', user.preferred_language)
+    
+    def score_severity(self, symptoms, user, matches=None):
+        """Score symptoms 1-10 from their triage matches and the pregnancy week"""
+        if matches is None:
+            matches = self.match_symptoms(symptoms)
+        pregnancy = self._get_active_pregnancy(user)
+        weeks = current_week(pregnancy) if pregnancy else None
+        return score_matches(matches, weeks)
+    
+    def _record_alert(self, symptoms, user, matches, alert_type, action_taken):
+        """Journal a scored alert for the health worker queue without waiting on the database"""
+        severity = self.score_severity(symptoms, user, matches)
+        return record_alert(user.id, alert_type, symptoms, severity, action_taken)
+    
+    def _handle_normal_symptoms(self, symptoms, user, matches=None):
         """Handle normal pregnancy symptoms"""
-        symptoms_lower = symptoms.lower()
+        if matches is None:
+            matches = self.match_symptoms(symptoms)
         
         # Common pregnancy discomforts and advice
-        if any(word in symptoms_lower for word in ['nausea', 'vomiting', 'morning sickness', 'tapika']):
-            return self._nausea_advice(user)
-        elif any(word in symptoms_lower for word in ['back pain', 'maumivu ya mgongo', 'backache']):
-            return self._back_pain_advice(user)
-        elif any(word in symptoms_lower for word in ['tired', 'fatigue', 'uchovu', 'exhausted']):
-            return self._fatigue_advice(user)
-        elif any(word in symptoms_lower for word in ['heartburn', 'acidity', 'chest burn']):
-            return self._heartburn_advice(user)
-        else:
+        topic = top_tier(matches, TOPIC_TIERS)
+        if topic is None:
             return self._general_advice(user)
+        return getattr(self, self.router.intents[topic].handlers['symptom'])(user)
     
     def _nausea_advice(self, user):
         """Advice for nausea and morning sickness"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "Kuharisha ni kawaida katika miezi ya kwanza ya ujauzito.\n\n"
-                "Mapendekezo:\n"
-                "• Kula kidogo kidogo mara nyingi\n"
-                "• Ongeza maji\n"
-                "• Kula biskuti kabla ya kuamka\n"
-                "• Epuka vyakula vya kunuka kali\n\n"
-                "Wasiliana na daktari ikiwa:\n"
-                "• Unatapika sana\n"
-                "• Huwezi kula au kunywa\n"
-                "• Unapoteza uzito"
-            )
-        else:
-            return (
-                "Nausea is common in early pregnancy.\n\n"
-                "Tips to help:\n"
-                "• Eat small, frequent meals\n"
-                "• Stay hydrated\n"
-                "• Try crackers before getting up\n"
-                "• Avoid strong smells\n\n"
-                "Contact your doctor if:\n"
-                "• Vomiting is severe\n"
-                "• Can't keep food/fluids down\n"
-                "• Losing weight"
-            )
+        return response_text('nausea', user.preferred_language)
     
     def _back_pain_advice(self, user):
         """Advice for back pain"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "Maumivu ya mgongo ni ya kawaida wakati wa ujauzito.\n\n"
-                "Jinsi ya kupunguza:\n"
-                "• Vaa viatu visivyo na visigino\n"
-                "• Lala upande mwako\n"
-                "• Tumia mto wa moto\n"
-                "• Fanya mazoezi ya wepesi\n\n"
-                "Wasiliana na daktari ikiwa maumivu ni makali au yanaongezeka."
-            )
-        else:
-            return (
-                "Back pain is common during pregnancy.\n\n"
-                "Ways to reduce it:\n"
-                "• Wear flat, comfortable shoes\n"
-                "• Sleep on your side\n"
-                "• Use a warm compress\n"
-                "• Do gentle exercises\n\n"
-                "Contact your doctor if pain is severe or worsening."
-            )
+        return response_text('back_pain', user.preferred_language)
     
     def _fatigue_advice(self, user):
         """Advice for fatigue"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "Uchovu ni wa kawaida wakati wa ujauzito.\n\n"
-                "Jinsi ya kushughulikia:\n"
-                "• Pumzika mara nyingi\n"
-                "• Lala masaa ya kutosha\n"
-                "• Kula vyakula vyenye nishati\n"
-                "• Fanya mazoezi ya wepesi\n\n"
-                "Hakikisha unakula vyema na kunywa maji ya kutosha."
-            )
-        else:
-            return (
-                "Fatigue is very common during pregnancy.\n\n"
-                "Ways to manage:\n"
-                "• Rest frequently\n"
-                "• Get adequate sleep\n"
-                "• Eat energy-rich foods\n"
-                "• Light exercise helps\n\n"
-                "Make sure you're eating well and staying hydrated."
-            )
+        return response_text('fatigue', user.preferred_language)
     
     def _heartburn_advice(self, user):
         """Advice for heartburn"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "Uchungu wa kifuani ni wa kawaida wakati wa ujauzito.\n\n"
-                "Mapendekezo:\n"
-                "• Kula kidogo kidogo\n"
-                "• Epuka vyakula vya kunuka\n"
-                "• Usikae mara baada ya kula\n"
-                "• Ongeza kichwa chako unapolala\n\n"
-                "Wasiliana na daktari kwa dawa salama za ujauzito."
-            )
-        else:
-            return (
-                "Heartburn is common during pregnancy.\n\n"
-                "Tips to help:\n"
-                "• Eat smaller meals\n"
-                "• Avoid spicy/acidic foods\n"
-                "• Don't lie down after eating\n"
-                "• Elevate your head while sleeping\n\n"
-                "Talk to your doctor about pregnancy-safe antacids."
-            )
+        return response_text('heartburn', user.preferred_language)
     
     def _general_advice(self, user):
         """General pregnancy advice"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "Asante kwa kutueleza kuhusu dalili zako.\n\n"
-                "Kumbuka:\n"
-                "• Tembelea kliniki mara kwa mara\n"
-                "• Kula vyakula vyenye lishe\n"
-                "• Kunywa maji mengi\n"
-                "• Pumzika vizuri\n\n"
-                "Wasiliana na daktari wako ikiwa una wasiwasi wowote."
-            )
-        else:
-            return (
-                "Thank you for sharing your symptoms with us.\n\n"
-                "Remember to:\n"
-                "• Attend regular clinic visits\n"
-                "• Eat nutritious foods\n"
-                "• Stay well hydrated\n"
-                "• Get adequate rest\n\n"
-                "Contact your healthcare provider if you have any concerns."
-            )
+        return response_text('general_advice', user.preferred_language)
     
     def analyze_baby_movement(self, movement_report, user):
         """Analyze baby movement patterns"""
-        lang = user.preferred_language
+        bucket = parse_bucket(movement_report)
+        if bucket is not None:
+            trend = record_kick_count(user.id, bucket)
+            if trend.escalate:
+                pregnancy = self._get_active_pregnancy(user)
+                escalate_movement_trend(user.id, trend, current_week(pregnancy) if pregnancy else None)
+                return response_text('movement_declining', user.preferred_language)
         
         if movement_report == '1':  # Less than 3 movements
-            if lang == 'sw':
-                return (
-                    "⚠️ Mzunguko mdogo wa mtoto unaweza kuwa dalili ya hatari.\n\n"
-                    "Fanya hivi:\n"
-                    "1. Lala upande wa kushoto\n"
-                    "2. Kunywa maji baridi\n"
-                    "3. Hesabu mzunguko kwa saa 2\n\n"
-                    "Ikiwa bado hamzunguki, ENDA HOSPITALI SASA HIVI!"
-                )
-            else:
-                return (
-                    "⚠️ Reduced baby movement may be a warning sign.\n\n"
-                    "Try this:\n"
-                    "1. Lie on your left side\n"
-                    "2. Drink cold water\n"
-                    "3. Count movements for 2 hours\n\n"
-                    "If still no movement, GO TO HOSPITAL IMMEDIATELY!"
-                )
+            intent = 'movement_low'
         elif movement_report == '2':  # 3-5 movements
-            if lang == 'sw':
-                return (
-                    "Mzunguko huu ni wa kati. Fuatilia zaidi.\n\n"
-                    "Hesabu mzunguko wa mtoto kila siku wakati huo huo.\n\n"
-                    "Wasiliana na daktari ikiwa unaona mabadiliko."
-                )
-            else:
-                return (
-                    "This movement level is moderate. Keep monitoring.\n\n"
-                    "Count baby movements at the same time each day.\n\n"
-                    "Contact your doctor if you notice changes."
-                )
+            intent = 'movement_moderate'
         else:  # More than 5 movements
-            if lang == 'sw':
-                return (
-                    "✅ Vizuri! Mtoto wako anaonyesha ishara nzuri za afya.\n\n"
-                    "Endelea kufuatilia mzunguko wake kila siku."
-                )
-            else:
-                return (
-                    "✅ Great! Your baby is showing good signs of health.\n\n"
-                    "Continue monitoring movement patterns daily."
-                )
+            intent = 'movement_good'
+        return response_text(intent, user.preferred_language)
     
     def get_nutrition_tips(self, user):
         """Get nutrition tips for pregnant women"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "Lishe Muhimu Wakati wa Ujauzito 🥗\n\n"
-                "Kula:\n"
-                "• Mboga za majani\n"
-                "• Matunda\n"
-                "• Protini (nyama, samaki, maharage)\n"
-                "• Maziwa na mazao yake\n"
-                "• Nafaka kamili\n\n"
-                "Epuka:\n"
-                "• Pombe\n"
-                "• Sigara\n"
-                "• Kahawa nyingi\n"
-                "• Samaki wenye sumu\n\n"
-                "Kunywa maji mengi!"
-            )
-        else:
-            return (
-                "Essential Pregnancy Nutrition 🥗\n\n"
-                "Include:\n"
-                "• Leafy green vegetables\n"
-                "• Fresh fruits\n"
-                "• Protein (meat, fish, beans)\n"
-                "• Dairy products\n"
-                "• Whole grains\n\n"
-                "Avoid:\n"
-                "• Alcohol\n"
-                "• Smoking\n"
-                "• Excessive caffeine\n"
-                "• High-mercury fish\n\n"
-                "Stay well hydrated!"
-            )
-    
-    def get_weekly_info(self, weeks_pregnant):
-        """Get week-specific pregnancy information"""
-        if weeks_pregnant <= 12:
-            return self._first_trimester_info(weeks_pregnant)
-        elif weeks_pregnant <= 28:
-            return self._second_trimester_info(weeks_pregnant)
-        else:
-            return self._third_trimester_info(weeks_pregnant)
-    
-    def _first_trimester_info(self, weeks):
-        return (
-            f"Week {weeks} - First Trimester 🌱\n\n"
-            "What's happening:\n"
-            "• Baby's organs are forming\n"
-            "• Morning sickness is common\n"
-            "• Fatigue is normal\n\n"
-            "Important:\n"
-            "• Take folic acid\n"
-            "• Avoid alcohol/smoking\n"
-            "• Schedule first prenatal visit"
-        )
+        return response_text('nutrition', user.preferred_language)
     
-    def _second_trimester_info(self, weeks):
-        return (
-            f"Week {weeks} - Second Trimester 🤗\n\n"
-            "What's happening:\n"
-            "• Energy may return\n"
-            "• Baby bump showing\n"
-            "• You may feel baby move\n\n"
-            "Important:\n"
-            "• Continue prenatal vitamins\n"
-            "• Regular checkups\n"
-            "• Start thinking about birth plan"
-        )
+    def get_weekly_info(self, weeks_pregnant, lang='en', variant='text'):
+        """Get week-specific pregnancy information ('text', 'sms' or 'ussd' length)"""
+        return getattr(weekly_content(weeks_pregnant, lang), variant).text
     
-    def _third_trimester_info(self, weeks):
-        return (
-            f"Week {weeks} - Third Trimester 🤰\n\n"
-            "What's happening:\n"
-            "• Baby is growing rapidly\n"
-            "• You may feel uncomfortable\n"
-            "• Preparing for birth\n\n"
-            "Important:\n"
-            "• Monitor baby movements\n"
-            "• Pack hospital bag\n"
-            "• Know labor signs"
-        )
+    def answer_with_model(self, text, user, channel, keyword_answer, history=()):
+        """Answer with the configured model within the channel budget, else keyword_answer()"""
+        gateway = get_llm_gateway()
+        if gateway is None:
+            return keyword_answer()
+        
+        # Danger signs always take the keyword path, which records the alert,
+        # and are never looked up in or written to the answer cache
+        if top_tier(analyze_message(text).triage_matches) in ('emergency', 'high_risk'):
+            return keyword_answer()
+        
+        # Follow-ups depend on earlier turns, so only context-free questions are cached
+        cache = get_response_cache()
+        lang = user.preferred_language
+        key = None if history else question_fingerprint(text, lang, channel)
+        if key is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        
+        # Only model answers are cached; keyword fallbacks are cheap to redo
+        fell_back = []
+        def fallback():
+            fell_back.append(True)
+            return keyword_answer()
+        
+        # No per-user details in the prompt so identical questions share one call
+        prompt = ' '.join(text.split())
+        context = tuple((turn.role, turn.content) for turn in history)
+        answer = gateway.ask(prompt, channel, fallback, system=model_system_prompt(lang, channel),
+                             history=context)
+        # Models overrun the length they are asked for; a USSD screen cannot
+        if channel == 'ussd' and not fell_back:
+            answer = fit_ussd(answer)
+        if key is not None and not fell_back:
+            cache.set(key, answer)
+        return answer
     
     def answer_health_question(self, question, user):
         """Answer general health questions"""
-        question_lower = question.lower()
-        lang = user.preferred_language
-        
-        # Common pregnancy questions
-        if any(word in question_lower for word in ['safe', 'salama', 'can i', 'naweza']):
-            return self._safety_advice(question, user)
-        elif any(word in question_lower for word in ['pain', 'maumivu', 'hurt', 'ache']):
-            return self._pain_guidance(question, user)
-        elif any(word in question_lower for word in ['eat', 'food', 'kula', 'chakula']):
-            return self._food_advice(question, user)
-        else:
-            return self._general_health_advice(user)
+        route = self.route_message(question, ('question',))
+        return dispatch(self, route, question, user)
     
     def _safety_advice(self, question, user):
         """Safety-related advice"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "Kwa usalama wakati wa ujauzito:\n\n"
-                "Salama:\n"
-                "• Mazoezi ya wepesi\n"
-                "• Kukaa upande wa kushoto\n"
-                "• Kuoga kwa maji ya joto la kawaida\n\n"
-                "Epuka:\n"
-                "• Mazoezi makali\n"
-                "• Kupanda juu\n"
-                "• Maji ya moto sana\n\n"
-                "Uliza daktari wako daima!"
-            )
-        else:
-            return (
-                "For safety during pregnancy:\n\n"
-                "Safe:\n"
-                "• Gentle exercise\n"
-                "• Sleeping on left side\n"
-                "• Warm (not hot) baths\n\n"
-                "Avoid:\n"
-                "• Intense exercise\n"
-                "• High altitudes\n"
-                "• Very hot water\n\n"
-                "Always ask your doctor!"
-            )
+        return response_text('safety', user.preferred_language)
     
     def _pain_guidance(self, question, user):
         """Pain-related guidance"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "Kuhusu maumivu wakati wa ujauzito:\n\n"
-                "Maumivu ya kawaida:\n"
-                "• Mgongo\n"
-                "• Miguu\n"
-                "• Kichwa (kidogo)\n\n"
-                "Wasiliana na daktari ikiwa:\n"
-                "• Maumivu ni makali\n"
-                "• Yanaongezeka\n"
-                "• Yana pamoja na dalili nyingine\n\n"
-                "Usitumie dawa bila ushauri wa daktari."
-            )
-        else:
-            return (
-                "About pain during pregnancy:\n\n"
-                "Normal discomforts:\n"
-                "• Back pain\n"
-                "• Leg cramps\n"
-                "• Mild headaches\n\n"
-                "Contact doctor if pain is:\n"
-                "• Severe\n"
-                "• Worsening\n"
-                "• With other symptoms\n\n"
-                "Don't take medications without consulting your doctor."
-            )
+        return response_text('pain', user.preferred_language)
     
     def _food_advice(self, question, user):
         """Food and nutrition advice"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "Kuhusu chakula wakati wa ujauzito:\n\n"
-                "Kula:\n"
-                "• Mboga na matunda\n"
-                "• Protini\n"
-                "• Chakula chenye chuma\n"
-                "• Kalisiamu\n\n"
-                "Epuka:\n"
-                "• Nyama mbichi\n"
-                "• Maziwa yasiyochemshwa\n"
-                "• Samaki wa kina\n\n"
-                "Uliza daktari kuhusu vitamini."
-            )
-        else:
-            return (
-                "About food during pregnancy:\n\n"
-                "Eat:\n"
-                "• Fruits and vegetables\n"
-                "• Lean proteins\n"
-                "• Iron-rich foods\n"
-                "• Calcium sources\n\n"
-                "Avoid:\n"
-                "• Raw meat/fish\n"
-                "• Unpasteurized dairy\n"
-                "• High-mercury fish\n\n"
-                "Ask your doctor about supplements."
-            )
+        return response_text('food', user.preferred_language)
     
     def _general_health_advice(self, user):
         """General health advice"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "Kwa maswali ya afya, ni bora kuongea na daktari wako.\n\n"
-                "Kila ujauzito ni tofauti. Daktari wako anajua historia yako ya kiafya.\n\n"
-                "Usisite kuuliza maswali yoyote wakati wa vizio vyako."
-            )
-        else:
-            return (
-                "For specific health questions, it's best to speak with your healthcare provider.\n\n"
-                "Every pregnancy is different, and your doctor knows your medical history.\n\n"
-                "Don't hesitate to ask questions during your visits."
-            )
+        return response_text('general_health', user.preferred_language)
     
     def process_free_text_query(self, text, user):
-        """Process free text queries using simple keyword matching"""
-        text_lower = text.lower()
-        
-        # Check for greetings
-        if any(word in text_lower for word in ['hello', 'hi', 'halo', 'mambo', 'habari']):
-            return self._greeting_response(user)
-        
-        # Check for symptoms
-        elif any(word in text_lower for word in ['pain', 'bleeding', 'sick', 'maumivu', 'damu']):
-            return self.analyze_symptoms(text, user)
-        
-        # Check for questions about baby
-        elif any(word in text_lower for word in ['baby', 'mtoto', 'movement', 'kick']):
-            return self._baby_info(user)
-        
-        # Check for appointment queries
-        elif any(word in text_lower for word in ['appointment', 'clinic', 'doctor', 'miadi']):
-            return self._appointment_info(user)
-        
-        # Default response
-        else:
-            return self._default_response(user)
+        """Process free text queries using the shared intent router"""
+        route = self.route_message(text, ('text',))
+        return dispatch(self, route, text, user)
     
     def _greeting_response(self, user):
         """Greeting response"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                f"Halo {user.name or 'Mama'}! 👋\n\n"
-                "Karibu kwenye MAMA-AI. Niko hapa kukusaidia katika safari yako ya ujauzito.\n\n"
-                "Je, una swali au ungependa msaada wowote?"
-            )
-        else:
-            return (
-                f"Hello {user.name or 'Mama'}! 👋\n\n"
-                "Welcome to MAMA-AI. I'm here to support you through your pregnancy journey.\n\n"
-                "Do you have any questions or need assistance?"
-            )
+        return render_response('greeting', user.preferred_language, name=user.name or 'Mama')
     
     def _baby_info(self, user):
         """Baby development information"""
         pregnancy = self._get_active_pregnancy(user)
         if pregnancy:
-            return self.get_weekly_info(pregnancy.weeks_pregnant or 20)
+            return self.get_weekly_info(current_week(pregnancy), user.preferred_language)
         else:
-            lang = user.preferred_language
-            if lang == 'sw':
-                return "Tafadhali sajili ujauzito wako ili tupate kutoa ushauri sahihi."
-            else:
-                return "Please register your pregnancy so we can provide appropriate guidance."
+            return response_text('register_pregnancy', user.preferred_language)
     
     def _appointment_info(self, user):
         """Appointment information"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "Kwa habari za miadi:\n\n"
-                "• Piga *123*3# kwa miadi yako\n"
-                "• Tumia SMS: APPOINTMENT\n"
-                "• Tembelea kliniki mara kwa mara\n\n"
-                "Ukumbusho wa miadi utatumwa siku 1 kabla."
-            )
-        else:
-            return (
-                "For appointment information:\n\n"
-                "• Dial *123*3# for your appointments\n"
-                "• SMS: APPOINTMENT\n"
-                "• Attend regular clinic visits\n\n"
-                "Appointment reminders sent 1 day before."
-            )
+        return response_text('appointment_info', user.preferred_language)
     
     def _default_response(self, user):
         """Default response for unrecognized queries"""
-        lang = user.preferred_language
-        if lang == 'sw':
-            return (
-                "Samahani, sijaelewi swali lako vizuri.\n\n"
-                "Unaweza:\n"
-                "• Piga *123# kwa menyu kamili\n"
-                "• Tuma SMS: HELP\n"
-                "• Wasiliana na daktari wako\n\n"
-                "Niko hapa kukusaidia!"
-            )
-        else:
-            return (
-                "Sorry, I didn't quite understand your question.\n\n"
-                "You can:\n"
-                "• Dial *123# for full menu\n"
-                "• SMS: HELP\n"
-                "• Contact your healthcare provider\n\n"
-                "I'm here to help!"
-            )
+        return response_text('default', user.preferred_language)
     
     def _get_active_pregnancy(self, user):
         """Get user's active pregnancy"""
@@ -597,8 +468,21 @@ class AIService:
 
     def chat_with_ai(self, message, user, conversation_history=None):
         """Main chat interface with AI"""
-        # Store conversation in session/database if needed
-        response = self.process_free_text_query(message, user)
+        # Only a model uses the context, so without one nothing is read.
+        # Recent turns come from this worker's ring buffer, loaded from
+        # message_logs on a miss; history sent by older clients is only
+        # used when there is nothing logged for this user.
+        history = ()
+        if get_llm_gateway() is not None:
+            store = get_conversation_store()
+            history = store.history(user.phone_number)
+            if not history:
+                history = turns_from_client(conversation_history, store.max_turns)
+        
+        response = self.answer_with_model(
+            message, user, 'chat', lambda: self.process_free_text_query(message, user),
+            history=history
+        )
         
         # Log the conversation
         self._log_conversation(user, message, response)
@@ -627,3 +511,8 @@ class AIService:
         )
         db.session.add(ai_log)
         db.session.commit()
+        
+        # Keep the in-memory context in step with what was just logged
+        store = get_conversation_store()
+        store.append(user.phone_number, 'user', user_message, user_log.created_at)
+        store.append(user.phone_number, 'assistant', ai_response, ai_log.created_at)
@@ -0,0 +1,184 @@
+import logging
+import os
+import threading
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import insert, update
+from src.models import db, EmergencyAlert
+from src.services.severity import format_features
+from src.utils.journal import WriteBehindJournal
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+ALERT_JOURNAL_PATH = os.getenv('ALERT_JOURNAL_PATH', os.path.join('instance', 'alert_journal.jsonl'))
+ALERT_FLUSH_INTERVAL = float(os.getenv('ALERT_FLUSH_INTERVAL', '1.0'))
+ALERT_DEDUP_WINDOW = int(os.getenv('ALERT_DEDUP_WINDOW', '600'))
+ALERT_DEDUP_USERS = int(os.getenv('ALERT_DEDUP_USERS', '10000'))
+
+# journal_id of the alert a call was folded into, its occurrence count, and
+# whether this call opened or escalated it (callers notify only then)
+AlertOutcome = namedtuple('AlertOutcome', ['journal_id', 'occurrences', 'is_new'])
+
+_alert_journal = None
+
+
+class _OpenAlert:
+    """Alert still inside its suppression window"""
+
+    __slots__ = ('journal_id', 'occurrences', 'severity_score', 'symptoms', 'features')
+
+    def __init__(self, journal_id, severity_score, symptoms, features):
+        self.journal_id = journal_id
+        self.occurrences = 1
+        self.severity_score = severity_score
+        self.symptoms = symptoms
+        self.features = features
+
+
+# Open alert per (user, alert type). The window runs from the first alert:
+# repeats update the cached entry in place without resetting its TTL. Each
+# gunicorn worker keeps its own window, so a storm opens at most one alert
+# per type per worker.
+_open_alerts = TTLCache(maxsize=ALERT_DEDUP_USERS, ttl=ALERT_DEDUP_WINDOW)
+_open_alerts_lock = threading.Lock()
+
+
+def persist_alerts(records):
+    """Apply journalled alerts: insert new ones once, fold repeats into their alert.
+
+    Inserts skip any journal_id already stored. Repeats carry the absolute
+    occurrence count and the alert's most severe symptoms, so a flush
+    issues at most one UPDATE per open alert and replaying it is harmless.
+    """
+    new_alerts = [record for record in records if 'repeat_of' not in record]
+    journal_ids = [record['journal_id'] for record in new_alerts]
+    stored = {
+        journal_id for (journal_id,) in db.session.query(EmergencyAlert.journal_id)
+        .filter(EmergencyAlert.journal_id.in_(journal_ids))
+    } if journal_ids else set()
+
+    rows = []
+    for record in new_alerts:
+        if record['journal_id'] in stored:
+            continue
+        stored.add(record['journal_id'])
+        row = dict(record)
+        row['created_at'] = datetime.fromisoformat(record['created_at'])
+        row['last_seen_at'] = datetime.fromisoformat(record.get('last_seen_at', record['created_at']))
+        rows.append(row)
+
+    if rows:
+        db.session.execute(insert(EmergencyAlert), rows)
+
+    latest = {}
+    for record in records:
+        if 'repeat_of' in record:
+            current = latest.get(record['repeat_of'])
+            if current is None or record['occurrences'] > current['occurrences']:
+                latest[record['repeat_of']] = record
+
+    for journal_id, record in latest.items():
+        values = {
+            'occurrences': record['occurrences'],
+            'severity_score': record['severity_score'],
+            'last_seen_at': datetime.fromisoformat(record['last_seen_at']),
+        }
+        # Repeats journalled before escalation was tracked carry no symptoms
+        for field in ('symptoms_reported', 'severity_features'):
+            if field in record:
+                values[field] = record[field]
+        db.session.execute(
+            update(EmergencyAlert)
+            .where(EmergencyAlert.journal_id == journal_id,
+                   EmergencyAlert.occurrences < record['occurrences'])
+            .values(**values)
+        )
+
+    db.session.commit()
+    return len(rows)
+
+
+def get_alert_journal():
+    """Return the process-wide alert journal"""
+    global _alert_journal
+    if _alert_journal is None:
+        _alert_journal = WriteBehindJournal(ALERT_JOURNAL_PATH, persist_alerts, recover=db.session.rollback)
+    return _alert_journal
+
+
+def reset_alert_journal():
+    """Stop the flusher, forget the journal and close every suppression window"""
+    global _alert_journal
+    if _alert_journal is not None:
+        _alert_journal.stop()
+    _alert_journal = None
+    _open_alerts.clear()
+
+
+def record_alert(user_id, alert_type, symptoms, severity, action_taken):
+    """Journal a scored alert, folding repeats of the same type into the open one.
+
+    A repeat that scores higher than the open alert escalates it: the alert
+    takes the new severity and symptoms and the outcome counts as new, so
+    callers notify again. Returns an AlertOutcome; the alert reaches
+    emergency_alerts on the next flush.
+    """
+    now = datetime.utcnow().isoformat()
+    features = format_features(severity.features)
+    journal = get_alert_journal()
+    key = (user_id, alert_type)
+    # Appends are serialised by the journal anyway; holding the window lock
+    # across them keeps a user's repeats behind the alert they fold into
+    with _open_alerts_lock:
+        open_alert = _open_alerts.get(key)
+        if open_alert is not None:
+            escalated = severity.score > open_alert.severity_score
+            open_alert.occurrences += 1
+            if escalated:
+                open_alert.severity_score = severity.score
+                open_alert.symptoms = symptoms
+                open_alert.features = features
+            journal.append({
+                'repeat_of': open_alert.journal_id,
+                'occurrences': open_alert.occurrences,
+                'severity_score': open_alert.severity_score,
+                'symptoms_reported': open_alert.symptoms,
+                'severity_features': open_alert.features,
+                'last_seen_at': now,
+            })
+            return AlertOutcome(open_alert.journal_id, open_alert.occurrences, escalated)
+
+        journal_id = journal.append({
+            'user_id': user_id,
+            'alert_type': alert_type,
+            'symptoms_reported': symptoms,
+            'severity_score': severity.score,
+            'severity_features': features,
+            'action_taken': action_taken,
+            'occurrences': 1,
+            'created_at': now,
+            'last_seen_at': now,
+        })
+        _open_alerts.set(key, _OpenAlert(journal_id, severity.score, symptoms, features))
+        return AlertOutcome(journal_id, 1, True)
+
+
+def notify_emergency_contact(user):
+    """Text the user's emergency contact that they raised an emergency"""
+    if not user.emergency_contact:
+        return None
+    from src.services.container import get_services
+    emergency_msg = f"EMERGENCY: {user.name or user.phone_number} has triggered an emergency alert through MAMA-AI. Please check on them immediately."
+    return get_services().sms.send_sms(user.emergency_contact, emergency_msg)
+
+
+def start_alert_flusher(app, interval=None):
+    """Drain the journal in the background, starting with alerts left by a crash.
+
+    No database work happens here; the flusher thread retries with backoff
+    until the database is reachable.
+    """
+    journal = get_alert_journal()
+    journal.start(interval or ALERT_FLUSH_INTERVAL, app.app_context)
+    return journal
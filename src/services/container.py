@@ -0,0 +1,104 @@
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """Builds the app's services on first use instead of at import.
+
+    A worker then boots without importing the Africa's Talking SDK or
+    constructing any service; the first request that needs one pays for it
+    once. The USSD and SMS services share a single AIService.
+    """
+
+    def __init__(self):
+        self.at_username = os.getenv('AFRICASTALKING_USERNAME')
+        self.at_api_key = os.getenv('AFRICASTALKING_API_KEY')
+        self.at_environment = os.getenv('AFRICASTALKING_ENVIRONMENT', 'sandbox')
+        self.at_shortcode = os.getenv('AFRICASTALKING_SHORTCODE', '985')
+        self._at_initialized = None
+        self._services = {}
+        self._lock = threading.RLock()
+
+    @property
+    def at_initialized(self):
+        """Initialize Africa's Talking on first use; True when credentials were accepted"""
+        if self._at_initialized is None:
+            with self._lock:
+                if self._at_initialized is None:
+                    self._at_initialized = self._init_africastalking()
+        return self._at_initialized
+
+    def _init_africastalking(self):
+        if not self.at_username or not self.at_api_key or self.at_api_key == 'test_api_key_for_development':
+            logger.warning("⚠️  Running in development mode without valid Africa's Talking credentials")
+            return False
+        try:
+            import africastalking
+            africastalking.initialize(self.at_username, self.at_api_key)
+        except Exception as e:
+            logger.error(f"⚠️  Africa's Talking initialization failed: {str(e)}")
+            logger.error("   Please check your credentials and try again")
+            return False
+        logger.info(f"✅ Africa's Talking initialized successfully!")
+        logger.info(f"   Username: {self.at_username}")
+        logger.info(f"   Environment: {self.at_environment}")
+        logger.info(f"   Shortcode: {self.at_shortcode}")
+        return True
+
+    def _get(self, name, factory):
+        service = self._services.get(name)
+        if service is None:
+            with self._lock:
+                service = self._services.get(name)
+                if service is None:
+                    service = factory()
+                    self._services[name] = service
+        return service
+
+    @property
+    def ai(self):
+        from src.services.ai_service import AIService
+        return self._get('ai', AIService)
+
+    @property
+    def ussd(self):
+        from src.services.ussd_service import USSDService
+        return self._get('ussd', lambda: USSDService(ai_service=self.ai))
+
+    @property
+    def sms(self):
+        def build():
+            from src.services.sms_service import SMSService
+            # SMSService binds africastalking.SMS, which exists only after initialize()
+            self.at_initialized
+            return SMSService(ai_service=self.ai)
+        return self._get('sms', build)
+
+    @property
+    def language_detector(self):
+        from src.utils.language_utils import LanguageDetector
+        return self._get('language_detector', LanguageDetector)
+
+    def built(self):
+        """Names of the services constructed so far"""
+        return sorted(self._services)
+
+
+_services = None
+
+
+def get_services():
+    """Return the process-wide service container"""
+    global _services
+    if _services is None:
+        _services = ServiceContainer()
+    return _services
+
+
+def reset_services(container=None):
+    """Replace the process-wide container (None builds a fresh one on next use)"""
+    global _services
+    _services = container
@@ -0,0 +1,211 @@
+import logging
+import os
+from collections import namedtuple
+from datetime import datetime
+from src.models import db, User, Pregnancy, MessageLog
+from src.utils.catalog import render
+from src.utils.emergency_screen import find_emergency
+from src.utils.journal import WriteBehindJournal
+from src.utils.response_registry import response_text
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+EMERGENCY_INGRESS_JOURNAL_PATH = os.getenv(
+    'EMERGENCY_INGRESS_JOURNAL_PATH', os.path.join('instance', 'emergency_ingress.jsonl')
+)
+EMERGENCY_INGRESS_FLUSH_INTERVAL = float(os.getenv('EMERGENCY_INGRESS_FLUSH_INTERVAL', '0.5'))
+KNOWN_LANGUAGES = int(os.getenv('EMERGENCY_KNOWN_LANGUAGES', '50000'))
+
+# What was caught at ingress: the keyword that hit (None for the USSD
+# emergency menu) and the kind of reply and follow-up it gets
+EmergencyHit = namedtuple('EmergencyHit', ['kind', 'keyword'])
+
+USSD_EMERGENCY_MENU = '4'
+# USSD paths whose last field is a free-text symptom report
+USSD_SYMPTOM_PATHS = (('1', '1'), ('2', '1'))
+# SMS commands handled before the emergency screen
+SUBSCRIPTION_INTENTS = frozenset(('stop', 'start'))
+
+_ingress_journal = None
+
+# Preferred language of recently seen numbers in this worker, filled
+# wherever a user is loaded or their preference changes
+_known_languages = TTLCache(maxsize=KNOWN_LANGUAGES, ttl=None)
+
+
+def remember_language(phone_number, language):
+    """Note a user's preferred language; call wherever preferred_language is written"""
+    _known_languages.set(phone_number, language)
+
+
+def reply_language(phone_number, text=None):
+    """The last preference this worker saw, else the language of text, else English.
+
+    Never touches the database, so the reply does not depend on its health;
+    the stored preference is read when the journal is applied.
+    """
+    language = _known_languages.get(phone_number)
+    if language is not None:
+        return language
+    if text and len(text.split()) > 1:
+        from src.utils.language_id import get_language_model
+        return get_language_model().predict(text)[0]
+    return 'en'
+
+
+def screen_ussd(text):
+    """Return an EmergencyHit for a USSD input string, or None"""
+    if text == USSD_EMERGENCY_MENU:
+        return EmergencyHit('ussd_menu', None)
+    inputs = (text or '').split('*')
+    if len(inputs) == 3 and tuple(inputs[:2]) in USSD_SYMPTOM_PATHS:
+        keyword = find_emergency(inputs[2])
+        if keyword:
+            return EmergencyHit('ussd_symptoms', keyword)
+    return None
+
+
+def screen_sms(text, route=None):
+    """Return an EmergencyHit for an inbound SMS, or None.
+
+    STOP/START commands (as routed by the intent router) are never screened.
+    """
+    if route is not None and route.intent is not None and route.intent.name in SUBSCRIPTION_INTENTS:
+        return None
+    keyword = find_emergency(text)
+    return EmergencyHit('sms', keyword) if keyword else None
+
+
+def emergency_reply(hit, language):
+    """The fixed reply for an emergency hit; nothing here touches the database"""
+    if hit.kind == 'ussd_menu':
+        return f"END {render(language, 'emergency_response')}"
+    if hit.kind == 'ussd_symptoms':
+        return f"END {response_text('emergency_symptoms', language)}"
+    return response_text('emergency_symptoms', language)
+
+
+def accept_emergency(hit, channel, phone_number, text, session_id=None):
+    """Answer an emergency caught at ingress and journal everything else.
+
+    The reply comes from in-process tables. Logging, the user lookup and
+    the alert are journalled to local disk and applied by the flusher, so
+    the reply does not wait on the database. Returns the reply text.
+    """
+    language = reply_language(phone_number, None if hit.kind == 'ussd_menu' else text)
+    reply = emergency_reply(hit, language)
+    try:
+        get_ingress_journal().append({
+            'kind': hit.kind,
+            'channel': channel,
+            'phone_number': phone_number,
+            'session_id': session_id,
+            'text': text,
+            'keyword': hit.keyword,
+            'reply': reply,
+            'received_at': datetime.utcnow().isoformat(),
+        })
+    except OSError as e:
+        # The user still gets the reply; only the record is lost
+        logger.error(f"❌ Could not journal emergency from {phone_number}: {str(e)}")
+    return reply
+
+
+def _already_applied(record):
+    """A replayed record whose messages were logged has been applied in full"""
+    return db.session.query(MessageLog.id).filter_by(
+        phone_number=record['phone_number'], message_type=record['channel'],
+        direction='incoming', created_at=datetime.fromisoformat(record['received_at'])
+    ).first() is not None
+
+
+def _log(record, direction, content):
+    db.session.add(MessageLog(
+        phone_number=record['phone_number'],
+        message_type=record['channel'],
+        direction=direction,
+        content=content,
+        session_id=record['session_id'],
+        created_at=datetime.fromisoformat(record['received_at'])
+    ))
+
+
+def _get_or_create_user(phone_number):
+    user = User.query.filter_by(phone_number=phone_number).first()
+    if not user:
+        user = User(phone_number=phone_number, preferred_language='en', is_active=True)
+        db.session.add(user)
+        db.session.flush()
+    remember_language(phone_number, user.preferred_language)
+    return user
+
+
+def persist_ingress(records):
+    """Apply journalled emergencies: raise the alert, then log both messages.
+
+    The logs are committed last and keyed on the ingress timestamp, so a
+    replay skips records that were applied in full. A record interrupted
+    before its commit is applied again, contact text included.
+    """
+    from src.services.alert_service import notify_emergency_contact, record_alert
+    from src.services.container import get_services
+    from src.services.language_switch import get_language_tracker
+    from src.services.severity import EMERGENCY_MENU_SEVERITY
+
+    services = get_services()
+    for record in records:
+        if _already_applied(record):
+            continue
+        user = _get_or_create_user(record['phone_number'])
+
+        if record['kind'] == 'ussd_menu':
+            outcome = record_alert(user.id, 'ussd_emergency', 'USSD emergency menu',
+                                   EMERGENCY_MENU_SEVERITY, 'emergency_response_sent')
+            if outcome.is_new:
+                notify_emergency_contact(user)
+        else:
+            symptoms = record['text'].split('*')[-1] if record['kind'] == 'ussd_symptoms' else record['text']
+            matches = services.ai.match_symptoms(symptoms)
+            severity = services.ai.score_severity(symptoms, user, matches)
+            record_alert(user.id, 'severe_symptoms', symptoms, severity, 'emergency_response_sent')
+
+            if record['kind'] == 'sms':
+                get_language_tracker().observe(user, record['text'])
+            elif record['text'].startswith('1*'):
+                pregnancy = Pregnancy.query.filter_by(user_id=user.id, is_active=True).first()
+                if pregnancy:
+                    pregnancy.current_symptoms = symptoms
+                    pregnancy.updated_at = datetime.utcnow()
+
+        _log(record, 'incoming', record['text'])
+        _log(record, 'outgoing', record['reply'])
+        db.session.commit()
+
+
+def get_ingress_journal():
+    """Return the process-wide emergency ingress journal"""
+    global _ingress_journal
+    if _ingress_journal is None:
+        _ingress_journal = WriteBehindJournal(EMERGENCY_INGRESS_JOURNAL_PATH, persist_ingress, recover=db.session.rollback)
+    return _ingress_journal
+
+
+def reset_ingress_journal():
+    """Stop the flusher, forget the journal and every remembered language"""
+    global _ingress_journal
+    if _ingress_journal is not None:
+        _ingress_journal.stop()
+    _ingress_journal = None
+    _known_languages.clear()
+
+
+def start_ingress_flusher(app, interval=None):
+    """Apply journalled emergencies in the background, starting with any left by a crash.
+
+    No database work happens here; the flusher thread retries with backoff
+    until the database is reachable.
+    """
+    journal = get_ingress_journal()
+    journal.start(interval or EMERGENCY_INGRESS_FLUSH_INTERVAL, app.app_context)
+    return journal
@@ -0,0 +1,148 @@
+from collections import namedtuple
+from src.utils.keyword_matcher import KeywordMatcher
+
+# handlers maps a routing context to the name of the method that answers it:
+#   'sms'      - SMSService commands
+#   'text'     - AIService free text (SMS fallback, USSD, /chat)
+#   'question' - AIService.answer_health_question
+#   'symptom'  - AIService normal symptom advice (matched by triage)
+# with_text tells the dispatcher to pass the message text to the handler.
+Intent = namedtuple('Intent', ['name', 'priority', 'keywords', 'handlers', 'with_text'])
+
+Route = namedtuple('Route', ['intent', 'context', 'handler', 'matches'])
+
+# Lower priority wins when a message matches several intents
+INTENTS = (
+    Intent('help', 10,
+           {'en': ('help', 'emergency'), 'sw': ('msaada', 'dharura')},
+           {'sms': '_handle_help_request'}, False),
+    Intent('stop', 20,
+           {'en': ('stop', 'unsubscribe'), 'sw': ('acha',)},
+           {'sms': '_handle_stop_request'}, False),
+    Intent('start', 30,
+           {'en': ('start', 'subscribe'), 'sw': ('anza',)},
+           {'sms': '_handle_start_request'}, False),
+    Intent('symptoms', 40,
+           {'en': ('symptoms', 'symptom', 'pain', 'bleeding', 'bleed', 'sick', 'sickness'),
+            'sw': ('dalili', 'maumivu', 'damu')},
+           {'sms': '_handle_symptoms_report', 'text': 'analyze_symptoms'}, True),
+    Intent('appointment', 50,
+           {'en': ('appointment', 'appointments', 'clinic', 'doctor'), 'sw': ('miadi',)},
+           {'sms': '_handle_appointment_request', 'text': '_appointment_info'}, False),
+    Intent('reminder', 60,
+           {'en': ('reminder', 'reminders', 'medicine'), 'sw': ('ukumbusho', 'dawa')},
+           {'sms': '_handle_reminder_request'}, False),
+    Intent('greeting', 70,
+           {'en': ('hello', 'hi', 'hey'), 'sw': ('halo', 'mambo', 'habari', 'hujambo')},
+           {'text': '_greeting_response'}, False),
+    Intent('baby', 80,
+           {'en': ('baby', 'movement', 'movements', 'kick', 'kicks', 'kicking'), 'sw': ('mtoto',)},
+           {'text': '_baby_info'}, False),
+
+    # Health questions
+    Intent('safety', 110,
+           {'en': ('safe', 'can i'), 'sw': ('salama', 'naweza')},
+           {'question': '_safety_advice'}, True),
+    Intent('pain', 120,
+           {'en': ('pain', 'hurt', 'hurts', 'ache', 'aches'), 'sw': ('maumivu',)},
+           {'question': '_pain_guidance'}, True),
+    Intent('food', 130,
+           {'en': ('eat', 'eating', 'food', 'foods'), 'sw': ('kula', 'chakula')},
+           {'question': '_food_advice'}, True),
+
+    # Common pregnancy discomforts
+    Intent('nausea', 210,
+           {'en': ('nausea', 'vomiting', 'morning sickness'), 'sw': ('tapika',)},
+           {'symptom': '_nausea_advice'}, False),
+    Intent('back_pain', 220,
+           {'en': ('back pain', 'backache'), 'sw': ('maumivu ya mgongo',)},
+           {'symptom': '_back_pain_advice'}, False),
+    Intent('fatigue', 230,
+           {'en': ('tired', 'fatigue', 'exhausted'), 'sw': ('uchovu',)},
+           {'symptom': '_fatigue_advice'}, False),
+    Intent('heartburn', 240,
+           {'en': ('heartburn', 'acidity', 'chest burn'), 'sw': ()},
+           {'symptom': '_heartburn_advice'}, False),
+)
+
+# Handler used when nothing in a context matches
+DEFAULT_HANDLERS = {
+    'text': '_default_response',
+    'question': '_general_health_advice',
+    'symptom': '_general_advice',
+}
+
+
+def intent_keywords(intent):
+    """Flatten an intent's per-language keywords"""
+    return tuple(keyword for words in intent.keywords.values() for keyword in words)
+
+
+def intents_for(context, intents=INTENTS):
+    """Return the intents that can be handled in a context, by priority"""
+    return sorted(
+        (intent for intent in intents if context in intent.handlers),
+        key=lambda intent: intent.priority
+    )
+
+
+class IntentRouter:
+    """Routes a message to one intent with a single word-boundary pass"""
+
+    def __init__(self, intents=INTENTS):
+        self.intents = {intent.name: intent for intent in intents}
+        self.matcher = KeywordMatcher(
+            {intent.name: intent_keywords(intent) for intent in intents},
+            whole_words=True
+        )
+
+    def route(self, text, contexts):
+        """Pick the highest-priority intent handled in any of the contexts.
+
+        Contexts are tried in order, so ('sms', 'text') prefers an SMS
+        command handler and falls back to the free-text one.
+        """
+        return self.select(self.matcher.find_all(text), contexts)
+
+    def select(self, matches, contexts):
+        """Route from keyword matches that were already computed"""
+        best = None
+        for match in matches:
+            intent = self.intents[match.label]
+            if best is not None and intent.priority >= best.priority:
+                continue
+            if any(context in intent.handlers for context in contexts):
+                best = intent
+
+        if best is None:
+            context = contexts[-1]
+            return Route(None, context, DEFAULT_HANDLERS.get(context), matches)
+
+        for context in contexts:
+            if context in best.handlers:
+                return Route(best, context, best.handlers[context], matches)
+
+
+def dispatch(owner, route, text, user):
+    """Call the handler chosen by route on owner"""
+    handler = getattr(owner, route.handler)
+    if route.intent is not None and route.intent.with_text:
+        return handler(text, user)
+    return handler(user)
+
+
+_router = None
+
+
+def get_intent_router():
+    """Return the process-wide router, compiling it on first use"""
+    global _router
+    if _router is None:
+        _router = IntentRouter()
+    return _router
+
+
+def reset_intent_router():
+    """Drop the compiled router so the next call recompiles the table"""
+    global _router
+    _router = None
@@ -0,0 +1,151 @@
+import logging
+import os
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from src.models import db, KickCount, KickTrend
+from src.services.alert_service import record_alert
+from src.services.severity import KEYWORD_WEIGHTS, MAX_SCORE, SeverityScore
+
+logger = logging.getLogger(__name__)
+
+# USSD 1*2 answers: 1 under 3 movements in the hour, 2 three to five, 3 over 5
+LOW_BUCKET = 1
+BUCKETS = (1, 2, 3)
+
+WINDOW_DAYS = 7
+HISTORY_DAYS = 2 * WINDOW_DAYS   # this week plus the week before, for the trend
+
+KICK_LOW_STREAK = int(os.getenv('KICK_LOW_STREAK', '2'))
+KICK_TREND_DROP = float(os.getenv('KICK_TREND_DROP', '0.75'))
+KICK_MIN_REPORTS = int(os.getenv('KICK_MIN_REPORTS', '2'))
+
+# Rolling view of a user's reports; mean_7d and previous_mean_7d are None
+# when the window has no reports, trend is their difference
+MovementTrend = namedtuple('MovementTrend', [
+    'mean_7d', 'previous_mean_7d', 'trend', 'reports_7d', 'consecutive_low', 'reports', 'escalate'
+])
+
+
+def parse_bucket(movement_report):
+    """Return the bucket for a USSD answer, or None if it is not a menu choice"""
+    try:
+        bucket = int(str(movement_report).strip())
+    except ValueError:
+        return None
+    return bucket if bucket in BUCKETS else None
+
+
+def _decode(days):
+    return [int(value) for value in days.split(',')]
+
+
+def _encode(values):
+    return ','.join(str(value) for value in values)
+
+
+def _shifted(values, days):
+    """Age a newest-first daily ring by `days`, dropping what falls off the end"""
+    if days <= 0:
+        return list(values)
+    days = min(days, HISTORY_DAYS)
+    return [0] * days + list(values[:HISTORY_DAYS - days])
+
+
+def _mean(sums, counts):
+    reports = sum(counts)
+    return (sum(sums) / reports if reports else None), reports
+
+
+def _trend(stats, today):
+    """Build the MovementTrend for stats as seen on today (a constant-size computation)"""
+    elapsed = (today - stats.last_report_on).days
+    sums = _shifted(_decode(stats.day_sums), elapsed)
+    counts = _shifted(_decode(stats.day_counts), elapsed)
+
+    mean_7d, reports_7d = _mean(sums[:WINDOW_DAYS], counts[:WINDOW_DAYS])
+    previous_mean_7d, _ = _mean(sums[WINDOW_DAYS:], counts[WINDOW_DAYS:])
+    trend = None
+    if mean_7d is not None and previous_mean_7d is not None:
+        trend = round(mean_7d - previous_mean_7d, 3)
+
+    escalate = stats.consecutive_low >= KICK_LOW_STREAK or (
+        trend is not None and reports_7d >= KICK_MIN_REPORTS and trend <= -KICK_TREND_DROP
+    )
+    return MovementTrend(mean_7d, previous_mean_7d, trend, reports_7d,
+                         stats.consecutive_low, stats.reports, escalate)
+
+
+def _locked_trend(user_id):
+    return db.session.get(KickTrend, user_id, with_for_update=True, populate_existing=True)
+
+
+def record_kick_count(user_id, bucket, now=None):
+    """Append a movement report and fold it into the user's rolling aggregates.
+
+    The aggregate row holds 14 daily sums and counts, so an insert updates a
+    fixed amount of state instead of rescanning the user's history.
+    Returns the MovementTrend after this report.
+    """
+    now = now or datetime.utcnow()
+    today = now.date()
+    db.session.add(KickCount(user_id=user_id, recorded_at=now, bucket=bucket))
+
+    stats = _locked_trend(user_id)
+    if stats is None:
+        # Two first reports can race here; the loser re-reads the winner's row
+        try:
+            with db.session.begin_nested():
+                db.session.add(KickTrend(user_id=user_id, last_report_on=today,
+                                         day_sums=_encode([0] * HISTORY_DAYS),
+                                         day_counts=_encode([0] * HISTORY_DAYS),
+                                         consecutive_low=0, reports=0))
+        except IntegrityError:
+            logger.info(f"Kick trend for user {user_id} was created concurrently; updating it")
+        stats = _locked_trend(user_id)
+
+    # A late-arriving report for an earlier day is counted on the newest day
+    elapsed = max((today - stats.last_report_on).days, 0)
+    sums = _shifted(_decode(stats.day_sums), elapsed)
+    counts = _shifted(_decode(stats.day_counts), elapsed)
+    sums[0] += bucket
+    counts[0] += 1
+
+    stats.last_report_on = max(today, stats.last_report_on)
+    stats.day_sums = _encode(sums)
+    stats.day_counts = _encode(counts)
+    stats.consecutive_low = stats.consecutive_low + 1 if bucket == LOW_BUCKET else 0
+    stats.reports = stats.reports + 1
+    db.session.commit()
+
+    return _trend(stats, stats.last_report_on)
+
+
+def get_kick_trend(user_id, today=None):
+    """Return a user's MovementTrend from the aggregate row, or None without reports"""
+    stats = db.session.get(KickTrend, user_id)
+    if stats is None:
+        return None
+    return _trend(stats, today or datetime.utcnow().date())
+
+
+def trend_severity(trend, weeks_pregnant=None):
+    """Score a declining movement pattern on the emergency alert scale"""
+    features = [('reduced_movement', KEYWORD_WEIGHTS['reduced movement'])]
+    if trend.consecutive_low >= KICK_LOW_STREAK:
+        features.append(('low_movement_streak', 1))
+    if trend.trend is not None and trend.trend <= -KICK_TREND_DROP:
+        features.append(('falling_movement_trend', 1))
+    if weeks_pregnant is not None and weeks_pregnant >= 28:
+        features.append(('late_reduced_movement', 1))
+    return SeverityScore(min(sum(points for _, points in features), MAX_SCORE), features)
+
+
+def escalate_movement_trend(user_id, trend, weeks_pregnant=None):
+    """Raise a health worker alert for a declining movement pattern"""
+    symptoms = (f"Baby movement declining: 7-day mean {trend.mean_7d:.2f}, "
+                f"trend {trend.trend if trend.trend is not None else 'n/a'}, "
+                f"{trend.consecutive_low} low reports in a row")
+    logger.warning(f"Escalating reduced movement for user {user_id}: {symptoms}")
+    return record_alert(user_id, 'reduced_movement_trend', symptoms,
+                        trend_severity(trend, weeks_pregnant), 'health_worker_review')
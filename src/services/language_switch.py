@@ -0,0 +1,120 @@
+import logging
+import os
+import threading
+from src.models import db
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+LANGUAGE_EWMA_ALPHA = float(os.getenv('LANGUAGE_EWMA_ALPHA', '0.45'))
+LANGUAGE_SWITCH_AT = float(os.getenv('LANGUAGE_SWITCH_AT', '0.75'))
+LANGUAGE_SWITCH_MIN_MESSAGES = int(os.getenv('LANGUAGE_SWITCH_MIN_MESSAGES', '2'))
+LANGUAGE_MIN_WORDS = int(os.getenv('LANGUAGE_MIN_WORDS', '2'))
+LANGUAGE_TRACKER_USERS = int(os.getenv('LANGUAGE_TRACKER_USERS', '10000'))
+LANGUAGE_TRACKER_TTL = int(os.getenv('LANGUAGE_TRACKER_TTL', '604800'))
+
+SUPPORTED_LANGUAGES = ('en', 'sw')
+
+
+class LanguageEstimate:
+    """Exponentially weighted share of each language in a user's recent messages"""
+
+    __slots__ = ('preferred', 'weights', 'messages')
+
+    def __init__(self, preferred):
+        self.preferred = preferred
+        self.weights = {lang: 1.0 if lang == preferred else 0.0 for lang in SUPPORTED_LANGUAGES}
+        self.messages = 0
+
+    def update(self, posteriors, alpha):
+        for lang in self.weights:
+            self.weights[lang] += alpha * (posteriors.get(lang, 0.0) - self.weights[lang])
+        self.messages += 1
+
+
+class LanguageTracker:
+    """Per-user language estimate that switches preferred_language with hysteresis.
+
+    Each inbound message nudges the user's estimate; the preference changes,
+    with one UPDATE, only once another language's weight reaches switch_at.
+    Switching back needs the old language to reach switch_at again, so a
+    user who mixes languages does not flip on every message. Estimates live
+    in memory and restart from the stored preference after eviction.
+    """
+
+    def __init__(self, alpha=None, switch_at=None, min_messages=None, min_words=None,
+                 maxsize=None, ttl=None, model=None):
+        self.alpha = LANGUAGE_EWMA_ALPHA if alpha is None else alpha
+        self.switch_at = LANGUAGE_SWITCH_AT if switch_at is None else switch_at
+        self.min_messages = LANGUAGE_SWITCH_MIN_MESSAGES if min_messages is None else min_messages
+        self.min_words = LANGUAGE_MIN_WORDS if min_words is None else min_words
+        self._model = model
+        self._estimates = TTLCache(
+            maxsize=LANGUAGE_TRACKER_USERS if maxsize is None else maxsize,
+            ttl=LANGUAGE_TRACKER_TTL if ttl is None else ttl
+        )
+        self._lock = threading.Lock()
+        self.switches = 0
+
+    def estimate(self, user):
+        """Return the cached estimate, restarting it if the preference changed elsewhere"""
+        estimate = self._estimates.get(user.id)
+        if estimate is None or estimate.preferred != user.preferred_language:
+            estimate = LanguageEstimate(user.preferred_language)
+            self._estimates.set(user.id, estimate)
+        return estimate
+
+    def observe(self, user, text):
+        """Fold one inbound message into the user's estimate.
+
+        Returns the new language if the preference was switched, else None.
+        Short messages (commands, menu digits) are not scored at all.
+        """
+        if len((text or '').split()) < self.min_words:
+            return None
+        from src.utils.language_id import get_language_model
+        posteriors = (self._model or get_language_model()).posteriors(text)
+        if posteriors is None:
+            return None
+
+        with self._lock:
+            estimate = self.estimate(user)
+            estimate.update(posteriors, self.alpha)
+            if estimate.messages < self.min_messages:
+                return None
+            candidate = max(estimate.weights, key=estimate.weights.get)
+            if candidate == estimate.preferred or estimate.weights[candidate] < self.switch_at:
+                return None
+            estimate.preferred = candidate
+
+        previous = user.preferred_language
+        user.preferred_language = candidate
+        db.session.commit()
+        from src.services.emergency_ingress import remember_language
+        remember_language(user.phone_number, candidate)
+        self.switches += 1
+        logger.info(f"Switched user {user.id} from {previous} to {candidate}")
+        return candidate
+
+    def stats(self):
+        """Return switch counts and estimate cache counters"""
+        stats = self._estimates.stats()
+        stats['switches'] = self.switches
+        return stats
+
+
+_language_tracker = None
+
+
+def get_language_tracker():
+    """Return the process-wide language tracker"""
+    global _language_tracker
+    if _language_tracker is None:
+        _language_tracker = LanguageTracker()
+    return _language_tracker
+
+
+def reset_language_tracker(tracker=None):
+    """Replace the process-wide tracker (None builds a fresh one on next use)"""
+    global _language_tracker
+    _language_tracker = tracker
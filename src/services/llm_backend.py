@@ -0,0 +1,270 @@
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+logger = logging.getLogger(__name__)
+
+# Seconds a caller on each channel waits for a model answer before the
+# keyword engine answers instead. USSD sessions time out after a few seconds.
+DEFAULT_BUDGETS = {
+    'ussd': float(os.getenv('AI_BUDGET_USSD', '2.5')),
+    'sms': float(os.getenv('AI_BUDGET_SMS', '5')),
+    'chat': float(os.getenv('AI_BUDGET_CHAT', '10')),
+}
+AI_MAX_WORKERS = int(os.getenv('AI_MAX_WORKERS', '4'))
+AI_MAX_PENDING = int(os.getenv('AI_MAX_PENDING', '32'))
+
+_llm_gateway = None
+_llm_gateway_loaded = False
+
+
+class LLMError(Exception):
+    """The model backend failed or returned an unusable answer"""
+
+
+class LLMBackend(ABC):
+    """One hosted model API; complete() returns the answer text or raises LLMError"""
+
+    name = None
+    default_model = None
+    default_base_url = None
+
+    def __init__(self, api_key, model=None, base_url=None, max_tokens=500,
+                 temperature=0.7, timeout=10.0):
+        self.api_key = api_key
+        self.model = model or self.default_model
+        self.base_url = (base_url or self.default_base_url).rstrip('/')
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.timeout = timeout
+        # requests is imported only once a backend is configured; workers boot without it
+        import requests
+        self.session = requests.Session()
+
+    @abstractmethod
+    def complete(self, prompt, system=None, history=()):
+        """history is a sequence of (role, content) turns, role 'user' or 'assistant'"""
+
+    def _post(self, url, payload, headers=None):
+        import requests
+        try:
+            response = self.session.post(url, json=payload, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise LLMError(f"{self.name} request failed: {e}") from e
+
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI chat completions, or any server exposing the same API"""
+
+    name = 'openai'
+    default_model = 'gpt-3.5-turbo'
+    default_base_url = 'https://api.openai.com/v1'
+
+    def complete(self, prompt, system=None, history=()):
+        messages = [{'role': 'system', 'content': system}] if system else []
+        messages.extend({'role': role, 'content': content} for role, content in history)
+        messages.append({'role': 'user', 'content': prompt})
+        data = self._post(
+            f"{self.base_url}/chat/completions",
+            {'model': self.model, 'messages': messages,
+             'max_tokens': self.max_tokens, 'temperature': self.temperature},
+            {'Authorization': f"Bearer {self.api_key}"},
+        )
+        try:
+            return data['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"Unexpected openai response: {data!r:.200}") from e
+
+
+class AnthropicBackend(LLMBackend):
+    """Anthropic messages API"""
+
+    name = 'anthropic'
+    default_model = 'claude-3-haiku-20240307'
+    default_base_url = 'https://api.anthropic.com'
+
+    def complete(self, prompt, system=None, history=()):
+        messages = [{'role': role, 'content': content} for role, content in history]
+        # The messages API requires the conversation to open with a user turn
+        while messages and messages[0]['role'] != 'user':
+            messages.pop(0)
+        messages.append({'role': 'user', 'content': prompt})
+        payload = {'model': self.model, 'max_tokens': self.max_tokens,
+                   'temperature': self.temperature, 'messages': messages}
+        if system:
+            payload['system'] = system
+        data = self._post(
+            f"{self.base_url}/v1/messages", payload,
+            {'x-api-key': self.api_key, 'anthropic-version': '2023-06-01'},
+        )
+        try:
+            return ''.join(block['text'] for block in data['content'] if block['type'] == 'text')
+        except (KeyError, TypeError) as e:
+            raise LLMError(f"Unexpected anthropic response: {data!r:.200}") from e
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini generateContent API"""
+
+    name = 'google'
+    default_model = 'gemini-pro'
+    default_base_url = 'https://generativelanguage.googleapis.com/v1beta'
+
+    def complete(self, prompt, system=None, history=()):
+        contents = [
+            {'role': 'model' if role == 'assistant' else 'user', 'parts': [{'text': content}]}
+            for role, content in history
+        ]
+        contents.append({'role': 'user', 'parts': [{'text': prompt}]})
+        payload = {
+            'contents': contents,
+            'generationConfig': {'maxOutputTokens': self.max_tokens,
+                                 'temperature': self.temperature},
+        }
+        if system:
+            payload['systemInstruction'] = {'parts': [{'text': system}]}
+        data = self._post(
+            f"{self.base_url}/models/{self.model}:generateContent", payload,
+            {'x-goog-api-key': self.api_key},
+        )
+        try:
+            return ''.join(part['text'] for part in data['candidates'][0]['content']['parts'])
+        except (KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"Unexpected google response: {data!r:.200}") from e
+
+
+# AI_PROVIDER value -> (backend class, API key variable)
+BACKENDS = {
+    'openai': (OpenAIBackend, 'OPENAI_API_KEY'),
+    'anthropic': (AnthropicBackend, 'ANTHROPIC_API_KEY'),
+    'google': (GeminiBackend, 'GOOGLE_API_KEY'),
+}
+
+
+class LLMGateway:
+    """Runs backend calls on a bounded pool under per-channel latency budgets.
+
+    Concurrent callers with the same (system, history, prompt) share one
+    in-flight call. A caller whose budget runs out gets fallback() while the
+    call keeps running for anyone else waiting on it. Once max_pending distinct
+    calls are in flight, new prompts go straight to fallback() instead of
+    queueing behind them.
+    """
+
+    def __init__(self, backend, budgets=None, max_workers=AI_MAX_WORKERS,
+                 max_pending=AI_MAX_PENDING):
+        self.backend = backend
+        self.budgets = dict(DEFAULT_BUDGETS, **(budgets or {}))
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='llm')
+        self._inflight = {}
+        # Re-entrant: add_done_callback runs _forget inline if the call already finished
+        self._lock = threading.RLock()
+        self._counts = dict.fromkeys(
+            ('calls', 'answered', 'coalesced', 'timeouts', 'errors', 'rejected'), 0
+        )
+
+    def ask(self, prompt, channel, fallback, system=None, history=()):
+        """Return the model answer within the channel budget, else fallback()"""
+        budget = self.budgets.get(channel, self.budgets['chat'])
+        history = tuple(history)
+        key = (system, history, prompt)
+
+        with self._lock:
+            self._counts['calls'] += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self._counts['coalesced'] += 1
+            elif len(self._inflight) >= self.max_pending:
+                self._counts['rejected'] += 1
+            else:
+                future = self._executor.submit(self.backend.complete, prompt, system, history)
+                self._inflight[key] = future
+                future.add_done_callback(lambda done, key=key: self._forget(key, done))
+
+        if future is None:
+            return fallback()
+        try:
+            answer = future.result(timeout=budget)
+        except FutureTimeout:
+            self._count('timeouts')
+            logger.warning(f"LLM answer exceeded the {channel} budget of {budget}s")
+            return fallback()
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"LLM backend failed, using keyword answer: {e}")
+            return fallback()
+
+        if not answer or not answer.strip():
+            self._count('errors')
+            return fallback()
+        self._count('answered')
+        return answer.strip()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counts)
+            stats['in_flight'] = len(self._inflight)
+        stats['backend'] = self.backend.name
+        return stats
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+
+def create_backend(provider=None):
+    """Build the backend named by AI_PROVIDER, or None when it is unset or has no key"""
+    provider = (provider or os.getenv('AI_PROVIDER', '')).strip().lower()
+    if not provider or provider == 'none':
+        return None
+    if provider not in BACKENDS:
+        logger.warning(f"⚠️  Unknown AI_PROVIDER '{provider}', using keyword answers only")
+        return None
+
+    backend_class, key_variable = BACKENDS[provider]
+    api_key = os.getenv(key_variable)
+    if not api_key:
+        logger.warning(f"⚠️  {key_variable} is not set, using keyword answers only")
+        return None
+
+    return backend_class(
+        api_key,
+        model=os.getenv('AI_MODEL'),
+        base_url=os.getenv('AI_BASE_URL'),
+        max_tokens=int(os.getenv('AI_MAX_TOKENS', '500')),
+        temperature=float(os.getenv('AI_TEMPERATURE', '0.7')),
+        # Long enough for the slowest channel; coalesced callers may be on any
+        timeout=float(os.getenv('AI_TIMEOUT', str(max(DEFAULT_BUDGETS.values())))),
+    )
+
+
+def get_llm_gateway():
+    """Return the process-wide gateway, or None when no model is configured"""
+    global _llm_gateway, _llm_gateway_loaded
+    if not _llm_gateway_loaded:
+        backend = create_backend()
+        _llm_gateway = LLMGateway(backend) if backend else None
+        _llm_gateway_loaded = True
+    return _llm_gateway
+
+
+def set_llm_gateway(gateway):
+    """Install a gateway (or None to disable model answers)"""
+    global _llm_gateway, _llm_gateway_loaded
+    if _llm_gateway is not None and _llm_gateway is not gateway:
+        _llm_gateway.shutdown()
+    _llm_gateway = gateway
+    _llm_gateway_loaded = True
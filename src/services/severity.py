@@ -0,0 +1,113 @@
+from collections import namedtuple
+from src.models import EmergencyAlert
+
+# Score on the 1-10 scale plus the (feature, points) pairs that produced it
+SeverityScore = namedtuple('SeverityScore', ['score', 'features'])
+
+MIN_SCORE = 1
+MAX_SCORE = 10
+
+# The user chose "Emergency" from the USSD menu; there is no text to score
+EMERGENCY_MENU_SEVERITY = SeverityScore(9, [('emergency_menu', 9)])
+
+# Default weight for a keyword that has no explicit weight
+TIER_WEIGHTS = {
+    'emergency': 7,
+    'high_risk': 4,
+}
+
+KEYWORD_WEIGHTS = {
+    'severe bleeding': 9, 'heavy bleeding': 9, 'bleeding heavily': 9, 'damu nyingi': 9,
+    'vomiting blood': 8, 'kutapika damu': 8, 'blood in vomit': 8,
+    'can\'t breathe': 9, 'sijui kupumua': 9, 'difficulty breathing': 8,
+    'water broke': 8, 'maji yamevunjika': 8, 'waters breaking': 8,
+    'severe pain': 7, 'maumivu makali': 7, 'unbearable pain': 8, 'sharp pain': 6,
+    'blurred vision': 7, 'vision problems': 7, 'can\'t see': 7, 'miwani': 5,
+    'severe headache': 7, 'maumivu ya kichwa': 6, 'head pounding': 6,
+    'fever': 6, 'homa': 6, 'high temperature': 6, 'hot': 3,
+    'no movement': 7, 'reduced movement': 6, 'contractions': 5, 'bleeding': 5,
+    'spotting': 4, 'cramping': 4, 'swelling': 4, 'headache': 4, 'dizziness': 4,
+    'nausea': 2, 'vomiting': 3,
+}
+
+_BLEEDING = frozenset(('bleeding', 'severe bleeding', 'heavy bleeding', 'bleeding heavily',
+                       'damu nyingi', 'spotting'))
+_PAIN = frozenset(('severe pain', 'maumivu makali', 'unbearable pain', 'sharp pain', 'cramping'))
+_HEADACHE = frozenset(('headache', 'severe headache', 'maumivu ya kichwa', 'head pounding'))
+_VISION = frozenset(('blurred vision', 'vision problems', 'can\'t see', 'miwani'))
+_FEVER = frozenset(('fever', 'homa', 'high temperature', 'hot'))
+_VOMITING = frozenset(('vomiting', 'vomiting blood', 'kutapika damu', 'blood in vomit'))
+_LABOUR = frozenset(('contractions', 'water broke', 'maji yamevunjika', 'waters breaking'))
+_MOVEMENT = frozenset(('reduced movement', 'no movement'))
+
+# (feature, keyword groups that must all be present, points)
+CO_OCCURRENCE_RULES = (
+    ('preeclampsia_signs', (_HEADACHE, _VISION), 2),
+    ('preeclampsia_swelling', (_HEADACHE, frozenset(('swelling',))), 1),
+    ('bleeding_with_pain', (_BLEEDING, _PAIN), 2),
+    ('infection_signs', (_FEVER, _VOMITING), 1),
+    ('dizzy_with_bleeding', (frozenset(('dizziness',)), _BLEEDING), 2),
+)
+
+# (feature, keyword group, first week, last week, points)
+PREGNANCY_WEEK_RULES = (
+    ('early_pregnancy_bleeding', _BLEEDING, 0, 19, 1),
+    ('late_pregnancy_preeclampsia', _HEADACHE | _VISION, 20, 45, 1),
+    ('preterm_labour', _LABOUR, 20, 36, 2),
+    ('late_reduced_movement', _MOVEMENT, 28, 45, 1),
+)
+
+
+def score_matches(matches, weeks_pregnant=None):
+    """Compute a 1-10 severity from triage keyword matches.
+
+    The matches come straight from the triage pass, so scoring never
+    re-reads the message. The strongest keyword sets the base score;
+    extra symptoms, co-occurrence rules and the pregnancy week add to it.
+    Typo matches lose one point per edit.
+    """
+    weights = {}
+    for match in matches:
+        base = TIER_WEIGHTS.get(match.label)
+        if base is None:
+            continue
+        weight = max(KEYWORD_WEIGHTS.get(match.keyword, base) - match.distance, MIN_SCORE)
+        weights[match.keyword] = max(weight, weights.get(match.keyword, 0))
+
+    if not weights:
+        return SeverityScore(MIN_SCORE, [])
+
+    strongest = max(weights, key=weights.get)
+    features = [(f"keyword:{strongest}", weights[strongest])]
+
+    if len(weights) >= 3:
+        features.append(('multiple_symptoms', 1))
+
+    found = set(weights)
+    for name, groups, points in CO_OCCURRENCE_RULES:
+        if all(found & group for group in groups):
+            features.append((name, points))
+
+    if weeks_pregnant is not None:
+        for name, group, first_week, last_week, points in PREGNANCY_WEEK_RULES:
+            if first_week <= weeks_pregnant <= last_week and found & group:
+                features.append((name, points))
+
+    score = sum(points for _, points in features)
+    return SeverityScore(min(max(score, MIN_SCORE), MAX_SCORE), features)
+
+
+def format_features(features):
+    """Serialize features as 'feature=points' pairs for EmergencyAlert.severity_features"""
+    return ','.join(f"{name}={points}" for name, points in features) or None
+
+
+def open_alert_queue(limit=50):
+    """Unresolved alerts, most severe first; served by ix_emergency_alerts_queue"""
+    return (
+        EmergencyAlert.query
+        .filter(EmergencyAlert.resolved.is_(False))
+        .order_by(EmergencyAlert.severity_score.desc(), EmergencyAlert.created_at)
+        .limit(limit)
+        .all()
+    )
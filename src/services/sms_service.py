@@ -1,30 +1,40 @@
 import os
 import africastalking
 from datetime import datetime, timedelta
-from src.models import db, User, Reminder, MessageLog, Appointment
-from src.utils.language_utils import get_translation
+from src.models import db, User, Pregnancy, Reminder, MessageLog, Appointment
+from src.utils.catalog import render
+from src.utils.phone import normalize_phone
+from src.utils.response_registry import describe_message
+from src.utils.weekly_content import weekly_content, FIRST_WEEK, LAST_WEEK
 from src.services.ai_service import AIService
+from src.services.emergency_ingress import accept_emergency, remember_language, screen_sms
+from src.services.intent_router import dispatch
+from src.services.language_switch import get_language_tracker
 
 class SMSService:
-    def __init__(self):
+    def __init__(self, ai_service=None):
         self.sms = africastalking.SMS
-        self.ai_service = AIService()
+        self.ai_service = ai_service or AIService()
     
-    def send_sms(self, phone_number, message, sender_id=None):
-        """Send SMS using Africa's Talking"""
+    def send_sms(self, phone_number, message, sender_id=None, log=True):
+        """Send SMS using Africa's Talking; log=False leaves logging to the caller"""
         try:
             # Clean phone number
-            clean_phone = self._clean_phone_number(phone_number)
+            clean_phone = normalize_phone(phone_number)
+            
+            # Registry replies carry a precomputed segment count
+            entry = describe_message(message)
             
             # Send SMS
             response = self.sms.send(
-                message=message,
+                message=entry.text,
                 recipients=[clean_phone],
                 sender_id=sender_id
             )
             
             # Log the SMS
-            self._log_message(clean_phone, "SMS", "outgoing", message)
+            if log:
+                self._log_message(clean_phone, "SMS", "outgoing", message, segments=entry.segments)
             
             return response
             
@@ -36,7 +46,15 @@ class SMSService:
         """Handle incoming SMS messages"""
         try:
             # Clean phone number
-            clean_phone = self._clean_phone_number(from_number)
+            clean_phone = normalize_phone(from_number)
+            
+            # Emergencies are answered before any database work; logging and
+            # the alert follow from the ingress journal. STOP/START go first.
+            hit = screen_sms(text, self.ai_service.route_message(text.strip().lower(), ('sms', 'text')))
+            if hit:
+                reply = accept_emergency(hit, "SMS", clean_phone, text)
+                self.send_sms(clean_phone, reply, log=False)
+                return {"status": "processed", "response_sent": True, "emergency": True}
             
             # Log incoming SMS
             self._log_message(clean_phone, "SMS", "incoming", text)
@@ -44,6 +62,9 @@ class SMSService:
             # Get or create user
             user = self._get_or_create_user(clean_phone)
             
+            # Follow the language the user actually writes in
+            get_language_tracker().observe(user, text)
+            
             # Process the SMS based on content
             response = self._process_sms_content(text.strip().lower(), user)
             
@@ -59,47 +80,19 @@ class SMSService:
     
     def _process_sms_content(self, text, user):
         """Process SMS content and generate appropriate response"""
-        lang = user.preferred_language
-        
-        # Check for specific keywords
-        if any(keyword in text for keyword in ['help', 'msaada', 'emergency', 'dharura']):
-            return self._handle_help_request(user)
-        
-        elif any(keyword in text for keyword in ['stop', 'acha', 'unsubscribe']):
-            return self._handle_stop_request(user)
-        
-        elif any(keyword in text for keyword in ['start', 'anza', 'subscribe']):
-            return self._handle_start_request(user)
-        
-        elif any(keyword in text for keyword in ['appointment', 'miadi', 'clinic']):
-            return self._handle_appointment_request(user)
-        
-        elif any(keyword in text for keyword in ['symptoms', 'dalili', 'pain', 'bleeding']):
-            return self._handle_symptoms_report(text, user)
-        
-        elif any(keyword in text for keyword in ['reminder', 'ukumbusho', 'medicine', 'dawa']):
-            return self._handle_reminder_request(user)
-        
-        else:
-            # Use AI to understand and respond to the message
-            return self.ai_service.process_free_text_query(text, user)
+        # SMS commands win; anything else is free text for the model, or the keyword engine
+        route = self.ai_service.route_message(text, ('sms', 'text'))
+        if route.context == 'sms':
+            return dispatch(self, route, text, user)
+        return self.ai_service.answer_with_model(
+            text, user, 'sms', lambda: dispatch(self.ai_service, route, text, user)
+        )
     
     def _handle_help_request(self, user):
         """Handle help requests"""
         lang = user.preferred_language
         
-        help_msg = get_translation(lang, "sms_help",
-            "MAMA-AI Help 📱\n\n"
-            "SMS Commands:\n"
-            "• HELP - This help message\n"
-            "• SYMPTOMS - Report symptoms\n"
-            "• APPOINTMENT - Check appointments\n"
-            "• REMINDER - Set medication reminder\n"
-            "• EMERGENCY - Get emergency help\n"
-            "• STOP - Unsubscribe\n\n"
-            "USSD: Dial *123# for full menu\n\n"
-            "Emergency: Call 911"
-        )
+        help_msg = render(lang, "sms_help")
         
         return help_msg
     
@@ -112,10 +105,7 @@ class SMSService:
         user.updated_at = datetime.utcnow()
         db.session.commit()
         
-        return get_translation(lang, "unsubscribed",
-            "You have been unsubscribed from MAMA-AI messages. "
-            "SMS START to reactivate. For emergencies, always call 911."
-        )
+        return render(lang, "unsubscribed")
     
     def _handle_start_request(self, user):
         """Handle subscription requests"""
@@ -126,12 +116,7 @@ class SMSService:
         user.updated_at = datetime.utcnow()
         db.session.commit()
         
-        welcome_msg = get_translation(lang, "welcome_back",
-            "Welcome back to MAMA-AI! 🤱\n\n"
-            "Your maternal health assistant is now active.\n\n"
-            "Dial *123# for the full menu or SMS HELP for commands.\n\n"
-            "We're here to support you through your pregnancy journey!"
-        )
+        welcome_msg = render(lang, "welcome_back")
         
         return welcome_msg
     
@@ -148,19 +133,13 @@ class SMSService:
         ).order_by(Appointment.appointment_date).first()
         
         if next_appointment:
-            date_str = next_appointment.appointment_date.strftime('%Y-%m-%d %H:%M')
-            msg = get_translation(lang, "next_appointment",
-                f"Your next appointment:\n"
-                f"📅 {date_str}\n"
-                f"🏥 {next_appointment.appointment_type}\n"
-                f"📍 {next_appointment.location or 'Location TBD'}\n\n"
-                f"We'll send you a reminder 24 hours before."
+            msg = render(lang, "next_appointment",
+                date=next_appointment.appointment_date.strftime('%Y-%m-%d %H:%M'),
+                type=next_appointment.appointment_type,
+                location=next_appointment.location or render(lang, "location_tbd")
             )
         else:
-            msg = get_translation(lang, "no_appointments",
-                "You have no scheduled appointments. "
-                "Contact your healthcare provider to schedule your next visit."
-            )
+            msg = render(lang, "no_appointments")
         
         return msg
     
@@ -180,15 +159,7 @@ class SMSService:
         """Handle reminder requests"""
         lang = user.preferred_language
         
-        reminder_msg = get_translation(lang, "reminder_info",
-            "Medication Reminders 💊\n\n"
-            "To set up reminders:\n"
-            "1. Dial *123# → Appointments\n"
-            "2. Visit your healthcare provider\n"
-            "3. We'll automatically set reminders\n\n"
-            "For immediate medication questions, "
-            "consult your healthcare provider."
-        )
+        reminder_msg = render(lang, "reminder_info")
         
         return reminder_msg
     
@@ -247,15 +218,10 @@ class SMSService:
                 if user and user.is_active:
                     lang = user.preferred_language
                     
-                    date_str = appointment.appointment_date.strftime('%Y-%m-%d at %H:%M')
-                    reminder_msg = get_translation(lang, "appointment_reminder",
-                        f"📅 APPOINTMENT REMINDER\n\n"
-                        f"You have an appointment tomorrow:\n"
-                        f"🕒 {date_str}\n"
-                        f"🏥 {appointment.appointment_type}\n"
-                        f"📍 {appointment.location or 'Contact clinic for location'}\n\n"
-                        f"Please arrive 15 minutes early. "
-                        f"Bring your pregnancy book and any questions."
+                    reminder_msg = render(lang, "appointment_reminder",
+                        date=appointment.appointment_date.strftime('%Y-%m-%d at %H:%M'),
+                        type=appointment.appointment_type,
+                        location=appointment.location or render(lang, "location_tbd")
                     )
                     
                     response = self.send_sms(user.phone_number, reminder_msg)
@@ -271,6 +237,35 @@ class SMSService:
             print(f"Error sending appointment reminders: {str(e)}")
             return 0
     
+    def send_weekly_updates(self):
+        """Send each active pregnancy this week's content once (safe to run daily)"""
+        try:
+            due = db.session.query(Pregnancy, User).join(User, User.id == Pregnancy.user_id).filter(
+                Pregnancy.is_active == True,
+                User.is_active == True,
+                Pregnancy.weeks_pregnant.between(FIRST_WEEK, LAST_WEEK),
+                db.or_(Pregnancy.weekly_update_week.is_(None),
+                       Pregnancy.weekly_update_week != Pregnancy.weeks_pregnant)
+            ).all()
+            
+            sent_count = 0
+            
+            for pregnancy, user in due:
+                # Everyone in the same week and language gets the same precomputed SMS
+                content = weekly_content(pregnancy.weeks_pregnant, user.preferred_language)
+                response = self.send_sms(user.phone_number, content.sms.text)
+                
+                if response:
+                    pregnancy.weekly_update_week = pregnancy.weeks_pregnant
+                    sent_count += 1
+            
+            db.session.commit()
+            return sent_count
+            
+        except Exception as e:
+            print(f"Error sending weekly updates: {str(e)}")
+            return 0
+    
     def _schedule_next_reminder(self, reminder):
         """Schedule the next occurrence of a recurring reminder"""
         if reminder.frequency == 'daily':
@@ -304,6 +299,7 @@ class SMSService:
             )
             db.session.add(user)
             db.session.commit()
+        remember_language(phone_number, user.preferred_language)
         return user
     
     def _update_pregnancy_symptoms(self, user, symptoms):
@@ -319,27 +315,14 @@ class SMSService:
             pregnancy.updated_at = datetime.utcnow()
             db.session.commit()
     
-    def _clean_phone_number(self, phone_number):
-        """Clean and standardize phone number"""
-        clean = ''.join(c for c in phone_number if c.isdigit() or c == '+')
-        
-        if not clean.startswith('+'):
-            if clean.startswith('0'):
-                clean = '+254' + clean[1:]
-            elif clean.startswith('254'):
-                clean = '+' + clean
-            else:
-                clean = '+254' + clean
-        
-        return clean
-    
-    def _log_message(self, phone_number, msg_type, direction, content):
+    def _log_message(self, phone_number, msg_type, direction, content, segments=None):
         """Log SMS message"""
         log = MessageLog(
             phone_number=phone_number,
             message_type=msg_type,
             direction=direction,
-            content=content
+            content=content,
+            segments=segments
         )
         db.session.add(log)
         db.session.commit()
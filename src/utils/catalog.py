@@ -0,0 +1,149 @@
+import string
+import threading
+from src.utils.lexicon_bundle import get_lexicon
+
+DEFAULT_LANGUAGE = 'en'
+
+_formatter = string.Formatter()
+
+
+class CatalogError(KeyError):
+    """A message key or a template parameter is missing"""
+
+
+class Template:
+    """A message parsed once into literal text and named placeholders.
+
+    Rendering joins the literal pieces with the parameter values; a message
+    without placeholders is returned as is.
+    """
+
+    __slots__ = ('key', 'text', 'pieces', 'slots', 'fields')
+
+    def __init__(self, key, text):
+        self.key = key
+        self.text = text
+        pieces, slots = [], []
+        for literal, field, spec, conversion in _formatter.parse(text):
+            if spec or conversion:
+                raise CatalogError(f"{key}: format specs are not supported in {{{field}}}")
+            if field == '' or (field is not None and not field.isidentifier()):
+                raise CatalogError(f"{key}: placeholders must be named")
+            if literal:
+                pieces.append(literal)
+            if field is not None:
+                slots.append((len(pieces), field))
+                pieces.append(None)
+        self.pieces = tuple(pieces)
+        self.slots = tuple(slots)
+        self.fields = frozenset(field for _, field in slots)
+
+    def render(self, params):
+        if not self.slots:
+            return self.text
+        try:
+            pieces = list(self.pieces)
+            for index, field in self.slots:
+                pieces[index] = str(params[field])
+        except KeyError:
+            missing = self.fields.difference(params)
+            raise CatalogError(f"{self.key}: missing parameters {', '.join(sorted(missing))}") from None
+        return ''.join(pieces)
+
+
+class Catalog:
+    """Per-language tables of pre-parsed message templates.
+
+    Every key must exist in the default language. Another language may
+    leave a key out, in which case the default-language template is used;
+    an unknown language is served entirely in the default language.
+
+    messages maps language codes to {key: text} tables (plain dicts, or the
+    Lexicon's mapped MessageTables). A language gets a table when a user of
+    that language first shows up, and a message is parsed the first time it
+    is rendered, so a worker holds only the messages it has used.
+    check=True compiles and cross-checks every message up front.
+    """
+
+    def __init__(self, messages, default_language=DEFAULT_LANGUAGE, check=True):
+        if default_language not in messages:
+            raise CatalogError(f"no {default_language} translations")
+        self.default_language = default_language
+        self._messages = messages
+        self._tables = {}
+        if check:
+            self._check()
+
+    @property
+    def languages(self):
+        return tuple(self._messages)
+
+    def loaded_languages(self):
+        """Languages that have rendered at least one message"""
+        return tuple(self._tables)
+
+    def _check(self):
+        default = self._messages[self.default_language]
+        for lang, messages in self._messages.items():
+            for key, text in messages.items():
+                if key not in default:
+                    raise CatalogError(f"{lang}: keys missing from {self.default_language}: {key}")
+                template = self.template(lang, key)
+                if template.fields != self.template(self.default_language, key).fields:
+                    raise CatalogError(f"{lang}.{key}: placeholders differ from {self.default_language}")
+
+    def template(self, lang, key):
+        """Return the Template for key, raising CatalogError for an unknown key"""
+        if lang not in self._messages:
+            lang = self.default_language
+        table = self._tables.get(lang)
+        if table is None:
+            table = self._tables.setdefault(lang, {})
+        template = table.get(key)
+        if template is None:
+            text = self._messages[lang].get(key)
+            if text is not None:
+                template = Template(key, text)
+            elif lang != self.default_language:
+                template = self.template(self.default_language, key)
+            else:
+                raise CatalogError(f"unknown message key {key!r}")
+            table[key] = template
+        return template
+
+    def render(self, lang, key, **params):
+        return self.template(lang, key).render(params)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """Return the catalog compiled from the live lexicon"""
+    global _catalog
+    lexicon = get_lexicon()
+    compiled = _catalog
+    # Keyed on the Lexicon object, not its version: every swap gets a fresh catalog
+    if compiled is None or compiled[0] is not lexicon:
+        with _catalog_lock:
+            compiled = _catalog
+            if compiled is None or compiled[0] is not lexicon:
+                # The artifact was checked when it was compiled; messages load on demand
+                compiled = (lexicon, Catalog(lexicon.messages, check=False))
+                _catalog = compiled
+    return compiled[1]
+
+
+def render(lang, key, **params):
+    """Render message key in lang, filling its {placeholders} from params.
+
+    Raises CatalogError for an unknown key or a missing parameter.
+    """
+    return get_catalog().template(lang, key).render(params)
+
+
+def reset_catalog():
+    """Recompile the catalog on next use"""
+    global _catalog
+    _catalog = None
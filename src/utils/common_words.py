@@ -0,0 +1,36 @@
+# Everyday words one typo away from a triage term, so typo-tolerant triage
+# never "corrects" a real word into a symptom ("selling" into "swelling",
+# "camping" into "cramping"). Inflections of a term ("headaches",
+# "waters broke") are left out on purpose: those should still match.
+from src.utils.stopwords import STOPWORDS
+
+ENGLISH_COMMON_WORDS = frozenset((
+    # bleeding
+    "breeding", "bleeping", "blending",
+    # spotting
+    "spitting", "sporting", "spouting", "slotting", "potting",
+    # cramping
+    "camping", "clamping", "cramming", "crimping", "tramping", "ramping",
+    # swelling
+    "selling", "smelling", "spelling", "dwelling", "shelling", "swilling", "welling",
+    # contractions, acidity
+    "contraptions", "avidity", "aridity", "acidify",
+    # back pain, sharp pain, severe pain
+    "paint", "paid", "gain", "main", "rain", "vain", "pan", "pin", "black",
+    # water broke, head pounding, vomiting blood, chest burn, can't see
+    "brake", "waiter", "sounding", "founding", "bounding", "rounding", "hounding",
+    "flood", "turn", "born", "sew", "mourning",
+))
+
+SWAHILI_COMMON_WORDS = frozenset((
+    # miwani
+    "mwani",
+))
+
+COMMON_WORDS = {
+    'en': ENGLISH_COMMON_WORDS,
+    'sw': SWAHILI_COMMON_WORDS,
+}
+
+# Real words in either language: never corrected by typo-tolerant matching
+KNOWN_WORDS = frozenset().union(*STOPWORDS.values(), *COMMON_WORDS.values())
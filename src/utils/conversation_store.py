@@ -0,0 +1,69 @@
+import os
+import threading
+from collections import deque, namedtuple
+from datetime import datetime
+from src.utils.ttl_cache import TTLCache
+
+# role is 'user' or 'assistant'
+Turn = namedtuple('Turn', ['role', 'content', 'at'])
+
+CONVERSATION_TURNS = int(os.getenv('CONVERSATION_TURNS', '10'))
+CONVERSATION_USERS = int(os.getenv('CONVERSATION_USERS', '10000'))
+CONVERSATION_IDLE_TTL = float(os.getenv('CONVERSATION_IDLE_TTL', '86400'))
+
+
+class ConversationStore:
+    """Recent chat turns per user, kept in fixed-size ring buffers.
+
+    Each user holds at most max_turns turns; the least recently active
+    users are evicted beyond max_users, and idle conversations expire after
+    ttl seconds. A user with no buffer in this process (after a restart,
+    an eviction, or when another worker served them) is loaded once with
+    loader(key, max_turns), e.g. from message_logs.
+    """
+
+    def __init__(self, loader, max_turns=CONVERSATION_TURNS, max_users=CONVERSATION_USERS,
+                 ttl=CONVERSATION_IDLE_TTL):
+        self.max_turns = max_turns
+        self.loader = loader
+        self._buffers = TTLCache(maxsize=max_users, ttl=ttl)
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def append(self, key, role, content, at=None):
+        """Add a turn to a buffered user, dropping the oldest once full.
+
+        Users without a buffer are left alone: the turn is already logged,
+        so their next history() load picks it up.
+        """
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            return
+        buffer.append(Turn(role, content, at or datetime.utcnow()))
+        # Re-setting marks the user active and restarts the idle timer
+        self._buffers.set(key, buffer)
+
+    def history(self, key):
+        """Return the buffered turns, oldest first"""
+        buffer = self._buffers.get(key)
+        if buffer is not None:
+            return list(buffer)
+
+        # Load outside the lock so one slow query does not stall every user
+        turns = self.loader(key, self.max_turns)
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = deque(turns, maxlen=self.max_turns)
+                self._buffers.set(key, buffer)
+                self.loads += 1
+        return list(buffer)
+
+    def clear(self):
+        self._buffers.clear()
+
+    def stats(self):
+        stats = self._buffers.stats()
+        stats['max_turns'] = self.max_turns
+        stats['loads'] = self.loads
+        return stats
@@ -0,0 +1,53 @@
+import threading
+from src.utils.keyword_matcher import KeywordMatcher
+from src.utils.lexicon_bundle import get_lexicon
+
+# Emergency-tier phrases precise enough to act on before any other handling:
+# several words each, and each a red-flag sign on its own. Single words such
+# as "hot", "fever" or "miwani" (glasses) are left to symptom triage.
+INGRESS_PHRASES = frozenset((
+    'severe bleeding', 'heavy bleeding', 'bleeding heavily', 'damu nyingi',
+    'vomiting blood', 'kutapika damu', 'blood in vomit',
+    "can't breathe", 'difficulty breathing', 'sijui kupumua',
+    'water broke', 'waters breaking', 'maji yamevunjika',
+    'unbearable pain',
+))
+
+# (lexicon, matcher); rebuilt whenever a new lexicon is swapped in
+_emergency_matcher = None
+_emergency_matcher_lock = threading.Lock()
+
+
+def get_emergency_matcher():
+    """Return the whole-word automaton over the ingress phrases in the emergency tier.
+
+    Phrases dropped from the lexicon's emergency tier drop out here too.
+    The broader emergency_keywords lists are not used: they hold words
+    like "help" and "msaada" that are also SMS commands.
+    """
+    global _emergency_matcher
+    lexicon = get_lexicon()
+    compiled = _emergency_matcher
+    if compiled is None or compiled[0] is not lexicon:
+        with _emergency_matcher_lock:
+            compiled = _emergency_matcher
+            if compiled is None or compiled[0] is not lexicon:
+                phrases = [phrase for phrase in lexicon.triage['emergency'] if phrase in INGRESS_PHRASES]
+                matcher = KeywordMatcher({'emergency': phrases}, whole_words=True)
+                compiled = (lexicon, matcher)
+                _emergency_matcher = compiled
+    return compiled[1]
+
+
+def find_emergency(text):
+    """Return the first emergency keyword in raw text, or None"""
+    if not text:
+        return None
+    matches = get_emergency_matcher().find_all(' '.join(text.split()))
+    return min(matches, key=lambda match: match.start).keyword if matches else None
+
+
+def reset_emergency_matcher():
+    """Recompile the matcher on next use"""
+    global _emergency_matcher
+    _emergency_matcher = None
@@ -0,0 +1,186 @@
+import logging
+import re
+from src.utils.keyword_matcher import KeywordMatch
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[\w']+")
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance, or limit + 1 once it is exceeded"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+
+    return previous[-1]
+
+
+def _deletes(word, depth):
+    """All strings reachable from word by deleting up to depth characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {item[:i] + item[i + 1:] for item in frontier for i in range(len(item))}
+        results |= frontier
+    return results
+
+
+class DeletionIndex:
+    """SymSpell-style typo-tolerant lookup over a labelled lexicon.
+
+    Every term is indexed under all of its deletions up to its allowed edit
+    distance, so a lookup only generates deletions of the query and checks
+    a handful of candidates instead of comparing against the whole lexicon.
+    Short terms are matched exactly only: one edit turns 'homa' into
+    'home' and 'fever' into 'never'. Only tokens that are not known_words
+    are corrected: "selling" is a real word, not a typo of "swelling", so
+    a match whose term does not contain every known word of the query is
+    dropped.
+
+    A message gets at most max_queries lookups. Terms with a priority
+    label are looked up first, so a long message that runs out of budget
+    loses the other labels, not those; truncated counts such messages.
+    """
+
+    def __init__(self, lexicon, max_distance=1, min_length=6, min_length_2=10,
+                 max_queries=64, priority=(), known_words=()):
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.min_length_2 = min_length_2
+        self.max_queries = max_queries
+        self.priority = frozenset(priority)
+        self.known_words = frozenset(known_words)
+        self.truncated = 0
+
+        self._terms = {}
+        self.max_words = 1
+        self.max_term_length = 0
+
+        for label, terms in lexicon.items():
+            for term in terms:
+                term = ' '.join(term.lower().split())
+                if not term:
+                    continue
+                self._terms.setdefault(term, [])
+                if label not in self._terms[term]:
+                    self._terms[term].append(label)
+
+        # One deletion index per pass: priority terms, then the rest
+        self._passes = [{}, {}] if self.priority else [{}]
+        for term, labels in self._terms.items():
+            self.max_words = max(self.max_words, term.count(' ') + 1)
+            self.max_term_length = max(self.max_term_length, len(term))
+            index = self._passes[0] if self.priority.intersection(labels) else self._passes[-1]
+            for deleted in _deletes(term, self.allowed_distance(len(term))):
+                index.setdefault(deleted, []).append(term)
+
+    def allowed_distance(self, length):
+        """Edit distance tolerated for a term of this length"""
+        if length >= self.min_length_2:
+            return min(2, self.max_distance)
+        if length >= self.min_length:
+            return min(1, self.max_distance)
+        return 0
+
+    def lookup_term(self, query):
+        """Return (term, distance) pairs within the allowed distance of query"""
+        found = {}
+        known = self._known(query.split())
+        if known is None:
+            return []
+        deletes = self._query_deletes(query)
+        for index in self._passes:
+            found.update(self._lookup(query, deletes, index, known))
+        return sorted(found.items(), key=lambda item: item[1])
+
+    def _known(self, tokens):
+        """The known words among tokens, or None when every token is one"""
+        known = self.known_words.intersection(tokens)
+        return None if len(known) == len(set(tokens)) else known
+
+    def _query_deletes(self, query):
+        depth = self.allowed_distance(len(query) + self.max_distance)
+        return _deletes(query, depth) if depth else ()
+
+    def _lookup(self, query, deletes, index, known=frozenset()):
+        found = {}
+        for deleted in deletes:
+            for term in index.get(deleted, ()):
+                if term == query or term in found:
+                    continue
+                if known and not known.issubset(term.split()):
+                    continue
+                limit = self.allowed_distance(len(term))
+                distance = edit_distance(query, term, limit)
+                if 0 < distance <= limit:
+                    found[term] = distance
+        return found
+
+    def _spans(self, text):
+        """(query, start, end, known) for every word run long enough to hold a typo'd term.
+
+        Runs made only of known words are skipped; known holds the known
+        words of the others.
+        """
+        tokens = [(m.group(), m.start(), m.end()) for m in _TOKEN_RE.finditer(text.lower())]
+        for i in range(len(tokens)):
+            for width in range(1, self.max_words + 1):
+                if i + width > len(tokens):
+                    break
+                span = tokens[i:i + width]
+                query = ' '.join(token for token, _, _ in span)
+                if len(query) > self.max_term_length + self.max_distance:
+                    break
+                if len(query) < self.min_length - self.max_distance:
+                    continue
+                known = self._known([token for token, _, _ in span])
+                if known is not None:
+                    yield query, span[0][1], span[-1][2], known
+
+    def find_all(self, text):
+        """Return typo matches in text as KeywordMatch tuples with a distance"""
+        if not text:
+            return []
+
+        spans = list(self._spans(text))
+        deletes = {}
+        matches = []
+        queries = 0
+
+        for index in self._passes:
+            for query, start, end, known in spans:
+                if queries >= self.max_queries:
+                    self.truncated += 1
+                    logger.debug(f"Fuzzy triage stopped after {queries} lookups in a "
+                                 f"{len(text)}-character message")
+                    return matches
+                queries += 1
+                if query not in deletes:
+                    deletes[query] = self._query_deletes(query)
+                found = self._lookup(query, deletes[query], index, known)
+                for term, distance in sorted(found.items(), key=lambda item: item[1]):
+                    for label in self._terms[term]:
+                        matches.append(KeywordMatch(term, label, start, end, distance))
+
+        return matches
+
+    def stats(self):
+        """Return the number of messages cut short by max_queries"""
+        return {'truncated': self.truncated, 'max_queries': self.max_queries}
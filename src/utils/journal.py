@@ -0,0 +1,285 @@
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development machines
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_MAX_ATTEMPTS = int(os.getenv('JOURNAL_MAX_ATTEMPTS', '5'))
+JOURNAL_MAX_BACKOFF = float(os.getenv('JOURNAL_MAX_BACKOFF', '30'))
+
+
+def _lock(handle, blocking=True):
+    """Take an exclusive advisory lock shared by every process using the file"""
+    if fcntl is None:
+        return True
+    flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+    try:
+        fcntl.flock(handle.fileno(), flags)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _fsync_dir(path):
+    """Persist a directory entry so a newly created or renamed file survives a crash"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class WriteBehindJournal:
+    """Append-only JSON-lines journal drained into a slower store.
+
+    append() returns once the record is fsync'd to local disk. flush() hands
+    every record past the checkpoint to sink(records), then advances the
+    checkpoint. A crash between the sink and the checkpoint replays those
+    records, so the sink must be idempotent on 'journal_id'. The journal is
+    truncated whenever it has been fully drained.
+
+    When a batch fails, each record is retried alone. A record that still
+    fails while others succeed, or that has failed max_attempts times, is
+    moved to the dead-letter file (path + '.dead') with corrupt lines, so
+    one bad record cannot hold up the rest. If every record fails the
+    store is taken to be down and the batch is retried later. recover() is
+    called after each sink failure, e.g. to roll back a session.
+    """
+
+    def __init__(self, path, sink, recover=None, max_attempts=None):
+        self.path = path
+        self.checkpoint_path = path + '.checkpoint'
+        self.flush_lock_path = path + '.lock'
+        self.dead_letter_path = path + '.dead'
+        self.sink = sink
+        self.recover = recover
+        self.max_attempts = max_attempts or JOURNAL_MAX_ATTEMPTS
+        self.dead_lettered = 0
+        self.skipped_lines = 0
+        self._attempts = {}
+
+        self._lock = threading.Lock()
+        self._flushing = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, record):
+        """Durably append one record and return its journal_id"""
+        record = dict(record)
+        record.setdefault('journal_id', uuid.uuid4().hex)
+        line = (json.dumps(record, default=str, separators=(',', ':')) + '\n').encode('utf-8')
+
+        with self._lock:
+            created = not os.path.exists(self.path)
+            with open(self.path, 'a+b') as handle:
+                _lock(handle)
+                # A torn write from a crash must not swallow the next record
+                if handle.seek(0, os.SEEK_END) > 0:
+                    handle.seek(-1, os.SEEK_END)
+                    if handle.read(1) != b'\n':
+                        line = b'\n' + line
+                handle.write(line)
+                handle.flush()
+                os.fsync(handle.fileno())
+            if created:
+                _fsync_dir(self.path)
+
+        return record['journal_id']
+
+    def pending(self):
+        """Return (records, end_offset) for everything past the checkpoint"""
+        records, corrupt, end = self._read()
+        if corrupt:
+            logger.error(f"Skipping {len(corrupt)} corrupt journal lines in {self.path}")
+        return records, end
+
+    def _read(self):
+        offset = self._read_checkpoint()
+        with self._lock:
+            if not os.path.exists(self.path):
+                return [], [], 0
+            with open(self.path, 'rb') as handle:
+                _lock(handle)
+                size = handle.seek(0, os.SEEK_END)
+                if offset > size:
+                    offset = 0
+                handle.seek(offset)
+                data = handle.read()
+
+        # Only whole lines; a trailing partial line is still being written or torn
+        complete = data[:data.rfind(b'\n') + 1]
+        records = []
+        corrupt = []
+        for raw in complete.splitlines():
+            if not raw.strip():
+                continue
+            try:
+                records.append(json.loads(raw))
+            except ValueError:
+                corrupt.append(raw)
+        return records, corrupt, offset + len(complete)
+
+    def flush(self):
+        """Drain pending records into the sink; returns how many were handed over"""
+        with self._flushing, open(self.flush_lock_path, 'a+b') as flush_lock:
+            # Another process is already draining the same journal
+            if not _lock(flush_lock, blocking=False):
+                return 0
+
+            records, corrupt, end = self._read()
+            if corrupt:
+                self.skipped_lines += len(corrupt)
+                logger.error(f"Skipping {len(corrupt)} corrupt journal lines in {self.path} "
+                             f"({self.skipped_lines} so far)")
+                self._dead_letter([{'corrupt_line': raw.decode('utf-8', 'replace')} for raw in corrupt])
+            if records:
+                self._drain(records)
+
+            with self._lock:
+                if not os.path.exists(self.path):
+                    return len(records)
+                with open(self.path, 'r+b') as handle:
+                    _lock(handle)
+                    if handle.seek(0, os.SEEK_END) == end:
+                        # Reset the checkpoint before truncating: a crash in
+                        # between replays records instead of skipping new ones
+                        self._write_checkpoint(0)
+                        handle.truncate(0)
+                        os.fsync(handle.fileno())
+                    else:
+                        self._write_checkpoint(end)
+
+            return len(records)
+
+    def _drain(self, records):
+        """Sink the batch, falling back to one record at a time"""
+        try:
+            self.sink(records)
+            failed = []
+        except Exception as e:
+            self._recovered()
+            if len(records) == 1:
+                failed = [(records[0], e)]
+            else:
+                logger.exception(f"Journal batch of {len(records)} failed for {self.path}; retrying one at a time")
+                failed = self._sink_each(records)
+
+        if failed and len(failed) == len(records):
+            # Nothing went through: most likely the store is down, so retry
+            # later unless every record has already used up its attempts
+            attempts = [self._attempts.get(record.get('journal_id'), 0) + 1 for record, _ in failed]
+            for (record, _), count in zip(failed, attempts):
+                self._attempts[record.get('journal_id')] = count
+            if min(attempts) < self.max_attempts:
+                raise failed[0][1]
+
+        self._attempts.clear()
+        for record, e in failed:
+            logger.error(f"Dead-lettering journal record {record.get('journal_id')} from {self.path}: {str(e)}")
+        self._dead_letter([dict(record, dead_letter_error=str(e)) for record, e in failed])
+
+    def _sink_each(self, records):
+        failed = []
+        for record in records:
+            try:
+                self.sink([record])
+            except Exception as e:
+                self._recovered()
+                failed.append((record, e))
+        return failed
+
+    def _recovered(self):
+        if self.recover is not None:
+            try:
+                self.recover()
+            except Exception:
+                logger.exception(f"Journal recovery failed for {self.path}")
+
+    def _dead_letter(self, entries):
+        if not entries:
+            return
+        failed_at = datetime.utcnow().isoformat()
+        lines = b''.join(
+            (json.dumps(dict(entry, dead_lettered_at=failed_at), default=str, separators=(',', ':')) + '\n').encode('utf-8')
+            for entry in entries
+        )
+        with open(self.dead_letter_path, 'ab') as handle:
+            handle.write(lines)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.dead_lettered += len(entries)
+
+    def stats(self):
+        """Return dead-letter and corrupt-line counters"""
+        return {'dead_lettered': self.dead_lettered, 'skipped_lines': self.skipped_lines}
+
+    def start(self, interval=1.0, context=None):
+        """Flush every interval seconds on a daemon thread; context() wraps each flush"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval, context), name='journal-flusher', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop the flusher thread after one last flush"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self, interval, context):
+        # The first flush replays whatever an earlier process left behind;
+        # while the store is unreachable, back off up to JOURNAL_MAX_BACKOFF
+        delay = 0
+        replaying = True
+        while True:
+            stopping = self._stop.wait(delay)
+            try:
+                if context is None:
+                    flushed = self.flush()
+                else:
+                    with context():
+                        flushed = self.flush()
+                if replaying and flushed:
+                    logger.info(f"Replayed {flushed} journalled records from {self.path}")
+                replaying = False
+                delay = interval
+            except Exception:
+                # Records stay in the journal and are retried on the next tick
+                logger.exception(f"Journal flush failed for {self.path}")
+                delay = min(max(delay * 2, interval), max(JOURNAL_MAX_BACKOFF, interval))
+            if stopping:
+                return
+
+    def _read_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as handle:
+                return int(handle.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_checkpoint(self, offset):
+        temp_path = self.checkpoint_path + '.tmp'
+        with open(temp_path, 'w') as handle:
+            handle.write(str(offset))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.checkpoint_path)
+        _fsync_dir(self.checkpoint_path)
@@ -0,0 +1,106 @@
+from collections import deque, namedtuple
+
+# A single keyword hit; start/end index into the lower-cased input text and
+# distance is the number of edits for typo-tolerant hits (0 for exact ones)
+KeywordMatch = namedtuple('KeywordMatch', ['keyword', 'label', 'start', 'end', 'distance'],
+                          defaults=(0,))
+
+
+def _is_word_char(char):
+    """Return True if the character can be part of a word"""
+    return char.isalnum() or char in "_'"
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a labelled keyword lexicon.
+
+    The automaton is compiled once from ``{label: [keywords]}`` and then
+    reports every keyword occurrence in a single left-to-right pass, so the
+    cost of a lookup depends on the length of the text and not on the size
+    of the lexicon.
+    """
+
+    def __init__(self, lexicon, whole_words=False):
+        self.whole_words = whole_words
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self.size = 0
+
+        for label, keywords in lexicon.items():
+            for keyword in keywords:
+                self._add(keyword.lower(), label)
+
+        self._build_failure_links()
+
+    def _add(self, keyword, label):
+        """Insert a keyword into the trie"""
+        if not keyword:
+            return
+
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+
+        if (keyword, label) not in self._out[state]:
+            self._out[state] += ((keyword, label),)
+            self.size += 1
+
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links and merged outputs"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def find_all(self, text):
+        """Return every keyword occurrence in text as KeywordMatch tuples"""
+        if not text:
+            return []
+
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        state = 0
+
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            if out[state]:
+                end = index + 1
+                for keyword, label in out[state]:
+                    start = end - len(keyword)
+                    if self.whole_words and not self._on_boundary(text, start, end):
+                        continue
+                    matches.append(KeywordMatch(keyword, label, start, end))
+
+        return matches
+
+    def labels(self, text):
+        """Return the set of labels that have at least one hit in text"""
+        return {match.label for match in self.find_all(text)}
+
+    def _on_boundary(self, text, start, end):
+        """Check that a hit is not part of a longer word"""
+        if start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
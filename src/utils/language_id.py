@@ -0,0 +1,227 @@
+import json
+import logging
+import os
+import re
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+LANGID_MODEL_PATH = os.getenv('LANGID_MODEL_PATH', os.path.join('instance', 'langid.npz'))
+LANGID_SEED_PATH = os.path.join(_DATA_DIR, 'langid_seed.json')
+
+NGRAM_SIZES = (1, 2, 3, 4)
+SMOOTHING = 0.5
+LANGID_WORD_CACHE = int(os.getenv('LANGID_WORD_CACHE', '50000'))
+DEFAULT_LANGUAGE = 'en'
+
+_NON_LETTERS_RE = re.compile(r"[^a-z' ]+")
+
+
+def normalize_words(text):
+    """Lower-cased words with digits and punctuation removed"""
+    return _NON_LETTERS_RE.sub(' ', (text or '').lower()).split()
+
+
+def word_features(word):
+    """The word itself plus the character n-grams of the space-padded word"""
+    features = ['w:' + word]
+    padded = f' {word} '
+    for size in NGRAM_SIZES:
+        features.extend(padded[i:i + size] for i in range(len(padded) - size + 1))
+    return features
+
+
+def text_features(text):
+    """Features of every word in text"""
+    return [feature for word in normalize_words(text) for feature in word_features(word)]
+
+
+class NgramLanguageModel:
+    """Multinomial naive Bayes over character n-grams.
+
+    The model is a feature vocabulary plus a (features x languages) matrix of
+    log probabilities. Scoring a text is the dot product of its feature
+    counts with that matrix, done as a sum of the matching rows.
+    """
+
+    def __init__(self, languages, vocabulary, log_probs, log_priors):
+        self.languages = tuple(languages)
+        self.vocabulary = vocabulary
+        self.log_probs = log_probs
+        self.log_priors = log_priors
+        self._word_cache = {}
+
+    @classmethod
+    def train(cls, texts, labels, smoothing=SMOOTHING):
+        """Fit the model from parallel lists of texts and language codes"""
+        languages = sorted(set(labels))
+        column = {lang: index for index, lang in enumerate(languages)}
+        vocabulary = {}
+        rows, columns = [], []
+        docs = np.zeros(len(languages))
+
+        for text, label in zip(texts, labels):
+            docs[column[label]] += 1
+            for feature in text_features(text):
+                rows.append(vocabulary.setdefault(feature, len(vocabulary)))
+                columns.append(column[label])
+
+        counts = np.zeros((len(vocabulary), len(languages)))
+        np.add.at(counts, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), 1)
+        counts += smoothing
+        log_probs = np.log(counts / counts.sum(axis=0)).astype(np.float32)
+        log_priors = np.log(docs / docs.sum()).astype(np.float32)
+        return cls(languages, vocabulary, log_probs, log_priors)
+
+    @classmethod
+    def load(cls, path):
+        """Load a model written by save()"""
+        with np.load(path) as arrays:
+            features = arrays['features'].tolist()
+            return cls(
+                arrays['languages'].tolist(),
+                {feature: index for index, feature in enumerate(features)},
+                arrays['log_probs'],
+                arrays['log_priors'],
+            )
+
+    def save(self, path):
+        """Write the model as NumPy arrays (np.savez)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        features = sorted(self.vocabulary, key=self.vocabulary.get)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, languages=np.array(self.languages), features=np.array(features),
+                 log_probs=self.log_probs, log_priors=self.log_priors)
+        os.replace(tmp_path, path)
+
+    def word_scores(self, word):
+        """Per-language log likelihood of one word's features, or None if none is known.
+
+        This is the word's slice of the count-vector dot product; words repeat
+        across messages, so the result is cached.
+        """
+        scores = self._word_cache.get(word, _MISSING)
+        if scores is _MISSING:
+            vocabulary = self.vocabulary
+            rows = [vocabulary[feature] for feature in word_features(word) if feature in vocabulary]
+            scores = self.log_probs[rows].sum(axis=0) if rows else None
+            if len(self._word_cache) >= LANGID_WORD_CACHE:
+                self._word_cache.clear()
+            self._word_cache[word] = scores
+        return scores
+
+    def scores(self, text):
+        """Log posterior score per language, or None when no feature is known"""
+        total = None
+        for word in normalize_words(text):
+            scores = self.word_scores(word)
+            if scores is not None:
+                total = scores + self.log_priors if total is None else total + scores
+        return total
+
+    def predict(self, text, default=DEFAULT_LANGUAGE):
+        """Return (language, probability) for one text"""
+        scores = self.scores(text)
+        if scores is None:
+            return default, 0.5
+        best = int(scores.argmax())
+        probabilities = np.exp(scores - scores[best])
+        return self.languages[best], float(1.0 / probabilities.sum())
+
+    def posteriors(self, text):
+        """Probability per language, or None when no feature is known"""
+        scores = self.scores(text)
+        if scores is None:
+            return None
+        probabilities = np.exp(scores - scores.max())
+        probabilities /= probabilities.sum()
+        return dict(zip(self.languages, probabilities.tolist()))
+
+    def predict_batch(self, texts, default=DEFAULT_LANGUAGE):
+        """Return (language, probability) per text, scoring all texts in one pass.
+
+        Builds a sparse (texts x distinct words) count matrix and multiplies it
+        with the distinct words' score vectors.
+        """
+        columns, owners, word_vectors = {}, [], []
+        column_ids = []
+        for index, text in enumerate(texts):
+            for word in normalize_words(text):
+                column = columns.get(word)
+                if column is None:
+                    scores = self.word_scores(word)
+                    column = -1 if scores is None else len(word_vectors)
+                    if scores is not None:
+                        word_vectors.append(scores)
+                    columns[word] = column
+                if column >= 0:
+                    owners.append(index)
+                    column_ids.append(column)
+
+        scores = np.tile(self.log_priors, (len(texts), 1))
+        known = np.zeros(len(texts), dtype=bool)
+        if owners:
+            owners = np.array(owners, dtype=np.intp)
+            contributions = np.stack(word_vectors)[np.array(column_ids, dtype=np.intp)]
+            for language in range(len(self.languages)):
+                scores[:, language] += np.bincount(owners, weights=contributions[:, language],
+                                                   minlength=len(texts))
+            known[owners] = True
+
+        best = scores.argmax(axis=1)
+        probabilities = 1.0 / np.exp(scores - scores.max(axis=1, keepdims=True)).sum(axis=1)
+        return [
+            (self.languages[best[index]], float(probabilities[index])) if known[index] else (default, 0.5)
+            for index in range(len(texts))
+        ]
+
+
+def seed_corpus(path=None):
+    """(text, language) pairs from the bundled seed phrases"""
+    with open(path or LANGID_SEED_PATH, encoding='utf-8') as seed:
+        phrases = json.load(seed)
+    return [(text, lang) for lang, texts in phrases.items() for text in texts]
+
+
+def bundled_corpus():
+    """Seed phrases plus every English and Kiswahili text shipped with the app"""
+    from src.utils.lexicon_bundle import load_source
+    from src.utils.response_registry import RESPONSES
+    from src.utils.weekly_content import WEEKLY_CONTENT
+
+    corpus = seed_corpus()
+    for lang, table in load_source()['translations'].items():
+        corpus.extend((text, lang) for text in table.values())
+    corpus.extend((entry.text, lang) for (_, lang), entry in RESPONSES.items())
+    corpus.extend((content.text.text, content.lang) for content in WEEKLY_CONTENT.values())
+    return corpus
+
+
+_language_model = None
+_language_model_lock = threading.Lock()
+
+
+def get_language_model():
+    """Return the process-wide model, loading LANGID_MODEL_PATH or training from bundled text"""
+    global _language_model
+    if _language_model is None:
+        with _language_model_lock:
+            if _language_model is None:
+                if os.path.exists(LANGID_MODEL_PATH):
+                    _language_model = NgramLanguageModel.load(LANGID_MODEL_PATH)
+                else:
+                    logger.warning(f"⚠️  No language model at {LANGID_MODEL_PATH}; training from bundled text")
+                    texts, labels = zip(*bundled_corpus())
+                    _language_model = NgramLanguageModel.train(texts, labels)
+    return _language_model
+
+
+def set_language_model(model):
+    """Replace the process-wide model (None reloads it on next use)"""
+    global _language_model
+    _language_model = model
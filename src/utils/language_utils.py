@@ -1,226 +1,115 @@
+import logging
+import os
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+from src.utils.lexicon_bundle import get_lexicon
+from src.utils.catalog import CatalogError, get_catalog
+from src.utils.emergency_screen import find_emergency
+from src.utils.phone import is_valid_phone, normalize_phone
+from src.utils.phrase_translator import get_translator
+from src.utils.stopwords import STOPWORDS, ENGLISH_STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+# NLTK is optional: only imported when enabled, and its data is never downloaded at runtime
+USE_NLTK = os.getenv('USE_NLTK', '0') == '1'
+
+_TOKEN_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+_nltk_tokenizer = None
 
 class LanguageDetector:
-    def __init__(self):
-        self.swahili_keywords = [
-            'habari', 'mambo', 'salam', 'shikamoo', 'hujambo',
-            'maumivu', 'damu', 'mtoto', 'mama', 'daktari',
-            'hospitali', 'ugonjwa', 'afya', 'maji', 'chakula',
-            'ujauzito', 'mimba', 'kujifungua', 'kitanda',
-            'dawa', 'vidole', 'miguu', 'kichwa', 'tumbo'
-        ]
-        
-        self.english_keywords = [
-            'hello', 'hi', 'good', 'morning', 'afternoon',
-            'pain', 'blood', 'baby', 'mother', 'doctor',
-            'hospital', 'sick', 'health', 'water', 'food',
-            'pregnancy', 'pregnant', 'delivery', 'birth',
-            'medicine', 'fingers', 'legs', 'head', 'stomach'
-        ]
+    """English/Kiswahili identification backed by the character n-gram model"""
+
+    def __init__(self, model=None):
+        self._model = model
+
+    @property
+    def model(self):
+        # Imported on first use: the model pulls in NumPy, which worker boot does not need
+        from src.utils.language_id import get_language_model
+        return self._model or get_language_model()
     
     def detect_language(self, text):
         """Detect language of input text"""
         if not text:
             return 'en'
-        
-        text_lower = text.lower()
-        words = re.findall(r'\b\w+\b', text_lower)
-        
-        swahili_count = sum(1 for word in words if word in self.swahili_keywords)
-        english_count = sum(1 for word in words if word in self.english_keywords)
-        
-        if swahili_count > english_count:
-            return 'sw'
-        else:
-            return 'en'
+        return self.model.predict(text)[0]
+    
+    def detect_batch(self, texts):
+        """Detect the language of many texts in one vectorized pass"""
+        return [lang for lang, _ in self.model.predict_batch(texts)]
     
     def get_confidence(self, text, detected_lang):
         """Get confidence score for language detection"""
         if not text:
             return 0.5
         
-        words = re.findall(r'\b\w+\b', text.lower())
-        if not words:
+        posteriors = self.model.posteriors(text)
+        if posteriors is None or detected_lang not in posteriors:
             return 0.5
         
-        if detected_lang == 'sw':
-            matches = sum(1 for word in words if word in self.swahili_keywords)
-        else:
-            matches = sum(1 for word in words if word in self.english_keywords)
-        
-        return min(matches / len(words), 1.0)
+        return posteriors[detected_lang]
 
 def get_translation(language, key, default_text):
-    """Get translation for a given key and language"""
-    translations = {
-        'en': {
-            'main_menu': "Welcome to MAMA-AI 🤱\n1. Pregnancy Tracking\n2. Health Check\n3. Appointments\n4. Emergency\n5. Settings\n6. Get Help",
-            'pregnancy_menu': "Pregnancy Tracking\n1. Update symptoms\n2. Track baby's movement\n3. Nutrition tips\n4. Weekly info\n0. Back",
-            'health_menu': "Health Check 🏥\n1. Report symptoms\n2. Ask health question\n3. Emergency symptoms\n4. Medication reminder\n0. Back",
-            'appointments_menu': "Appointments 📅\n1. View next appointment\n2. Schedule appointment\n3. Appointment history\n0. Back",
-            'settings_menu': "Settings ⚙️\n1. Change language\n2. Update profile\n3. Emergency contacts\n0. Back",
-            'help_text': "MAMA-AI Help 📖\nThis service provides:\n• Pregnancy tracking\n• Health advice\n• Emergency support\n• Appointment reminders\n\nFor emergencies, dial 911\nSMS 'HELP' for more info",
-            'invalid_choice': "Invalid choice. Please try again.",
-            'enter_symptoms': "Please describe your current symptoms:",
-            'baby_movement': "How many times did you feel baby move in the last hour?\n1. Less than 3\n2. 3-5 times\n3. More than 5",
-            'report_symptoms': "Describe your symptoms in detail:",
-            'ask_question': "What health question do you have?",
-            'choose_language': "Choose language:\n1. English\n2. Kiswahili",
-            'update_profile': "Enter your name:",
-            'language_changed': "Language updated successfully!",
-            'name_updated': "Name updated successfully!",
-            'invalid_option': "Invalid option selected.",
-            'emergency_response': "🚨 EMERGENCY DETECTED 🚨\n\nIf life-threatening:\nCALL 911 IMMEDIATELY\n\nCommon pregnancy emergencies:\n• Severe bleeding\n• Severe abdominal pain\n• Vision problems\n• Severe headaches\n\nWe're sending your emergency contact a message.\n\nStay calm and seek immediate medical help.",
-            'no_pregnancy': "No active pregnancy found.\n1. Register new pregnancy\n0. Back to main menu",
-            'sms_help': "MAMA-AI Help 📱\n\nSMS Commands:\n• HELP - This help message\n• SYMPTOMS - Report symptoms\n• APPOINTMENT - Check appointments\n• REMINDER - Set medication reminder\n• EMERGENCY - Get emergency help\n• STOP - Unsubscribe\n\nUSSD: Dial *123# for full menu\n\nEmergency: Call 911",
-            'unsubscribed': "You have been unsubscribed from MAMA-AI messages. SMS START to reactivate. For emergencies, always call 911.",
-            'welcome_back': "Welcome back to MAMA-AI! 🤱\n\nYour maternal health assistant is now active.\n\nDial *123# for the full menu or SMS HELP for commands.\n\nWe're here to support you through your pregnancy journey!",
-            'next_appointment': "Your next appointment:\n📅 {date}\n🏥 {type}\n📍 {location}\n\nWe'll send you a reminder 24 hours before.",
-            'no_appointments': "You have no scheduled appointments. Contact your healthcare provider to schedule your next visit.",
-            'reminder_info': "Medication Reminders 💊\n\nTo set up reminders:\n1. Dial *123# → Appointments\n2. Visit your healthcare provider\n3. We'll automatically set reminders\n\nFor immediate medication questions, consult your healthcare provider.",
-            'appointment_reminder': "📅 APPOINTMENT REMINDER\n\nYou have an appointment tomorrow:\n🕒 {date}\n🏥 {type}\n📍 {location}\n\nPlease arrive 15 minutes early. Bring your pregnancy book and any questions."
-        },
-        'sw': {
-            'main_menu': "Karibu MAMA-AI 🤱\n1. Kufuatilia Ujauzito\n2. Uchunguzi wa Afya\n3. Miadi\n4. Dharura\n5. Mipangilio\n6. Kupata Msaada",
-            'pregnancy_menu': "Kufuatilia Ujauzito\n1. Sasisha dalili\n2. Fuatilia mzunguko wa mtoto\n3. Mapendekezo ya lishe\n4. Habari za wiki\n0. Rudi",
-            'health_menu': "Uchunguzi wa Afya 🏥\n1. Ripoti dalili\n2. Uliza swali la afya\n3. Dalili za dharura\n4. Ukumbusho wa dawa\n0. Rudi",
-            'appointments_menu': "Miadi 📅\n1. Ona miadi ijayo\n2. Panga miadi\n3. Historia ya miadi\n0. Rudi",
-            'settings_menu': "Mipangilio ⚙️\n1. Badilisha lugha\n2. Sasisha wasifu\n3. Anwani za dharura\n0. Rudi",
-            'help_text': "Msaada wa MAMA-AI 📖\nHuduma hii inatoa:\n• Kufuatilia ujauzito\n• Ushauri wa afya\n• Msaada wa dharura\n• Ukumbusho wa miadi\n\nKwa dharura, piga 911\nTuma SMS 'HELP' kwa habari zaidi",
-            'invalid_choice': "Chaguo si sahihi. Tafadhali jaribu tena.",
-            'enter_symptoms': "Tafadhali eleza dalili zako za sasa:",
-            'baby_movement': "Ni mara ngapi ulisikia mtoto akizunguka katika saa iliyopita?\n1. Chini ya 3\n2. Mara 3-5\n3. Zaidi ya 5",
-            'report_symptoms': "Eleza dalili zako kwa undani:",
-            'ask_question': "Una swali gani la afya?",
-            'choose_language': "Chagua lugha:\n1. Kiingereza\n2. Kiswahili",
-            'update_profile': "Ingiza jina lako:",
-            'language_changed': "Lugha imesasishwa kikamilifu!",
-            'name_updated': "Jina limesasishwa kikamilifu!",
-            'invalid_option': "Chaguo si sahihi.",
-            'emergency_response': "🚨 DHARURA IMEGUNDULIWA 🚨\n\nIkiwa ni hatari ya maisha:\nPIGA 911 MARA MOJA\n\nDharura za kawaida za ujauzito:\n• Kutokwa damu kwingi\n• Maumivu makali ya tumbo\n• Matatizo ya macho\n• Maumivu makali ya kichwa\n\nTunatuma ujumbe kwa anayekuhudumia.\n\nTulia na tafuta msaada wa haraka.",
-            'no_pregnancy': "Hakuna ujauzito unaoendelea. \n1. Sajili ujauzito mpya\n0. Rudi menyu kuu",
-            'sms_help': "Msaada wa MAMA-AI 📱\n\nAmri za SMS:\n• HELP - Ujumbe huu wa msaada\n• SYMPTOMS - Ripoti dalili\n• APPOINTMENT - Angalia miadi\n• REMINDER - Weka ukumbusho wa dawa\n• EMERGENCY - Pata msaada wa dharura\n• STOP - Acha kujisajili\n\nUSSD: Piga *123# kwa menyu kamili\n\nDharura: Piga 911",
-            'unsubscribed': "Umeacha kujisajili kutoka kwa ujumbe wa MAMA-AI. Tuma SMS START kuanzisha tena. Kwa dharura, daima piga 911.",
-            'welcome_back': "Karibu tena MAMA-AI! 🤱\n\nMsaidizi wako wa afya ya mama sasa ni hai.\n\nPiga *123# kwa menyu kamili au tuma SMS HELP kwa amri.\n\nTuko hapa kukusaidia katika safari yako ya ujauzito!",
-            'next_appointment': "Miadi yako ijayo:\n📅 {date}\n🏥 {type}\n📍 {location}\n\nTutakutumia ukumbusho masaa 24 kabla.",
-            'no_appointments': "Huna miadi iliyopangwa. Wasiliana na mtoa huduma za afya kupanga ziara yako ijayo.",
-            'reminder_info': "Ukumbusho wa Dawa 💊\n\nKuweka ukumbusho:\n1. Piga *123# → Miadi\n2. Tembelea mtoa huduma za afya\n3. Tutaweka ukumbusho kiotomatiki\n\nKwa maswali ya haraka ya dawa, shauri na mtoa huduma za afya.",
-            'appointment_reminder': "📅 UKUMBUSHO WA MIADI\n\nUna miadi kesho:\n🕒 {date}\n🏥 {type}\n📍 {location}\n\nTafadhali fika dakika 15 mapema. Lete kitabu chako cha ujauzito na maswali yoyote."
-        }
-    }
-    
-    return translations.get(language, {}).get(key, default_text)
+    """Get the raw text of a catalog message, or default_text for an unknown key"""
+    try:
+        return get_catalog().template(language, key).text
+    except CatalogError:
+        return default_text
 
 def translate_text(text, target_language):
-    """Simple text translation using keyword mapping"""
+    """Swap known English phrases for target_language ones, keeping case and word boundaries"""
     if target_language == 'en':
         return text  # Assume input is already English or mixed
     
-    # Simple Swahili translations for common terms
-    translations = {
-        'hello': 'halo',
-        'thank you': 'asante',
-        'welcome': 'karibu',
-        'help': 'msaada',
-        'emergency': 'dharura',
-        'pregnancy': 'ujauzito',
-        'baby': 'mtoto',
-        'mother': 'mama',
-        'doctor': 'daktari',
-        'hospital': 'hospitali',
-        'pain': 'maumivu',
-        'bleeding': 'kutokwa damu',
-        'appointment': 'miadi',
-        'medicine': 'dawa',
-        'health': 'afya',
-        'symptoms': 'dalili'
-    }
-    
-    # Simple word replacement (in a real app, use proper translation API)
-    translated = text.lower()
-    for en_word, sw_word in translations.items():
-        translated = translated.replace(en_word, sw_word)
-    
-    return translated
+    # Phrase tables live in src/data/phrases.json (or PHRASES_PATH)
+    translator = get_translator(target_language)
+    return translator.translate(text) if translator else text
 
-def format_phone_number(phone_number, country_code='+254'):
-    """Format phone number to international format"""
-    # Remove all non-digit characters except +
-    clean = ''.join(c for c in phone_number if c.isdigit() or c == '+')
-    
-    # Add country code if not present
-    if not clean.startswith('+'):
-        if clean.startswith('0'):
-            clean = country_code + clean[1:]
-        elif clean.startswith('254'):
-            clean = '+' + clean
-        else:
-            clean = country_code + clean
-    
-    return clean
+def format_phone_number(phone_number, region=None):
+    """Format phone number to international (E.164) format"""
+    return normalize_phone(phone_number, region)
 
-def validate_phone_number(phone_number):
-    """Validate phone number format"""
-    clean = format_phone_number(phone_number)
-    # Basic validation for Kenyan numbers
-    return len(clean) >= 12 and clean.startswith('+254')
+def validate_phone_number(phone_number, region=None):
+    """Validate phone number for the region (DEFAULT_PHONE_REGION if not given)"""
+    return is_valid_phone(phone_number, region)
+
+def _word_tokenizer():
+    """Return NLTK's word_tokenize if enabled and its data is installed, else None"""
+    global _nltk_tokenizer
+    if _nltk_tokenizer is None:
+        _nltk_tokenizer = False
+        if USE_NLTK:
+            try:
+                from nltk.tokenize import word_tokenize
+                word_tokenize("probe")
+                _nltk_tokenizer = word_tokenize
+            except (ImportError, LookupError) as e:
+                logger.warning(f"⚠️  NLTK tokenizer unavailable, using the regex tokenizer: {str(e)}")
+    return _nltk_tokenizer or None
+
+def tokenize(text):
+    """Split lower-cased text into words"""
+    tokenizer = _word_tokenizer()
+    if tokenizer:
+        return tokenizer(text.lower())
+    return _TOKEN_RE.findall(text.lower())
 
 def extract_keywords(text, language='en'):
     """Extract important keywords from text"""
-    try:
-        # Download required NLTK data if not available
-        try:
-            stopwords.words('english')
-        except LookupError:
-            nltk.download('stopwords')
-            nltk.download('punkt')
-        
-        tokens = word_tokenize(text.lower())
-        stop_words = set(stopwords.words('english'))
-        
-        # Filter out stopwords and get important keywords
-        keywords = [word for word in tokens if word.isalpha() and word not in stop_words]
-        
-        return keywords[:10]  # Return top 10 keywords
-    except:
-        # Fallback to simple word splitting if NLTK fails
-        words = text.lower().split()
-        return [word for word in words if len(word) > 3][:10]
+    stop_words = STOPWORDS.get(language, ENGLISH_STOPWORDS)
+    
+    # Filter out stopwords and get important keywords
+    keywords = [word for word in tokenize(text or '') if word.isalpha() and word not in stop_words]
+    
+    return keywords[:10]  # Return top 10 keywords
 
 def get_emergency_keywords():
     """Get list of emergency keywords in both languages"""
-    emergency_keywords = {
-        'en': [
-            'emergency', 'urgent', 'help', 'bleeding', 'severe pain',
-            'can\'t breathe', 'unconscious', 'dizzy', 'blurred vision',
-            'heavy bleeding', 'severe headache', 'chest pain', 'fever',
-            'vomiting blood', 'water broke', 'contractions'
-        ],
-        'sw': [
-            'dharura', 'haraka', 'msaada', 'damu', 'maumivu makali',
-            'sijui kupumua', 'amezimia', 'kizunguzungu', 'macho haoni',
-            'damu nyingi', 'maumivu ya kichwa', 'maumivu ya kifua', 'homa',
-            'kutapika damu', 'maji yamevunjika', 'uchungu wa kujifungua'
-        ]
-    }
-    
-    return emergency_keywords
+    return get_lexicon().emergency_keywords
 
 def is_emergency_message(text):
-    """Check if message contains emergency keywords"""
-    text_lower = text.lower()
-    emergency_keywords = get_emergency_keywords()
-    
-    # Check both English and Swahili emergency keywords
-    for lang_keywords in emergency_keywords.values():
-        for keyword in lang_keywords:
-            if keyword in text_lower:
-                return True
-    
-    return False
+    """Check if message contains an emergency keyword (the same screen webhooks run at ingress)"""
+    return find_emergency(text) is not None
 
 def clean_text(text):
     """Clean and normalize text input"""
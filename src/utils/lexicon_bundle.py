@@ -0,0 +1,435 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+LEXICON_SOURCE = os.getenv(
+    'LEXICON_SOURCE',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'lexicon.json')
+)
+LEXICON_PATH = os.getenv('LEXICON_PATH', os.path.join('instance', 'lexicon.bin'))
+LEXICON_CHECK_INTERVAL = float(os.getenv('LEXICON_CHECK_INTERVAL', '5'))
+
+# Artifact layout: header, section table, then one blob per section. Keyword
+# sections are UTF-8 JSON; each language's messages get a .mo-style section.
+MAGIC = b'MAMALEX2'
+_HEADER = struct.Struct('<8sII')     # magic, bundle version, section count
+_SECTION = struct.Struct('<24sII')   # section name, offset, length
+_MESSAGE_COUNT = struct.Struct('<I')
+_MESSAGE = struct.Struct('<IIII')    # key offset, key length, text offset, text length
+
+SECTIONS = ('triage', 'emergency_keywords')
+MESSAGES_PREFIX = 'messages.'
+TRIAGE_TIERS = ('emergency', 'high_risk')
+
+
+class LexiconError(Exception):
+    """A lexicon bundle or compiled artifact is malformed"""
+
+
+def _keyword_list(value, where):
+    if not isinstance(value, list) or not all(isinstance(item, str) and item.strip() for item in value):
+        raise LexiconError(f"{where} must be a list of non-empty strings")
+    # Matchers work on lower-cased text; drop duplicates but keep the order
+    return list(dict.fromkeys(item.strip().lower() for item in value))
+
+
+def validate_bundle(bundle):
+    """Check a bundle's shape and return it with keywords normalised"""
+    if not isinstance(bundle, dict):
+        raise LexiconError("bundle must be a JSON object")
+    version = bundle.get('version')
+    if not isinstance(version, int) or version < 1:
+        raise LexiconError("version must be a positive integer")
+
+    triage = bundle.get('triage')
+    if not isinstance(triage, dict) or set(triage) != set(TRIAGE_TIERS):
+        raise LexiconError(f"triage must have exactly the tiers {', '.join(TRIAGE_TIERS)}")
+    emergency_keywords = bundle.get('emergency_keywords')
+    if not isinstance(emergency_keywords, dict) or not emergency_keywords:
+        raise LexiconError("emergency_keywords must map language codes to keyword lists")
+    translations = bundle.get('translations')
+    if not isinstance(translations, dict) or not all(
+        isinstance(table, dict) and all(isinstance(text, str) for text in table.values())
+        for table in translations.values()
+    ):
+        raise LexiconError("translations must map language codes to {key: text} tables")
+    for lang in translations:
+        if not lang.isascii() or len(MESSAGES_PREFIX + lang) > 24:
+            raise LexiconError(f"translations: bad language code {lang!r}")
+    from src.utils.catalog import Catalog, CatalogError
+    try:
+        Catalog(translations)
+    except CatalogError as e:
+        raise LexiconError(f"translations: {e.args[0]}")
+
+    return {
+        'version': version,
+        'triage': {tier: _keyword_list(triage[tier], f"triage.{tier}") for tier in TRIAGE_TIERS},
+        'emergency_keywords': {
+            lang: _keyword_list(keywords, f"emergency_keywords.{lang}")
+            for lang, keywords in emergency_keywords.items()
+        },
+        'translations': translations,
+    }
+
+
+def load_source(path=None):
+    """Read and validate a JSON lexicon bundle"""
+    with open(path or LEXICON_SOURCE, encoding='utf-8') as source:
+        try:
+            bundle = json.load(source)
+        except ValueError as e:
+            raise LexiconError(f"{path or LEXICON_SOURCE}: {e}")
+    return validate_bundle(bundle)
+
+
+def encode_messages(table):
+    """Pack {key: text} like a gettext .mo file: count, offset table sorted by key, UTF-8 strings"""
+    encoded = sorted((key.encode('utf-8'), text.encode('utf-8')) for key, text in table.items())
+    offset = _MESSAGE_COUNT.size + _MESSAGE.size * len(encoded)
+    entries, strings = [], []
+    for raw_key, raw_text in encoded:
+        entries.append(_MESSAGE.pack(offset, len(raw_key), offset + len(raw_key), len(raw_text)))
+        strings.extend((raw_key, raw_text))
+        offset += len(raw_key) + len(raw_text)
+    return _MESSAGE_COUNT.pack(len(encoded)) + b''.join(entries) + b''.join(strings)
+
+
+def _encode_sections(bundle):
+    blobs = {
+        name: json.dumps(bundle[name], ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        for name in SECTIONS
+    }
+    for lang, table in bundle['translations'].items():
+        blobs[MESSAGES_PREFIX + lang] = encode_messages(table)
+    return blobs
+
+
+def compile_bundle(source_path=None, artifact_path=None):
+    """Compile a JSON bundle into the binary artifact workers map.
+
+    The artifact is written to a temporary file next to the target and
+    renamed over it, so a reader sees either the old version or the new
+    one, never a partial file. Returns the compiled version.
+    """
+    bundle = load_source(source_path)
+    artifact_path = artifact_path or LEXICON_PATH
+    blobs = _encode_sections(bundle)
+
+    offset = _HEADER.size + _SECTION.size * len(blobs)
+    table = []
+    for name, blob in blobs.items():
+        table.append(_SECTION.pack(name.encode('ascii'), offset, len(blob)))
+        offset += len(blob)
+
+    directory = os.path.dirname(os.path.abspath(artifact_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.lexicon-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as artifact:
+            artifact.write(_HEADER.pack(MAGIC, bundle['version'], len(blobs)))
+            artifact.write(b''.join(table))
+            artifact.write(b''.join(blobs.values()))
+            artifact.flush()
+            os.fsync(artifact.fileno())
+        os.replace(tmp_path, artifact_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return bundle['version']
+
+
+class MessageTable:
+    """One language's messages, read in place from a .mo-style section.
+
+    Lookups binary-search the sorted keys in the mapped bytes and decode
+    only the text they return, so an unused language costs no memory.
+    """
+
+    def __init__(self, blob):
+        if len(blob) < _MESSAGE_COUNT.size:
+            raise LexiconError("truncated message table")
+        (self._count,) = _MESSAGE_COUNT.unpack_from(blob)
+        if len(blob) < _MESSAGE_COUNT.size + self._count * _MESSAGE.size:
+            raise LexiconError("truncated message offsets")
+        self._blob = blob
+
+    def __len__(self):
+        return self._count
+
+    def _entry(self, index):
+        return _MESSAGE.unpack_from(self._blob, _MESSAGE_COUNT.size + index * _MESSAGE.size)
+
+    def get(self, key, default=None):
+        target = key.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_length, text_offset, text_length = self._entry(middle)
+            probe = bytes(self._blob[key_offset:key_offset + key_length])
+            if probe < target:
+                low = middle + 1
+            elif probe > target:
+                high = middle
+            else:
+                return str(self._blob[text_offset:text_offset + text_length], 'utf-8')
+        return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def items(self):
+        """(key, text) pairs in key order, decoded as they are iterated"""
+        blob = self._blob
+        for index in range(self._count):
+            key_offset, key_length, text_offset, text_length = self._entry(index)
+            yield (str(blob[key_offset:key_offset + key_length], 'utf-8'),
+                   str(blob[text_offset:text_offset + text_length], 'utf-8'))
+
+    def keys(self):
+        return [key for key, _ in self.items()]
+
+
+class Lexicon:
+    """One read-only version of the keyword and content bundle.
+
+    Sections stay as bytes in the shared page cache until first used. Keyword
+    sections are then decoded once and kept for the life of this version;
+    messages are read in place through a MessageTable per language.
+    """
+
+    def __init__(self, version, blobs, origin):
+        self.version = version
+        self.origin = origin
+        self._blobs = blobs
+        self._decoded = {}
+        self._lock = threading.Lock()
+        self.messages = {
+            name[len(MESSAGES_PREFIX):]: MessageTable(blob)
+            for name, blob in blobs.items() if name.startswith(MESSAGES_PREFIX)
+        }
+
+    @classmethod
+    def open(cls, path):
+        """Map a compiled artifact read-only and index its sections"""
+        with open(path, 'rb') as artifact:
+            try:
+                mapped = mmap.mmap(artifact.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise LexiconError(f"{path}: empty artifact")
+        if hasattr(mapped, 'madvise'):
+            # Lookups jump around the file; don't read ahead into unused languages
+            mapped.madvise(mmap.MADV_RANDOM)
+
+        view = memoryview(mapped)
+        if len(view) < _HEADER.size:
+            raise LexiconError(f"{path}: truncated header")
+        magic, version, count = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise LexiconError(f"{path}: not a lexicon artifact")
+        if len(view) < _HEADER.size + count * _SECTION.size:
+            raise LexiconError(f"{path}: truncated section table")
+
+        blobs = {}
+        for index in range(count):
+            raw_name, offset, length = _SECTION.unpack_from(view, _HEADER.size + index * _SECTION.size)
+            if offset + length > len(view):
+                raise LexiconError(f"{path}: section runs past the end of the file")
+            blobs[raw_name.rstrip(b'\0').decode('ascii')] = view[offset:offset + length]
+
+        missing = set(SECTIONS) - set(blobs)
+        if missing:
+            raise LexiconError(f"{path}: missing sections {', '.join(sorted(missing))}")
+        lexicon = cls(version, blobs, path)
+        if not lexicon.messages:
+            raise LexiconError(f"{path}: no message sections")
+        return lexicon
+
+    @classmethod
+    def from_source(cls, path=None):
+        """Build an unmapped lexicon straight from the JSON bundle"""
+        bundle = load_source(path)
+        return cls(bundle['version'], _encode_sections(bundle), path or LEXICON_SOURCE)
+
+    def section(self, name):
+        """Return a decoded section, decoding it on first use"""
+        value = self._decoded.get(name)
+        if value is None:
+            with self._lock:
+                value = self._decoded.get(name)
+                if value is None:
+                    value = json.loads(bytes(self._blobs[name]))
+                    self._decoded[name] = value
+        return value
+
+    @property
+    def triage(self):
+        return self.section('triage')
+
+    @property
+    def emergency_keywords(self):
+        return self.section('emergency_keywords')
+
+    @property
+    def languages(self):
+        return tuple(self.messages)
+
+    @property
+    def translations(self):
+        """Every language's messages decoded into dicts (tools and tests; requests use messages)"""
+        return {lang: dict(table.items()) for lang, table in self.messages.items()}
+
+
+class LexiconStore:
+    """Holds the current Lexicon and swaps in new artifact versions.
+
+    The artifact is stat'ed at most once per check_interval; a request
+    otherwise pays one clock read. A changed file is mapped and validated
+    before the reference is swapped, so readers never see a half-loaded
+    version and a bad artifact leaves the current one in place. An artifact
+    older than the JSON source (say, left in instance/ by an earlier
+    release) is recompiled from the source.
+    """
+
+    def __init__(self, path=None, source=None, check_interval=None, clock=time.monotonic):
+        self.path = path or LEXICON_PATH
+        self.source = source
+        self.check_interval = LEXICON_CHECK_INTERVAL if check_interval is None else check_interval
+        self._clock = clock
+        self._lexicon = None
+        self._identity = None
+        self._source_identity = None
+        self._source_version = None
+        self._rejected_source_version = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.swaps = 0
+        self.errors = 0
+
+    def current(self):
+        """Return the current Lexicon, checking for a new artifact when due"""
+        if self._lexicon is None or self._clock() >= self._next_check:
+            self.refresh()
+        return self._lexicon
+
+    def refresh(self):
+        """Load the artifact if it changed on disk; return True if a new version was swapped in"""
+        # One thread checks; the others keep using the current version
+        if not self._lock.acquire(blocking=self._lexicon is None):
+            return False
+        try:
+            self._next_check = self._clock() + self.check_interval
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                if self._lexicon is None:
+                    self._lexicon = self._compile_source()
+                return False
+
+            identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            lexicon = self._lexicon
+            if identity != self._identity:
+                try:
+                    lexicon = Lexicon.open(self.path)
+                except (OSError, LexiconError) as e:
+                    self.errors += 1
+                    logger.error(f"❌ Ignoring lexicon artifact {self.path}: {str(e)}")
+                    if self._lexicon is None:
+                        self._lexicon = Lexicon.from_source(self.source)
+                    return False
+                self._identity = identity
+
+            source_version = self.source_version()
+            if (source_version is not None and source_version > lexicon.version
+                    and source_version != self._rejected_source_version):
+                logger.warning(f"⚠️  Lexicon artifact {self.path} is version {lexicon.version}, "
+                               f"source is {source_version}; recompiling")
+                lexicon = self._compile_source(fallback=lexicon)
+
+            if lexicon is self._lexicon or (
+                    self._lexicon is not None and lexicon.version == self._lexicon.version
+                    and self._lexicon.origin == lexicon.origin):
+                return False
+            if self._lexicon is not None:
+                logger.info(f"✅ Lexicon version {self._lexicon.version} -> {lexicon.version}")
+                self.swaps += 1
+            self._lexicon = lexicon
+            return True
+        finally:
+            self._lock.release()
+
+    def source_version(self):
+        """The JSON source's version, re-read only when the file changes; None if unreadable"""
+        source = self.source or LEXICON_SOURCE
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if identity != self._source_identity:
+            try:
+                with open(source, encoding='utf-8') as handle:
+                    version = json.load(handle).get('version')
+            except (OSError, ValueError, AttributeError):
+                version = None
+            self._source_identity = identity
+            self._source_version = version if isinstance(version, int) else None
+        return self._source_version
+
+    def _compile_source(self, fallback=None):
+        """Compile the bundled source over the artifact and map it.
+
+        If the artifact cannot be written the source is used unmapped; if
+        the source itself is invalid, fallback (the artifact) is kept.
+        """
+        try:
+            compile_bundle(self.source, self.path)
+            stat = os.stat(self.path)
+            lexicon = Lexicon.open(self.path)
+        except LexiconError as e:
+            if fallback is None:
+                raise
+            self.errors += 1
+            self._rejected_source_version = self.source_version()
+            logger.error(f"❌ Keeping lexicon version {fallback.version}; source is invalid: {str(e)}")
+            return fallback
+        except OSError as e:
+            logger.warning(f"⚠️  Could not write {self.path} ({str(e)}); using the bundled source unmapped")
+            return Lexicon.from_source(self.source)
+        self._identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        return lexicon
+
+    def stats(self):
+        """Return the live version and swap counters"""
+        lexicon = self.current()
+        return {'version': lexicon.version, 'origin': lexicon.origin,
+                'swaps': self.swaps, 'errors': self.errors}
+
+
+_lexicon_store = None
+
+
+def get_lexicon_store():
+    """Return the process-wide lexicon store"""
+    global _lexicon_store
+    if _lexicon_store is None:
+        _lexicon_store = LexiconStore()
+    return _lexicon_store
+
+
+def get_lexicon():
+    """Return the lexicon version requests should use right now"""
+    return get_lexicon_store().current()
+
+
+def reset_lexicon_store(store=None):
+    """Replace the process-wide store, e.g. with one reading another path"""
+    global _lexicon_store
+    _lexicon_store = store
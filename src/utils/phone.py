@@ -0,0 +1,140 @@
+import os
+import re
+import threading
+from src.utils.ttl_cache import TTLCache
+
+DEFAULT_PHONE_REGION = os.getenv('DEFAULT_PHONE_REGION', 'KE')
+PHONE_CACHE_SIZE = int(os.getenv('PHONE_CACHE_SIZE', '100000'))
+
+# Separators people and gateways put in numbers; deleted before the shape check
+_SEPARATORS = (' ', '-', '(', ')', '.', '/', '\t')
+
+# (raw number, region) -> E.164; phonenumbers parsing costs tens of microseconds
+_normalized = TTLCache(maxsize=PHONE_CACHE_SIZE, ttl=None)
+
+_shapes = {}
+_shapes_lock = threading.Lock()
+
+
+class _RegionShape:
+    """The common mobile number shapes of one region, checked without parsing.
+
+    Built from the phonenumbers metadata. Only shapes phonenumbers itself
+    resolves the same way are accepted: a mobile national number, bare or
+    behind the national prefix, the country code or +country code.
+    Everything else goes to the parser.
+    """
+
+    def __init__(self, metadata):
+        self.country_code = str(metadata.country_code)
+        prefix = metadata.national_prefix or ''
+        lengths = sorted(metadata.mobile.possible_length)
+        leads = [r'\+' + self.country_code]
+        # Without the +, the parser only strips a country code from a number
+        # longer than any national one
+        if len(self.country_code) + lengths[0] > max(metadata.general_desc.possible_length):
+            leads.append(self.country_code)
+        if prefix:
+            leads.append(re.escape(prefix))
+        self.pattern = re.compile(
+            '(?:' + '|'.join(leads) + ')?'
+            + ('(?!' + re.escape(prefix) + ')' if prefix else '')
+            + '(?=(?:' + '|'.join(r'\d{%d}' % length for length in lengths) + r')\Z)'
+            + '(' + metadata.mobile.national_number_pattern + ')',
+            re.ASCII
+        )
+
+    def e164(self, phone_number):
+        """Return the E.164 form of a common-shaped number, or None"""
+        match = self.pattern.fullmatch(_strip_separators(phone_number))
+        return '+' + self.country_code + match.group(1) if match else None
+
+
+def _strip_separators(phone_number):
+    # A few str.replace calls beat str.translate several times over on short strings
+    for separator in _SEPARATORS:
+        phone_number = phone_number.replace(separator, '')
+    return phone_number
+
+
+def _region_shape(region):
+    shape = _shapes.get(region, False)
+    if shape is False:
+        with _shapes_lock:
+            from phonenumbers import PhoneMetadata
+            metadata = PhoneMetadata.metadata_for_region(region)
+            # Regions with a national prefix rule beyond a plain prefix always use the parser
+            simple = metadata is not None and metadata.mobile is not None and \
+                metadata.national_prefix_for_parsing in (None, metadata.national_prefix)
+            shape = _shapes[region] = _RegionShape(metadata) if simple else None
+    return shape
+
+
+def _parse(phone_number, region):
+    import phonenumbers
+    try:
+        number = phonenumbers.parse(phone_number, region)
+    except phonenumbers.NumberParseException:
+        # Not a number phonenumbers recognises (e.g. an alphanumeric sender);
+        # keep a stable key rather than failing the request
+        return _strip_separators(phone_number)
+    return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+
+def _normalize(phone_number, region):
+    shape = _region_shape(region)
+    return (shape and shape.e164(phone_number)) or _parse(phone_number, region)
+
+
+def normalize_phone(phone_number, region=None):
+    """Return phone_number in E.164 form, reading national numbers as region's.
+
+    Input phonenumbers cannot parse comes back with separators removed.
+    """
+    if not phone_number:
+        return phone_number
+    region = region or DEFAULT_PHONE_REGION
+    key = (phone_number, region)
+    e164 = _normalized.get(key)
+    if e164 is None:
+        e164 = _normalize(phone_number, region)
+        _normalized.set(key, e164)
+    return e164
+
+
+def normalize_many(phone_numbers, region=None):
+    """Normalize a list of numbers (imports, broadcast lists) in one pass.
+
+    Each distinct number is resolved once, common shapes without the
+    parser, and the shared single-number cache is left alone.
+    """
+    region = region or DEFAULT_PHONE_REGION
+    shape = _region_shape(region)
+    e164 = shape.e164 if shape else (lambda phone_number: None)
+    done = {}
+    for phone_number in phone_numbers:
+        if phone_number not in done:
+            done[phone_number] = (e164(phone_number) or _parse(phone_number, region)) if phone_number else phone_number
+    return [done[phone_number] for phone_number in phone_numbers]
+
+
+def is_valid_phone(phone_number, region=None):
+    """Check that phone_number is a valid number of region"""
+    import phonenumbers
+    region = region or DEFAULT_PHONE_REGION
+    try:
+        number = phonenumbers.parse(phone_number, region)
+    except phonenumbers.NumberParseException:
+        return False
+    return phonenumbers.is_valid_number_for_region(number, region)
+
+
+def phone_cache_stats():
+    """Return hit/miss/eviction counters for the normalizer cache"""
+    return _normalized.stats()
+
+
+def reset_phone_cache():
+    """Forget every cached number and compiled region shape"""
+    _normalized.clear()
+    _shapes.clear()
@@ -0,0 +1,125 @@
+import json
+import os
+import re
+import threading
+
+PHRASES_PATH = os.getenv('PHRASES_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'phrases.json'
+)
+
+
+class PhraseTableError(Exception):
+    """A phrase table file is malformed"""
+
+
+def _normalize(phrase):
+    return ' '.join(phrase.lower().split())
+
+
+def _match_case(source, replacement):
+    """Give replacement the capitalisation of the text it replaces"""
+    if len(source) > 1 and source.isupper():
+        return replacement.upper()
+    if source[:1].isupper():
+        return replacement[:1].upper() + replacement[1:]
+    return replacement
+
+
+def _trie_pattern(node):
+    """Regex for a character trie; '' marks a phrase ending at this node.
+
+    Greedy branches are tried before the phrase that ends here, so the
+    longest phrase wins unless it fails the word-boundary check.
+    """
+    branches = []
+    for char in sorted(char for char in node if char):
+        atom = r'\s+' if char == ' ' else re.escape(char)
+        branches.append(atom + _trie_pattern(node[char]))
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        return '(?:' + body + ')?'
+    return body
+
+
+class PhraseTranslator:
+    """Word-for-word phrase substitution in a single pass.
+
+    The phrases are compiled into one regex shaped like a trie. Each match
+    is the longest phrase starting at that position that sits on word
+    boundaries, so "help" never rewrites "helpful". Matching ignores case
+    and the replacement copies the capitalisation of the original.
+    """
+
+    def __init__(self, phrases):
+        self.phrases = {}
+        trie = {}
+        for phrase, replacement in phrases.items():
+            key = _normalize(phrase)
+            if not key:
+                continue
+            self.phrases[key] = replacement
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[''] = True
+        self._pattern = re.compile(r'(?<!\w)' + _trie_pattern(trie) + r'(?!\w)', re.IGNORECASE) if trie else None
+
+    def _replace(self, match):
+        source = match.group(0)
+        return _match_case(source, self.phrases[_normalize(source)])
+
+    def translate(self, text):
+        if not text or self._pattern is None:
+            return text
+        return self._pattern.sub(self._replace, text)
+
+    def translate_many(self, texts):
+        """Translate many texts, doing each distinct text once (broadcasts repeat)"""
+        done = {}
+        translate = self.translate
+        result = []
+        for text in texts:
+            translated = done.get(text)
+            if translated is None:
+                translated = done[text] = translate(text)
+            result.append(translated)
+        return result
+
+
+def load_phrase_tables(path=None):
+    """Read {language: {phrase: replacement}} tables from a JSON file"""
+    path = path or PHRASES_PATH
+    with open(path, encoding='utf-8') as source:
+        try:
+            tables = json.load(source)
+        except ValueError as e:
+            raise PhraseTableError(f"{path}: {e}")
+    if not isinstance(tables, dict) or not all(
+        isinstance(table, dict) and all(isinstance(phrase, str) and isinstance(text, str)
+                                        for phrase, text in table.items())
+        for table in tables.values()
+    ):
+        raise PhraseTableError(f"{path}: expected {{language: {{phrase: replacement}}}}")
+    return tables
+
+
+_translators = None
+_translators_lock = threading.Lock()
+
+
+def get_translator(language):
+    """Return the process-wide translator into language, or None if there is no table"""
+    global _translators
+    if _translators is None:
+        with _translators_lock:
+            if _translators is None:
+                _translators = {lang: PhraseTranslator(table) for lang, table in load_phrase_tables().items()}
+    return _translators.get(language)
+
+
+def reset_translators(tables=None):
+    """Rebuild translators from tables (None reloads PHRASES_PATH on next use)"""
+    global _translators
+    _translators = None if tables is None else {lang: PhraseTranslator(table) for lang, table in tables.items()}
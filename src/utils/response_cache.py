@@ -0,0 +1,130 @@
+import logging
+import os
+import re
+import sys
+import threading
+from src.utils.ttl_cache import TTLCache
+
+try:
+    import redis
+except ImportError:  # shared tier is optional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '5000'))
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', '86400'))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(8 * 1024 * 1024)))
+RESPONSE_CACHE_URL = os.getenv('RESPONSE_CACHE_URL')
+
+_TOKEN_RE = re.compile(r"[\w']+")
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def question_fingerprint(text, lang='en', channel='chat'):
+    """Language- and channel-tagged key for a question.
+
+    Only case, punctuation and spacing are normalised: "Is it safe to eat
+    eggs?" and "is it safe to eat eggs" share a key, but word order and
+    question words are kept, since "can I eat eggs when pregnant" and
+    "when can I eat eggs" ask different things. Returns None when no words are left.
+    """
+    words = _TOKEN_RE.findall((text or '').lower())
+    if not words:
+        return None
+    return f"{lang}:{channel}:{' '.join(words)}"
+
+
+def _entry_size(key, value):
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class ResponseCache:
+    """Two-tier answer cache: in-process LRU/TTL with a byte cap, plus an optional shared store.
+
+    The shared tier is any client with get(key) and set(key, value, ex=seconds),
+    such as redis. A local miss that hits the shared tier warms the local
+    copy, so gunicorn workers share answers generated by any of them.
+    Shared-tier failures are logged and treated as misses.
+    """
+
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL,
+                 maxbytes=RESPONSE_CACHE_MAX_BYTES, shared=None, prefix='mama-ai:answer:'):
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl, maxbytes=maxbytes, sizeof=_entry_size)
+        self.ttl = ttl
+        self.shared = shared
+        self.prefix = prefix
+        self.shared_hits = 0
+        self.shared_errors = 0
+
+    def get(self, key):
+        """Return the cached answer, or None"""
+        answer = self.local.get(key)
+        if answer is not None or self.shared is None:
+            return answer
+
+        try:
+            raw = self.shared.get(self.prefix + key)
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared response cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+
+        answer = raw.decode('utf-8') if isinstance(raw, bytes) else raw
+        self.shared_hits += 1
+        self.local.set(key, answer)
+        return answer
+
+    def set(self, key, answer):
+        """Store an answer in both tiers"""
+        self.local.set(key, answer)
+        if self.shared is None:
+            return
+        try:
+            self.shared.set(self.prefix + key, answer, ex=int(self.ttl))
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared response cache write failed: {e}")
+
+    def clear(self):
+        """Drop local entries; the shared tier expires on its own"""
+        self.local.clear()
+
+    def stats(self):
+        """Local counters plus shared-tier hits and the combined hit rate"""
+        stats = self.local.stats()
+        lookups = stats['hits'] + stats['misses']
+        stats['shared'] = self.shared is not None
+        stats['shared_hits'] = self.shared_hits
+        stats['shared_errors'] = self.shared_errors
+        stats['hit_rate'] = round((stats['hits'] + self.shared_hits) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def _shared_client():
+    if not RESPONSE_CACHE_URL:
+        return None
+    if redis is None:
+        logger.warning("⚠️  RESPONSE_CACHE_URL is set but redis is not installed; caching locally only")
+        return None
+    return redis.Redis.from_url(RESPONSE_CACHE_URL, socket_timeout=0.2, socket_connect_timeout=0.2)
+
+
+def get_response_cache():
+    """Return the process-wide answer cache"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(shared=_shared_client())
+        return _response_cache
+
+
+def reset_response_cache(cache=None):
+    """Replace the process-wide cache (None rebuilds it from the environment on next use)"""
+    global _response_cache
+    with _response_cache_lock:
+        _response_cache = cache
@@ -0,0 +1,436 @@
+import sys
+from collections import namedtuple
+from string import Formatter
+
+# A fixed reply with everything the send path needs precomputed
+ResponseEntry = namedtuple('ResponseEntry', ['text', 'encoded', 'length', 'segments'])
+
+DEFAULT_LANGUAGE = 'en'
+
+# GSM 03.38 basic character set; anything outside it forces UCS-2 encoding
+GSM7_BASIC = frozenset(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+# Extension characters take two septets (escape + char)
+GSM7_EXTENDED = frozenset("^{}\\[~]|€\f")
+
+
+def sms_segments(text):
+    """Return how many SMS parts are needed to deliver text"""
+    if not text:
+        return 1
+
+    septets = 0
+    for char in text:
+        if char in GSM7_BASIC:
+            septets += 1
+        elif char in GSM7_EXTENDED:
+            septets += 2
+        else:
+            # UCS-2 counts UTF-16 code units: 70 in one part, 67 per part otherwise
+            units = len(text.encode('utf-16-le')) // 2
+            return 1 if units <= 70 else -(-units // 67)
+
+    return 1 if septets <= 160 else -(-septets // 153)
+
+
+def _entry(text):
+    """Intern text and precompute its wire form and SMS cost"""
+    text = sys.intern(text)
+    return ResponseEntry(text, text.encode('utf-8'), len(text), sms_segments(text))
+
+
+class ResponseTemplate:
+    """A personalised reply parsed once; rendering is a single format call"""
+
+    def __init__(self, template):
+        self.template = sys.intern(template)
+        self.fields = frozenset(
+            field for _, field, _, _ in Formatter().parse(template) if field
+        )
+        self._format = self.template.format
+
+    def render(self, **params):
+        """Fill in the template fields"""
+        return self._format(**params)
+
+
+# Fixed replies keyed by (intent, language)
+_RESPONSE_TEXTS = {
+    ('emergency_symptoms', 'en'): (
+        "🚨 EMERGENCY! 🚨\n\n"
+        "These symptoms are very serious. CALL 911 NOW or go to the nearest hospital immediately.\n\n"
+        "Do not stay home - this is a medical emergency.\n\n"
+        "We've sent an emergency alert to your healthcare provider."
+    ),
+    ('emergency_symptoms', 'sw'): (
+        "🚨 DHARURA! 🚨\n\n"
+        "Dalili hizi ni hatari sana. PIGA simu 911 SASA HIVI au enda hospitali ya karibu.\n\n"
+        "Usibaki nyumbani - hii ni dharura ya kiafya.\n\n"
+        "Tumetuma ujumbe wa dharura kwa anayekuhudumia."
+    ),
+    ('high_risk_symptoms', 'en'): (
+        "⚠️ These symptoms require prompt medical attention.\n\n"
+        "Contact your healthcare provider or visit a clinic within 24 hours.\n\n"
+        "Warning signs during pregnancy:\n"
+        "• Any bleeding\n"
+        "• Severe pain\n"
+        "• Reduced baby movement\n"
+        "• Severe swelling\n\n"
+        "Don't wait - seek care promptly."
+    ),
+    ('high_risk_symptoms', 'sw'): (
+        "⚠️ Dalili hizi zinahitaji uchunguzi wa haraka.\n\n"
+        "Wasiliana na daktari wako au enda kliniki ndani ya masaa 24.\n\n"
+        "Dalili za hatari wakati wa ujauzito:\n"
+        "• Kutokwa damu\n"
+        "• Maumivu makali\n"
+        "• Mzunguko mdogo wa mtoto\n"
+        "• Uvimbe mkuu\n\n"
+        "Jihadharini na usisubiri."
+    ),
+    ('nausea', 'en'): (
+        "Nausea is common in early pregnancy.\n\n"
+        "Tips to help:\n"
+        "• Eat small, frequent meals\n"
+        "• Stay hydrated\n"
+        "• Try crackers before getting up\n"
+        "• Avoid strong smells\n\n"
+        "Contact your doctor if:\n"
+        "• Vomiting is severe\n"
+        "• Can't keep food/fluids down\n"
+        "• Losing weight"
+    ),
+    ('nausea', 'sw'): (
+        "Kuharisha ni kawaida katika miezi ya kwanza ya ujauzito.\n\n"
+        "Mapendekezo:\n"
+        "• Kula kidogo kidogo mara nyingi\n"
+        "• Ongeza maji\n"
+        "• Kula biskuti kabla ya kuamka\n"
+        "• Epuka vyakula vya kunuka kali\n\n"
+        "Wasiliana na daktari ikiwa:\n"
+        "• Unatapika sana\n"
+        "• Huwezi kula au kunywa\n"
+        "• Unapoteza uzito"
+    ),
+    ('back_pain', 'en'): (
+        "Back pain is common during pregnancy.\n\n"
+        "Ways to reduce it:\n"
+        "• Wear flat, comfortable shoes\n"
+        "• Sleep on your side\n"
+        "• Use a warm compress\n"
+        "• Do gentle exercises\n\n"
+        "Contact your doctor if pain is severe or worsening."
+    ),
+    ('back_pain', 'sw'): (
+        "Maumivu ya mgongo ni ya kawaida wakati wa ujauzito.\n\n"
+        "Jinsi ya kupunguza:\n"
+        "• Vaa viatu visivyo na visigino\n"
+        "• Lala upande mwako\n"
+        "• Tumia mto wa moto\n"
+        "• Fanya mazoezi ya wepesi\n\n"
+        "Wasiliana na daktari ikiwa maumivu ni makali au yanaongezeka."
+    ),
+    ('fatigue', 'en'): (
+        "Fatigue is very common during pregnancy.\n\n"
+        "Ways to manage:\n"
+        "• Rest frequently\n"
+        "• Get adequate sleep\n"
+        "• Eat energy-rich foods\n"
+        "• Light exercise helps\n\n"
+        "Make sure you're eating well and staying hydrated."
+    ),
+    ('fatigue', 'sw'): (
+        "Uchovu ni wa kawaida wakati wa ujauzito.\n\n"
+        "Jinsi ya kushughulikia:\n"
+        "• Pumzika mara nyingi\n"
+        "• Lala masaa ya kutosha\n"
+        "• Kula vyakula vyenye nishati\n"
+        "• Fanya mazoezi ya wepesi\n\n"
+        "Hakikisha unakula vyema na kunywa maji ya kutosha."
+    ),
+    ('heartburn', 'en'): (
+        "Heartburn is common during pregnancy.\n\n"
+        "Tips to help:\n"
+        "• Eat smaller meals\n"
+        "• Avoid spicy/acidic foods\n"
+        "• Don't lie down after eating\n"
+        "• Elevate your head while sleeping\n\n"
+        "Talk to your doctor about pregnancy-safe antacids."
+    ),
+    ('heartburn', 'sw'): (
+        "Uchungu wa kifuani ni wa kawaida wakati wa ujauzito.\n\n"
+        "Mapendekezo:\n"
+        "• Kula kidogo kidogo\n"
+        "• Epuka vyakula vya kunuka\n"
+        "• Usikae mara baada ya kula\n"
+        "• Ongeza kichwa chako unapolala\n\n"
+        "Wasiliana na daktari kwa dawa salama za ujauzito."
+    ),
+    ('general_advice', 'en'): (
+        "Thank you for sharing your symptoms with us.\n\n"
+        "Remember to:\n"
+        "• Attend regular clinic visits\n"
+        "• Eat nutritious foods\n"
+        "• Stay well hydrated\n"
+        "• Get adequate rest\n\n"
+        "Contact your healthcare provider if you have any concerns."
+    ),
+    ('general_advice', 'sw'): (
+        "Asante kwa kutueleza kuhusu dalili zako.\n\n"
+        "Kumbuka:\n"
+        "• Tembelea kliniki mara kwa mara\n"
+        "• Kula vyakula vyenye lishe\n"
+        "• Kunywa maji mengi\n"
+        "• Pumzika vizuri\n\n"
+        "Wasiliana na daktari wako ikiwa una wasiwasi wowote."
+    ),
+    ('movement_low', 'en'): (
+        "⚠️ Reduced baby movement may be a warning sign.\n\n"
+        "Try this:\n"
+        "1. Lie on your left side\n"
+        "2. Drink cold water\n"
+        "3. Count movements for 2 hours\n\n"
+        "If still no movement, GO TO HOSPITAL IMMEDIATELY!"
+    ),
+    ('movement_low', 'sw'): (
+        "⚠️ Mzunguko mdogo wa mtoto unaweza kuwa dalili ya hatari.\n\n"
+        "Fanya hivi:\n"
+        "1. Lala upande wa kushoto\n"
+        "2. Kunywa maji baridi\n"
+        "3. Hesabu mzunguko kwa saa 2\n\n"
+        "Ikiwa bado hamzunguki, ENDA HOSPITALI SASA HIVI!"
+    ),
+    ('movement_moderate', 'en'): (
+        "This movement level is moderate. Keep monitoring.\n\n"
+        "Count baby movements at the same time each day.\n\n"
+        "Contact your doctor if you notice changes."
+    ),
+    ('movement_moderate', 'sw'): (
+        "Mzunguko huu ni wa kati. Fuatilia zaidi.\n\n"
+        "Hesabu mzunguko wa mtoto kila siku wakati huo huo.\n\n"
+        "Wasiliana na daktari ikiwa unaona mabadiliko."
+    ),
+    ('movement_good', 'en'): (
+        "✅ Great! Your baby is showing good signs of health.\n\n"
+        "Continue monitoring movement patterns daily."
+    ),
+    ('movement_good', 'sw'): (
+        "✅ Vizuri! Mtoto wako anaonyesha ishara nzuri za afya.\n\n"
+        "Endelea kufuatilia mzunguko wake kila siku."
+    ),
+    ('movement_declining', 'en'): (
+        "⚠️ Your baby's movements have been lower over your recent reports.\n\n"
+        "A health worker has been alerted and will contact you.\n\n"
+        "Lie on your left side and count movements. If fewer than 10 in 2 hours, "
+        "GO TO HOSPITAL IMMEDIATELY!"
+    ),
+    ('movement_declining', 'sw'): (
+        "⚠️ Mzunguko wa mtoto wako umepungua katika ripoti zako za karibuni.\n\n"
+        "Mhudumu wa afya amearifiwa na atakupigia.\n\n"
+        "Lala upande wa kushoto na hesabu mzunguko. Ukiwa chini ya 10 kwa saa 2, "
+        "ENDA HOSPITALI SASA HIVI!"
+    ),
+    ('nutrition', 'en'): (
+        "Essential Pregnancy Nutrition 🥗\n\n"
+        "Include:\n"
+        "• Leafy green vegetables\n"
+        "• Fresh fruits\n"
+        "• Protein (meat, fish, beans)\n"
+        "• Dairy products\n"
+        "• Whole grains\n\n"
+        "Avoid:\n"
+        "• Alcohol\n"
+        "• Smoking\n"
+        "• Excessive caffeine\n"
+        "• High-mercury fish\n\n"
+        "Stay well hydrated!"
+    ),
+    ('nutrition', 'sw'): (
+        "Lishe Muhimu Wakati wa Ujauzito 🥗\n\n"
+        "Kula:\n"
+        "• Mboga za majani\n"
+        "• Matunda\n"
+        "• Protini (nyama, samaki, maharage)\n"
+        "• Maziwa na mazao yake\n"
+        "• Nafaka kamili\n\n"
+        "Epuka:\n"
+        "• Pombe\n"
+        "• Sigara\n"
+        "• Kahawa nyingi\n"
+        "• Samaki wenye sumu\n\n"
+        "Kunywa maji mengi!"
+    ),
+    ('safety', 'en'): (
+        "For safety during pregnancy:\n\n"
+        "Safe:\n"
+        "• Gentle exercise\n"
+        "• Sleeping on left side\n"
+        "• Warm (not hot) baths\n\n"
+        "Avoid:\n"
+        "• Intense exercise\n"
+        "• High altitudes\n"
+        "• Very hot water\n\n"
+        "Always ask your doctor!"
+    ),
+    ('safety', 'sw'): (
+        "Kwa usalama wakati wa ujauzito:\n\n"
+        "Salama:\n"
+        "• Mazoezi ya wepesi\n"
+        "• Kukaa upande wa kushoto\n"
+        "• Kuoga kwa maji ya joto la kawaida\n\n"
+        "Epuka:\n"
+        "• Mazoezi makali\n"
+        "• Kupanda juu\n"
+        "• Maji ya moto sana\n\n"
+        "Uliza daktari wako daima!"
+    ),
+    ('pain', 'en'): (
+        "About pain during pregnancy:\n\n"
+        "Normal discomforts:\n"
+        "• Back pain\n"
+        "• Leg cramps\n"
+        "• Mild headaches\n\n"
+        "Contact doctor if pain is:\n"
+        "• Severe\n"
+        "• Worsening\n"
+        "• With other symptoms\n\n"
+        "Don't take medications without consulting your doctor."
+    ),
+    ('pain', 'sw'): (
+        "Kuhusu maumivu wakati wa ujauzito:\n\n"
+        "Maumivu ya kawaida:\n"
+        "• Mgongo\n"
+        "• Miguu\n"
+        "• Kichwa (kidogo)\n\n"
+        "Wasiliana na daktari ikiwa:\n"
+        "• Maumivu ni makali\n"
+        "• Yanaongezeka\n"
+        "• Yana pamoja na dalili nyingine\n\n"
+        "Usitumie dawa bila ushauri wa daktari."
+    ),
+    ('food', 'en'): (
+        "About food during pregnancy:\n\n"
+        "Eat:\n"
+        "• Fruits and vegetables\n"
+        "• Lean proteins\n"
+        "• Iron-rich foods\n"
+        "• Calcium sources\n\n"
+        "Avoid:\n"
+        "• Raw meat/fish\n"
+        "• Unpasteurized dairy\n"
+        "• High-mercury fish\n\n"
+        "Ask your doctor about supplements."
+    ),
+    ('food', 'sw'): (
+        "Kuhusu chakula wakati wa ujauzito:\n\n"
+        "Kula:\n"
+        "• Mboga na matunda\n"
+        "• Protini\n"
+        "• Chakula chenye chuma\n"
+        "• Kalisiamu\n\n"
+        "Epuka:\n"
+        "• Nyama mbichi\n"
+        "• Maziwa yasiyochemshwa\n"
+        "• Samaki wa kina\n\n"
+        "Uliza daktari kuhusu vitamini."
+    ),
+    ('general_health', 'en'): (
+        "For specific health questions, it's best to speak with your healthcare provider.\n\n"
+        "Every pregnancy is different, and your doctor knows your medical history.\n\n"
+        "Don't hesitate to ask questions during your visits."
+    ),
+    ('general_health', 'sw'): (
+        "Kwa maswali ya afya, ni bora kuongea na daktari wako.\n\n"
+        "Kila ujauzito ni tofauti. Daktari wako anajua historia yako ya kiafya.\n\n"
+        "Usisite kuuliza maswali yoyote wakati wa vizio vyako."
+    ),
+    ('appointment_info', 'en'): (
+        "For appointment information:\n\n"
+        "• Dial *123*3# for your appointments\n"
+        "• SMS: APPOINTMENT\n"
+        "• Attend regular clinic visits\n\n"
+        "Appointment reminders sent 1 day before."
+    ),
+    ('appointment_info', 'sw'): (
+        "Kwa habari za miadi:\n\n"
+        "• Piga *123*3# kwa miadi yako\n"
+        "• Tumia SMS: APPOINTMENT\n"
+        "• Tembelea kliniki mara kwa mara\n\n"
+        "Ukumbusho wa miadi utatumwa siku 1 kabla."
+    ),
+    ('default', 'en'): (
+        "Sorry, I didn't quite understand your question.\n\n"
+        "You can:\n"
+        "• Dial *123# for full menu\n"
+        "• SMS: HELP\n"
+        "• Contact your healthcare provider\n\n"
+        "I'm here to help!"
+    ),
+    ('default', 'sw'): (
+        "Samahani, sijaelewi swali lako vizuri.\n\n"
+        "Unaweza:\n"
+        "• Piga *123# kwa menyu kamili\n"
+        "• Tuma SMS: HELP\n"
+        "• Wasiliana na daktari wako\n\n"
+        "Niko hapa kukusaidia!"
+    ),
+
+    ('register_pregnancy', 'en'): "Please register your pregnancy so we can provide appropriate guidance.",
+    ('register_pregnancy', 'sw'): "Tafadhali sajili ujauzito wako ili tupate kutoa ushauri sahihi.",
+}
+
+# Personalised replies keyed by (intent, language)
+_TEMPLATE_TEXTS = {
+    ('greeting', 'en'): (
+        "Hello {name}! 👋\n\n"
+        "Welcome to MAMA-AI. I'm here to support you through your pregnancy journey.\n\n"
+        "Do you have any questions or need assistance?"
+    ),
+    ('greeting', 'sw'): (
+        "Halo {name}! 👋\n\n"
+        "Karibu kwenye MAMA-AI. Niko hapa kukusaidia katika safari yako ya ujauzito.\n\n"
+        "Je, una swali au ungependa msaada wowote?"
+    ),
+}
+
+# Built once at import
+RESPONSES = {key: _entry(text) for key, text in _RESPONSE_TEXTS.items()}
+TEMPLATES = {key: ResponseTemplate(text) for key, text in _TEMPLATE_TEXTS.items()}
+
+# Lets the send path find precomputed metadata for any registry reply
+_ENTRIES_BY_TEXT = {entry.text: entry for entry in RESPONSES.values()}
+
+
+def get_response(intent, lang):
+    """Look up a fixed reply, falling back to English"""
+    entry = RESPONSES.get((intent, lang))
+    if entry is None:
+        entry = RESPONSES[(intent, DEFAULT_LANGUAGE)]
+    return entry
+
+
+def response_text(intent, lang):
+    """Return the text of a fixed reply"""
+    return get_response(intent, lang).text
+
+
+def render_response(intent, lang, **params):
+    """Render a personalised reply, falling back to English"""
+    template = TEMPLATES.get((intent, lang)) or TEMPLATES[(intent, DEFAULT_LANGUAGE)]
+    return template.render(**params)
+
+
+def register_entries(entries):
+    """Make other precomputed replies (e.g. weekly content) known to describe_message"""
+    for entry in entries:
+        _ENTRIES_BY_TEXT.setdefault(entry.text, entry)
+
+
+def describe_message(text):
+    """Return a ResponseEntry for any outgoing text, precomputed when possible"""
+    entry = _ENTRIES_BY_TEXT.get(text)
+    if entry is None:
+        entry = ResponseEntry(text, text.encode('utf-8'), len(text), sms_segments(text))
+    return entry
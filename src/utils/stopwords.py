@@ -0,0 +1,47 @@
+# Bundled stopword sets, so keyword extraction never needs the NLTK corpus.
+# English is NLTK's English list; Kiswahili covers particles, pronouns,
+# possessives, question words and connectives (not symptom words such as
+# "nyingi", which matter for triage).
+
+ENGLISH_STOPWORDS = frozenset((
+    "i", "me", "my", "myself", "we", "our", "ours", "ourselves", "you", "you're", "you've",
+    "you'll", "you'd", "your", "yours", "yourself", "yourselves", "he", "him", "his", "himself",
+    "she", "she's", "her", "hers", "herself", "it", "it's", "its", "itself", "they", "them",
+    "their", "theirs", "themselves", "what", "which", "who", "whom", "this", "that", "that'll",
+    "these", "those", "am", "is", "are", "was", "were", "be", "been", "being", "have", "has",
+    "had", "having", "do", "does", "did", "doing", "a", "an", "the", "and", "but", "if", "or",
+    "because", "as", "until", "while", "of", "at", "by", "for", "with", "about", "against",
+    "between", "into", "through", "during", "before", "after", "above", "below", "to", "from",
+    "up", "down", "in", "out", "on", "off", "over", "under", "again", "further", "then", "once",
+    "here", "there", "when", "where", "why", "how", "all", "any", "both", "each", "few", "more",
+    "most", "other", "some", "such", "no", "nor", "not", "only", "own", "same", "so", "than",
+    "too", "very", "s", "t", "can", "will", "just", "don", "don't", "should", "should've", "now",
+    "d", "ll", "m", "o", "re", "ve", "y", "ain", "aren", "aren't", "couldn", "couldn't", "didn",
+    "didn't", "doesn", "doesn't", "hadn", "hadn't", "hasn", "hasn't", "haven", "haven't", "isn",
+    "isn't", "ma", "mightn", "mightn't", "mustn", "mustn't", "needn", "needn't", "shan",
+    "shan't", "shouldn", "shouldn't", "wasn", "wasn't", "weren", "weren't", "won", "won't",
+    "wouldn", "wouldn't",
+))
+
+SWAHILI_STOPWORDS = frozenset((
+    # particles and connectives
+    "na", "ya", "wa", "za", "la", "cha", "vya", "pa", "kwa", "mwa", "ni", "si", "katika",
+    "kwenye", "kama", "lakini", "au", "ama", "pia", "tu", "sana", "hata", "bado", "tena",
+    "ili", "kwamba", "kisha", "halafu", "je", "ndiyo", "ndio", "hapana", "sio", "siyo",
+    "mpaka", "hadi", "tangu", "baada", "kabla", "pamoja", "bila", "huku", "zaidi", "kila",
+    # demonstratives and place words
+    "hii", "huyu", "hiyo", "hicho", "hilo", "hizi", "hizo", "hao", "hawa", "ile", "yule",
+    "kile", "lile", "wale", "zile", "hapa", "pale", "kule", "humo", "mle", "sasa",
+    # pronouns and possessives
+    "mimi", "wewe", "yeye", "sisi", "nyinyi", "ninyi", "wao", "yangu", "yako", "yake", "yetu",
+    "yenu", "yao", "wangu", "wako", "wake", "wetu", "wenu", "changu", "chako", "chake",
+    "langu", "lako", "lake", "zangu", "zako", "zake", "kwangu", "kwako", "kwake",
+    # question words and quantifiers
+    "nini", "gani", "nani", "wapi", "lini", "vipi", "ngapi", "wote", "yote", "zote", "vyote",
+    "kitu", "fulani",
+))
+
+STOPWORDS = {
+    'en': ENGLISH_STOPWORDS,
+    'sw': SWAHILI_STOPWORDS,
+}
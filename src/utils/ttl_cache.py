@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU mapping bounded by entry count and time-to-live.
+
+    With maxbytes set, entries are also evicted until the sizes reported by
+    sizeof(key, value) fit in the budget. Counters for hits, misses,
+    evictions (dropped for space) and expirations (dropped for age) are
+    kept for monitoring.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic, maxbytes=None,
+                 sizeof=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self._sizeof = sizeof
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Return the cached value and mark it recently used"""
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at, size = item
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[key]
+                self.bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the least recently used entries if full"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+        size = self._sizeof(key, value) if self._sizeof else 0
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+
+        with self._lock:
+            previous = self._data.pop(key, _MISSING)
+            if previous is not _MISSING:
+                self.bytes -= previous[2]
+            self._data[key] = (value, expires_at, size)
+            self.bytes += size
+            while len(self._data) > self.maxsize or (
+                    self.maxbytes is not None and self.bytes > self.maxbytes):
+                _, evicted = self._data.popitem(last=False)
+                self.bytes -= evicted[2]
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """Remove and return an entry"""
+        with self._lock:
+            item = self._data.pop(key, _MISSING)
+            if item is _MISSING:
+                return default
+            self.bytes -= item[2]
+        return item[0]
+
+    def clear(self):
+        """Drop every entry; counters are kept"""
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Return a snapshot of the cache counters"""
+        lookups = self.hits + self.misses
+        stats = {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+        if self.maxbytes is not None:
+            stats["bytes"] = self.bytes
+            stats["maxbytes"] = self.maxbytes
+        return stats
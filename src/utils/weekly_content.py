@@ -0,0 +1,189 @@
+from collections import namedtuple
+from src.utils.response_registry import DEFAULT_LANGUAGE, _entry, register_entries
+
+# One week's content in one language; text, sms and ussd are ResponseEntry tuples
+WeeklyContent = namedtuple('WeeklyContent', ['week', 'lang', 'text', 'sms', 'ussd'])
+
+FIRST_WEEK = 1
+LAST_WEEK = 42
+
+# Africa's Talking shows at most 182 characters, including the "END " prefix
+USSD_MAX_LENGTH = 178
+
+# week: (English, Kiswahili) baby development
+_BABY_DEVELOPMENT = {
+    1: ("Your body is preparing to release an egg.",
+        "Mwili wako unajiandaa kutoa yai."),
+    2: ("Ovulation and conception usually happen this week.",
+        "Kwa kawaida yai hutungwa wiki hii."),
+    3: ("The fertilised egg is dividing and moving to the womb.",
+        "Yai lililotungwa linagawanyika na kuelekea kwenye mji wa mimba."),
+    4: ("The embryo implants in the womb; it is the size of a poppy seed.",
+        "Kiinitete kinajipandikiza kwenye mji wa mimba; ni ukubwa wa mbegu ndogo."),
+    5: ("Baby's heart and brain are starting to form.",
+        "Moyo na ubongo wa mtoto vinaanza kuumbika."),
+    6: ("Baby's heart begins to beat.",
+        "Moyo wa mtoto unaanza kupiga."),
+    7: ("Arms and legs are budding; baby is the size of a bean.",
+        "Mikono na miguu inachipuka; mtoto ni ukubwa wa haragwe."),
+    8: ("Fingers and toes are forming.",
+        "Vidole vya mikono na miguu vinaumbika."),
+    9: ("All major organs have begun to form.",
+        "Viungo vyote vikuu vimeanza kuumbika."),
+    10: ("Baby is now called a fetus and is about 3 cm long.",
+         "Mtoto sasa anaitwa kijusi na ana urefu wa sentimita 3 hivi."),
+    11: ("Baby can open and close the fists.",
+         "Mtoto anaweza kukunja na kukunjua ngumi."),
+    12: ("Baby's kidneys start making urine.",
+         "Figo za mtoto zinaanza kutengeneza mkojo."),
+    13: ("Baby's fingerprints are forming.",
+         "Alama za vidole za mtoto zinaumbika."),
+    14: ("Baby can squint and frown.",
+         "Mtoto anaweza kukodoa macho na kukunja uso."),
+    15: ("Baby's bones are getting harder.",
+         "Mifupa ya mtoto inazidi kuwa migumu."),
+    16: ("Baby is about 12 cm long, the size of an avocado.",
+         "Mtoto ana urefu wa sentimita 12 hivi, ukubwa wa parachichi."),
+    17: ("Baby is building fat under the skin.",
+         "Mtoto anaanza kuweka mafuta chini ya ngozi."),
+    18: ("Baby can hear sounds from outside.",
+         "Mtoto anaweza kusikia sauti za nje."),
+    19: ("A protective coating covers baby's skin.",
+         "Ngozi ya mtoto inafunikwa na utando wa kuikinga."),
+    20: ("Halfway there! You may feel baby move.",
+         "Nusu ya safari! Unaweza kuhisi mtoto akicheza."),
+    21: ("Baby swallows fluid and practises digestion.",
+         "Mtoto anameza maji na kujifunza kusaga chakula."),
+    22: ("Baby's senses of touch and taste are developing.",
+         "Hisia za kugusa na kuonja za mtoto zinakua."),
+    23: ("Baby's lungs are preparing to breathe.",
+         "Mapafu ya mtoto yanajiandaa kupumua."),
+    24: ("Baby weighs about 600 g, the size of a maize cob.",
+         "Mtoto ana uzito wa gramu 600 hivi, ukubwa wa hindi."),
+    25: ("Baby responds to your voice.",
+         "Mtoto anaitikia sauti yako."),
+    26: ("Baby's eyes begin to open.",
+         "Macho ya mtoto yanaanza kufunguka."),
+    27: ("Baby sleeps and wakes at regular times.",
+         "Mtoto analala na kuamka kwa nyakati za kawaida."),
+    28: ("Baby can blink and is gaining weight fast.",
+         "Mtoto anaweza kupepesa macho na anaongezeka uzito haraka."),
+    29: ("Baby's kicks are stronger now.",
+         "Mateke ya mtoto sasa yana nguvu zaidi."),
+    30: ("Baby's brain is growing quickly.",
+         "Ubongo wa mtoto unakua haraka."),
+    31: ("Baby can turn the head from side to side.",
+         "Mtoto anaweza kugeuza kichwa upande hadi upande."),
+    32: ("Baby is practising breathing movements.",
+         "Mtoto anajizoeza kupumua."),
+    33: ("Baby's bones are hardening, except the skull.",
+         "Mifupa ya mtoto inakuwa migumu, isipokuwa fuvu."),
+    34: ("Baby's lungs are nearly mature.",
+         "Mapafu ya mtoto yanakaribia kukomaa."),
+    35: ("Baby weighs about 2.4 kg.",
+         "Mtoto ana uzito wa kilo 2.4 hivi."),
+    36: ("Baby is turning head-down for birth.",
+         "Mtoto anageuka kichwa chini kujiandaa kuzaliwa."),
+    37: ("Baby is early term and could arrive any day.",
+         "Mtoto amefikia muda na anaweza kuzaliwa siku yoyote."),
+    38: ("Baby's organs are ready for life outside.",
+         "Viungo vya mtoto viko tayari kwa maisha nje."),
+    39: ("Baby is full term, about 3.3 kg.",
+         "Mtoto amekamilika, uzito wa kilo 3.3 hivi."),
+    40: ("This is your due date week.",
+         "Hii ni wiki ya tarehe yako ya kujifungua."),
+    41: ("Baby is past the due date.",
+         "Mtoto amepita tarehe ya kujifungua."),
+    42: ("Baby is well past the due date.",
+         "Mtoto amepita sana tarehe ya kujifungua."),
+}
+
+# (first week, last week, English, Kiswahili) advice
+_WEEKLY_TIPS = (
+    (1, 4, "Take folic acid daily and avoid alcohol and smoking.",
+     "Tumia folic acid kila siku na epuka pombe na sigara."),
+    (5, 8, "Book your first antenatal clinic visit.",
+     "Panga ziara yako ya kwanza ya kliniki ya ujauzito."),
+    (9, 13, "Eat small frequent meals if you feel sick.",
+     "Kula milo midogo mara kwa mara ukihisi kichefuchefu."),
+    (14, 19, "Take your iron tablets and eat beans and greens.",
+     "Tumia vidonge vya madini ya chuma, kula maharagwe na mboga za majani."),
+    (20, 27, "Sleep on your side and drink plenty of water.",
+     "Lala kwa upande na kunywa maji mengi."),
+    (28, 31, "Count baby kicks daily: 10 in 2 hours is normal.",
+     "Hesabu mateke ya mtoto kila siku: 10 ndani ya saa 2 ni kawaida."),
+    (32, 36, "Plan where you will give birth and pack a bag.",
+     "Panga mahali utakapojifungulia na uandae begi."),
+    (37, 40, "Go to hospital if your waters break or contractions are regular.",
+     "Enda hospitali maji yakivunjika au uchungu ukija kwa mpangilio."),
+    (41, 42, "Visit your clinic now; labour may need to be induced.",
+     "Tembelea kliniki sasa; huenda ukahitaji kusaidiwa kujifungua."),
+)
+
+# (last week, English, Kiswahili, emoji)
+_TRIMESTERS = (
+    (13, "First Trimester", "Miezi Mitatu ya Kwanza", "🌱"),
+    (27, "Second Trimester", "Miezi Mitatu ya Pili", "🤗"),
+    (LAST_WEEK, "Third Trimester", "Miezi Mitatu ya Tatu", "🤰"),
+)
+
+_LABELS = {
+    'en': {'week': "Week {week}", 'baby': "This week", 'tip': "Tip"},
+    'sw': {'week': "Wiki ya {week}", 'baby': "Wiki hii", 'tip': "Ushauri"},
+}
+_LANGUAGES = ('en', 'sw')
+
+
+def _tip(week, index):
+    for first_week, last_week, *tips in _WEEKLY_TIPS:
+        if first_week <= week <= last_week:
+            return tips[index]
+
+
+def _trimester(week, index):
+    for last_week, *names in _TRIMESTERS:
+        if week <= last_week:
+            return names[index], names[2]
+
+
+def _build(week, lang):
+    index = _LANGUAGES.index(lang)
+    labels = _LABELS[lang]
+    heading = labels['week'].format(week=week)
+    baby = _BABY_DEVELOPMENT[week][index]
+    tip = _tip(week, index)
+    trimester, emoji = _trimester(week, index)
+
+    text = f"{heading} - {trimester} {emoji}\n\n{labels['baby']}: {baby}\n\n{labels['tip']}: {tip}"
+    ussd = f"{heading}: {baby}\n{labels['tip']}: {tip}"
+    sms = f"MAMA-AI {heading}: {baby} {labels['tip']}: {tip}"
+
+    # The short variants must fit one USSD screen and one GSM-7 SMS part
+    if len(ussd) > USSD_MAX_LENGTH:
+        ussd = f"{heading}: {baby}"
+    sms_entry = _entry(sms)
+    if sms_entry.segments > 1:
+        sms_entry = _entry(f"MAMA-AI {heading}: {baby}")
+
+    return WeeklyContent(week, lang, _entry(text), sms_entry, _entry(ussd))
+
+
+# Built once at import: 42 weeks x 2 languages
+WEEKLY_CONTENT = {
+    (week, lang): _build(week, lang)
+    for week in range(FIRST_WEEK, LAST_WEEK + 1)
+    for lang in _LANGUAGES
+}
+register_entries(
+    entry for content in WEEKLY_CONTENT.values()
+    for entry in (content.text, content.sms, content.ussd)
+)
+
+
+def weekly_content(week, lang=DEFAULT_LANGUAGE):
+    """Content for a gestational week, clamped to 1-42, falling back to English"""
+    week = min(max(int(week), FIRST_WEEK), LAST_WEEK)
+    content = WEEKLY_CONTENT.get((week, lang))
+    if content is None:
+        content = WEEKLY_CONTENT[(week, DEFAULT_LANGUAGE)]
+    return content
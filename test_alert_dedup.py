@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Alert De-duplication Tests for MAMA-AI
+Checks that repeat alerts of one type inside a user's window update one row,
+that more severe repeats escalate it and that the emergency contact is texted
+once per window.
+"""
+
+import pytest
+from src.models import db, User, EmergencyAlert
+from src.services import alert_service, emergency_ingress
+from src.services.ai_service import AIService
+from src.services.sms_service import SMSService
+from src.services.ussd_service import USSDService
+from src.utils.ttl_cache import TTLCache
+
+
+pytestmark = pytest.mark.usefixtures('journals')
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(alert_service, '_open_alerts', TTLCache(maxsize=100, ttl=600, clock=clock))
+    return clock
+
+
+@pytest.fixture
+def user(app):
+    user = User(phone_number='+254700000001', preferred_language='en',
+                emergency_contact='+254700000002')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_repeats_inside_window_update_one_alert_per_type(user, clock):
+    service = AIService()
+    for text in ["bleeding", "bleeding", "bleeding", "severe bleeding", "bleeding"]:
+        clock.now += 20
+        service.analyze_symptoms(text, user)
+    alert_service.get_alert_journal().flush()
+
+    alerts = {alert.alert_type: alert for alert in EmergencyAlert.query.all()}
+    assert alerts['high_risk_symptoms'].occurrences == 4
+    assert alerts['high_risk_symptoms'].last_seen_at > alerts['high_risk_symptoms'].created_at
+    # The emergency-tier report opens its own alert instead of folding into the high-risk one
+    assert alerts['severe_symptoms'].occurrences == 1
+    assert alerts['severe_symptoms'].severity_score == 9
+
+
+def test_window_expiry_opens_a_new_alert(user, clock):
+    service = AIService()
+    service.analyze_symptoms("bleeding", user)
+    alert_service.get_alert_journal().flush()
+    clock.now += 601
+    service.analyze_symptoms("bleeding", user)
+    alert_service.get_alert_journal().flush()
+
+    assert [alert.occurrences for alert in EmergencyAlert.query.all()] == [1, 1]
+
+
+def test_replaying_repeats_does_not_inflate_counts(user):
+    service = AIService()
+    for _ in range(3):
+        service.analyze_symptoms("bleeding", user)
+    records, _ = alert_service.get_alert_journal().pending()
+
+    alert_service.persist_alerts(records)
+    alert_service.persist_alerts(records)
+
+    assert EmergencyAlert.query.one().occurrences == 3
+
+
+def test_repeated_ussd_emergency_hops_text_the_contact_once(user, clock, monkeypatch):
+    sent = []
+    monkeypatch.setattr(SMSService, 'send_sms', lambda self, phone, message: sent.append(phone))
+    ussd = USSDService()
+
+    for session in range(4):
+        clock.now += 30
+        ussd.handle_request(f's{session}', '0700000001', '4', '*384#')
+    emergency_ingress.get_ingress_journal().flush()
+    alert_service.get_alert_journal().flush()
+
+    assert sent == ['+254700000002']
+    assert EmergencyAlert.query.one().occurrences == 4
+
+
+def test_earlier_alert_of_another_type_does_not_hide_emergency(user, monkeypatch):
+    sent = []
+    monkeypatch.setattr(SMSService, 'send_sms', lambda self, phone, message: sent.append(phone))
+    AIService().analyze_symptoms("bleeding", user)
+
+    USSDService().handle_request('s1', '0700000001', '4', '*384#')
+    emergency_ingress.get_ingress_journal().flush()
+    alert_service.get_alert_journal().flush()
+
+    assert sent == ['+254700000002']
+    assert sorted(alert.alert_type for alert in EmergencyAlert.query.all()) == \
+        ['high_risk_symptoms', 'ussd_emergency']
+
+
+def test_more_severe_repeat_escalates_the_open_alert(user):
+    service = AIService()
+    first = service._record_alert("bleeding", user, None, 'high_risk_symptoms', 'urgent_care_advised')
+    same = service._record_alert("bleeding", user, None, 'high_risk_symptoms', 'urgent_care_advised')
+    worse = service._record_alert("severe bleeding and dizziness", user, None,
+                                  'high_risk_symptoms', 'urgent_care_advised')
+    alert_service.get_alert_journal().flush()
+
+    assert (first.is_new, same.is_new, worse.is_new) == (True, False, True)
+    alert = EmergencyAlert.query.one()
+    assert alert.symptoms_reported == "severe bleeding and dizziness"
+    assert 'dizzy_with_bleeding' in alert.severity_features
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Alert Journal Tests for MAMA-AI
+Checks that journalled emergency alerts survive a process killed mid-flush
+and reach the database exactly once.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+import pytest
+from src.models import db, EmergencyAlert
+from src.services.alert_service import persist_alerts
+from src.utils.journal import WriteBehindJournal
+
+ALERTS = 20
+
+# Journals ALERTS alerts, then dies with SIGKILL inside the flush
+CRASHING_FLUSH = """
+import os, signal, sys
+from datetime import datetime
+from flask import Flask
+from sqlalchemy import insert
+from src.models import db, EmergencyAlert
+from src.services.alert_service import persist_alerts
+from src.utils.journal import WriteBehindJournal
+
+database, journal_path, stage, count = sys.argv[1:5]
+
+def crashing_sink(records):
+    if stage == 'before_commit':
+        rows = [dict(r, created_at=datetime.fromisoformat(r['created_at'])) for r in records]
+        db.session.execute(insert(EmergencyAlert), rows[:len(rows) // 2])
+        db.session.flush()
+    else:
+        persist_alerts(records)
+    os.kill(os.getpid(), signal.SIGKILL)
+
+app = Flask(__name__)
+app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + database
+db.init_app(app)
+with app.app_context():
+    db.create_all()
+    journal = WriteBehindJournal(journal_path, crashing_sink)
+    for i in range(int(count)):
+        journal.append({
+            'user_id': 1, 'alert_type': 'severe_symptoms', 'symptoms_reported': f'bleeding {i}',
+            'severity_score': 9, 'action_taken': 'emergency_response_sent',
+            'created_at': datetime.utcnow().isoformat(),
+        })
+    journal.flush()
+"""
+
+
+def _record(i):
+    return {'user_id': 1, 'alert_type': 'severe_symptoms', 'symptoms_reported': f'bleeding {i}',
+            'severity_score': 9, 'action_taken': 'emergency_response_sent',
+            'created_at': '2025-01-01T08:00:00'}
+
+
+def test_flush_drains_and_truncates_the_journal(app, tmp_path):
+    journal = WriteBehindJournal(str(tmp_path / 'alerts.jsonl'), persist_alerts)
+    for i in range(3):
+        journal.append(_record(i))
+
+    assert journal.flush() == 3
+    assert EmergencyAlert.query.count() == 3
+    assert os.path.getsize(journal.path) == 0
+    assert journal.flush() == 0
+
+
+def test_torn_line_does_not_swallow_next_record(app, tmp_path):
+    journal = WriteBehindJournal(str(tmp_path / 'alerts.jsonl'), persist_alerts)
+    with open(journal.path, 'wb') as handle:
+        handle.write(b'{"journal_id": "torn", "user')
+    journal.append(_record(1))
+
+    assert journal.flush() == 1
+    assert EmergencyAlert.query.one().symptoms_reported == 'bleeding 1'
+
+
+@pytest.mark.parametrize('stage', ['before_commit', 'after_commit'])
+def test_killed_mid_flush_loses_and_duplicates_nothing(app, tmp_path, stage):
+    database = db.engine.url.database
+    journal_path = str(tmp_path / 'alerts.jsonl')
+    root = os.path.dirname(os.path.abspath(__file__))
+
+    result = subprocess.run(
+        [sys.executable, '-c', CRASHING_FLUSH, str(database), journal_path, stage, str(ALERTS)],
+        cwd=root, env=dict(os.environ, PYTHONPATH=root), capture_output=True,
+    )
+    assert result.returncode == -9, result.stderr.decode()
+
+    db.session.remove()
+    expected_before_replay = ALERTS if stage == 'after_commit' else 0
+    assert EmergencyAlert.query.count() == expected_before_replay
+
+    # Restart: replay whatever the checkpoint does not cover
+    WriteBehindJournal(journal_path, persist_alerts).flush()
+
+    alerts = EmergencyAlert.query.all()
+    assert len(alerts) == ALERTS
+    assert len({alert.journal_id for alert in alerts}) == ALERTS
+    assert sorted(alert.symptoms_reported for alert in alerts) == sorted(
+        f'bleeding {i}' for i in range(ALERTS)
+    )
+
+
+class FlakySink:
+    """Stores records, failing on poison ones or on everything while down"""
+
+    def __init__(self, down=False):
+        self.down = down
+        self.stored = []
+
+    def __call__(self, records):
+        if self.down:
+            raise ConnectionError("database is down")
+        if any(record.get('poison') for record in records):
+            raise ValueError("bad record")
+        self.stored.extend(record['n'] for record in records)
+
+
+def _dead_letters(journal):
+    with open(journal.dead_letter_path) as handle:
+        return [json.loads(line) for line in handle]
+
+
+def test_poison_record_is_dead_lettered_and_the_rest_flow(tmp_path):
+    sink = FlakySink()
+    journal = WriteBehindJournal(str(tmp_path / 'j.jsonl'), sink)
+    for n in range(3):
+        journal.append({'n': n, 'poison': n == 1})
+
+    assert journal.flush() == 3
+    assert sink.stored == [0, 2]
+    assert [entry['n'] for entry in _dead_letters(journal)] == [1]
+    assert journal.stats()['dead_lettered'] == 1
+    assert journal.pending()[0] == []
+
+
+def test_outage_keeps_records_until_attempts_run_out(tmp_path):
+    sink = FlakySink(down=True)
+    journal = WriteBehindJournal(str(tmp_path / 'j.jsonl'), sink, max_attempts=3)
+    journal.append({'n': 0})
+    journal.append({'n': 1})
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            journal.flush()
+    assert len(journal.pending()[0]) == 2
+
+    sink.down = False
+    assert journal.flush() == 2
+    assert sink.stored == [0, 1]
+    assert not os.path.exists(journal.dead_letter_path)
+
+
+def test_corrupt_lines_are_counted_and_kept(tmp_path):
+    sink = FlakySink()
+    journal = WriteBehindJournal(str(tmp_path / 'j.jsonl'), sink)
+    journal.append({'n': 0})
+    with open(journal.path, 'ab') as handle:
+        handle.write(b'{"n": \n')
+    journal.append({'n': 1})
+
+    assert journal.flush() == 2
+    assert sink.stored == [0, 1]
+    assert journal.stats()['skipped_lines'] == 1
+    assert _dead_letters(journal)[0]['corrupt_line'] == '{"n": '
+
+
+def test_flusher_starts_while_the_store_is_down_and_replays_later(tmp_path):
+    sink = FlakySink(down=True)
+    journal = WriteBehindJournal(str(tmp_path / 'j.jsonl'), sink, max_attempts=1000)
+    journal.append({'n': 0})
+
+    journal.start(interval=0.01)
+    time.sleep(0.05)
+    sink.down = False
+    journal.stop()
+
+    assert sink.stored == [0]
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Classification Backfill Tests for MAMA-AI
+Runs classify_batch and the MessageLog backfill against a throwaway SQLite database.
+"""
+
+import pytest
+from src.models import db, MessageLog
+from src.services.ai_service import AIService
+from src.jobs.backfill_labels import backfill_message_labels
+
+
+def test_classify_batch_returns_labels_only():
+    results = AIService().classify_batch(["hi", "heavy bleeding", "nina uchovu"])
+
+    assert results[0].intent == 'greeting'
+    assert results[1].intent == 'symptoms'
+    assert results[1].tier == 'emergency'
+    assert 'heavy bleeding' in results[1].keywords
+    assert results[2].tier == 'fatigue'
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_backfill_labels_incoming_rows_in_chunks(app, workers):
+    texts = ["help", "I have back pain", "hello mama", "2*1*severe headache"]
+    for i in range(25):
+        text = texts[i % len(texts)]
+        db.session.add(MessageLog(phone_number='+254700000001',
+                                  message_type='USSD' if '*' in text else 'SMS',
+                                  direction='incoming', content=text))
+    db.session.add(MessageLog(phone_number='+254700000001', message_type='SMS',
+                              direction='outgoing', content='help'))
+    db.session.commit()
+
+    labelled = backfill_message_labels(chunk_size=4, workers=workers)
+
+    assert labelled == 25
+    rows = MessageLog.query.order_by(MessageLog.id).all()
+    assert rows[0].intent == 'help'
+    assert rows[1].triage_tier == 'back_pain'
+    assert rows[3].triage_tier == 'emergency'
+    assert rows[-1].intent is None
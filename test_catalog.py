@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Message Catalog Tests for MAMA-AI
+Checks template parsing, strict key/parameter checks and that appointment
+messages arrive with their placeholders filled in every language.
+"""
+
+from datetime import datetime, timedelta
+import pytest
+from src.models import db, User, Appointment
+from src.services.sms_service import SMSService
+from src.utils.catalog import Catalog, CatalogError, Template, get_catalog, render
+from src.utils.lexicon_bundle import LexiconError, load_source, validate_bundle
+
+
+def test_template_is_parsed_once_into_pieces():
+    template = Template('greet', "Hi {name}, see you on {date}.")
+
+    assert template.fields == {'name', 'date'}
+    assert template.render({'name': 'Amina', 'date': 'Monday'}) == "Hi Amina, see you on Monday."
+    assert Template('plain', "No braces").render({}) == "No braces"
+
+
+def test_render_is_strict_about_keys_and_parameters():
+    with pytest.raises(CatalogError, match='unknown message key'):
+        render('en', 'no_such_message')
+    with pytest.raises(CatalogError, match='missing parameters location'):
+        render('sw', 'next_appointment', date='2026-11-02 09:00', type='scan')
+
+
+def test_swahili_placeholders_are_filled():
+    text = render('sw', 'next_appointment', date='2026-11-02 09:00', type='scan', location='Kliniki ya Kibera')
+
+    assert '{' not in text
+    assert text.startswith("Miadi yako ijayo:\n📅 2026-11-02 09:00\n🏥 scan\n📍 Kliniki ya Kibera")
+
+
+def test_missing_translations_and_languages_fall_back_to_english():
+    catalog = Catalog({'en': {'hello': "Hello {name}", 'bye': "Bye"}, 'sw': {'hello': "Habari {name}"}})
+
+    assert catalog.render('sw', 'hello', name='Amina') == "Habari Amina"
+    assert catalog.render('sw', 'bye') == "Bye"
+    assert catalog.render('luo', 'hello', name='Amina') == "Hello Amina"
+
+
+def test_languages_and_messages_are_parsed_on_first_use():
+    catalog = Catalog({'en': {'hello': "Hello", 'bye': "Bye"}, 'sw': {'hello': "Habari"}}, check=False)
+    assert catalog.loaded_languages() == ()
+
+    assert catalog.render('en', 'hello') == "Hello"
+    assert catalog.loaded_languages() == ('en',)
+    assert catalog.template('en', 'hello') is catalog.template('en', 'hello')
+
+    assert catalog.render('sw', 'hello') == "Habari"
+    assert catalog.loaded_languages() == ('en', 'sw')
+
+
+def test_bundles_with_mismatched_placeholders_are_rejected():
+    with pytest.raises(CatalogError, match='placeholders differ'):
+        Catalog({'en': {'hello': "Hello {name}"}, 'sw': {'hello': "Habari {jina}"}})
+    with pytest.raises(CatalogError, match='keys missing from en'):
+        Catalog({'en': {}, 'sw': {'hello': "Habari"}})
+
+    bundle = load_source()
+    bundle['translations']['sw']['next_appointment'] = "Miadi yako: {tarehe}"
+    with pytest.raises(LexiconError, match='placeholders differ'):
+        validate_bundle(bundle)
+
+
+def test_catalog_covers_the_bundled_translations():
+    catalog = get_catalog()
+
+    assert set(catalog.languages) == set(load_source()['translations'])
+    assert catalog.template('sw', 'main_menu').text.startswith("Karibu MAMA-AI")
+
+
+def test_swahili_appointment_query_fills_the_template(app):
+    user = User(phone_number='+254700000001', preferred_language='sw')
+    db.session.add(user)
+    db.session.commit()
+    db.session.add(Appointment(user_id=user.id, appointment_date=datetime.utcnow() + timedelta(days=3),
+                               appointment_type='scan'))
+    db.session.commit()
+
+    message = SMSService()._handle_appointment_request(user)
+
+    assert '{' not in message
+    assert "🏥 scan\n📍 Wasiliana na kliniki kujua mahali" in message
+
+
+def test_reminders_keep_the_at_time_format(app, monkeypatch):
+    sent = []
+    monkeypatch.setattr(SMSService, 'send_sms', lambda self, phone, message: sent.append(message) or {'ok': True})
+    user = User(phone_number='+254700000001', preferred_language='en', is_active=True)
+    db.session.add(user)
+    db.session.commit()
+    when = (datetime.utcnow() + timedelta(hours=24, minutes=30)).replace(second=0, microsecond=0)
+    db.session.add(Appointment(user_id=user.id, appointment_date=when, appointment_type='scan',
+                               status='scheduled', reminder_sent=False))
+    db.session.commit()
+
+    SMSService().send_appointment_reminders()
+
+    assert when.strftime('%Y-%m-%d at %H:%M') in sent[0]
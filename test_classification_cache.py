@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Classification Cache Tests for MAMA-AI
+Checks LRU/TTL bounds, counters and invalidation of cached keyword analysis.
+"""
+
+from src.utils.ttl_cache import TTLCache
+from src.services import ai_service
+from src.services.ai_service import analyze_message, reset_matchers, classification_cache_stats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_counters():
+    cache = TTLCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1      # 'b' is now least recently used
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.set('hi', 'greeting')
+
+    clock.now = 59
+    assert cache.get('hi') == 'greeting'
+    clock.now = 61
+    assert cache.get('hi') is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_normalized_text_shares_one_entry():
+    reset_matchers()
+    first = analyze_message("  HI  there ")
+    second = analyze_message("hi there")
+
+    assert first is second
+    assert classification_cache_stats()['size'] == 1
+
+
+def test_reset_matchers_invalidates_cache():
+    analyze_message("severe bleeding")
+    reset_matchers()
+
+    assert classification_cache_stats()['size'] == 0
+    assert ai_service._triage_matcher is None
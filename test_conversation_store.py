@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Conversation Store Tests for MAMA-AI
+Checks that /chat context comes from per-user ring buffers, is loaded from
+message_logs only on a miss, and is not read at all without a model.
+"""
+
+import pytest
+from src.models import db, User, MessageLog
+from src.services.ai_service import AIService, get_conversation_store, reset_conversation_store
+from src.services.llm_backend import LLMBackend, LLMGateway, set_llm_gateway
+from src.utils.conversation_store import ConversationStore
+from src.utils.response_cache import reset_response_cache
+
+
+class RecordingBackend(LLMBackend):
+    name = 'recording'
+
+    def __init__(self):
+        self.histories = []
+
+    def complete(self, prompt, system=None, history=()):
+        self.histories.append(history)
+        return f"model: {prompt}"
+
+
+@pytest.fixture(autouse=True)
+def fresh_store():
+    reset_conversation_store()
+    yield
+    reset_conversation_store()
+
+
+@pytest.fixture
+def backend():
+    backend = RecordingBackend()
+    set_llm_gateway(LLMGateway(backend))
+    reset_response_cache()
+    yield backend
+    set_llm_gateway(None)
+    reset_response_cache()
+
+
+@pytest.fixture
+def user(app):
+    user = User(phone_number='+254700000001', preferred_language='en')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_chat_sends_recent_turns_from_message_logs(user, backend):
+    service = AIService()
+    service.chat_with_ai("what fruit is good?", user)
+    service.chat_with_ai("and vegetables?", user)
+
+    assert backend.histories[0] == ()
+    assert backend.histories[1] == (
+        ('user', "what fruit is good?"), ('assistant', "model: what fruit is good?")
+    )
+    assert MessageLog.query.count() == 4
+
+
+def test_buffered_turns_are_read_without_a_query(user, backend):
+    service = AIService()
+    service.chat_with_ai("what fruit is good?", user)
+
+    def fail(*args):
+        raise AssertionError("message_logs read for a buffered user")
+    get_conversation_store().loader = fail
+    service.chat_with_ai("and vegetables?", user)
+    service.chat_with_ai("and milk?", user)
+
+    assert get_conversation_store().stats()['loads'] == 1
+    assert [content for _, content in backend.histories[2]][-2:] == ["and vegetables?", "model: and vegetables?"]
+
+
+def test_least_recently_active_users_are_evicted():
+    loaded = []
+
+    def loader(key, limit):
+        loaded.append(key)
+        return []
+    store = ConversationStore(loader, max_turns=2, max_users=2)
+    for key in ('a', 'b'):
+        store.history(key)
+        store.append(key, 'user', f"hi from {key}")
+    store.history('c')
+
+    assert [content for _, content, _ in store.history('b')] == ["hi from b"]
+    assert store.history('a') == []
+    assert loaded == ['a', 'b', 'c', 'a']
+
+
+def test_turns_logged_by_another_worker_are_seen(user, backend):
+    # Another worker answered the previous message; this process never saw it
+    db.session.add(MessageLog(phone_number=user.phone_number, message_type='CHAT',
+                              direction='incoming', content="what fruit is good?"))
+    db.session.add(MessageLog(phone_number=user.phone_number, message_type='CHAT',
+                              direction='outgoing', content="Mangoes and oranges"))
+    db.session.add(MessageLog(phone_number=user.phone_number, message_type='SMS',
+                              direction='incoming', content="STOP"))
+    db.session.commit()
+
+    AIService().chat_with_ai("and vegetables?", user)
+
+    assert backend.histories[0] == (('user', "what fruit is good?"), ('assistant', "Mangoes and oranges"))
+
+
+def test_history_is_capped_at_max_turns(user, backend):
+    get_conversation_store().max_turns = 3
+    service = AIService()
+    for question in ("one?", "two?", "three?"):
+        service.chat_with_ai(question, user)
+
+    assert [content for _, content in backend.histories[2]] == ["model: one?", "two?", "model: two?"]
+
+
+def test_nothing_is_read_without_a_model(user):
+    set_llm_gateway(None)
+
+    def fail(*args):
+        raise AssertionError("message_logs read with no model configured")
+    get_conversation_store().loader = fail
+
+    assert AIService().chat_with_ai("what fruit is good?", user)
+    assert get_conversation_store().stats()['loads'] == 0
+
+
+def test_client_history_is_used_only_when_nothing_is_logged(user, backend):
+    client_history = [{'type': 'user', 'message': "hi"}, {'type': 'ai', 'message': "Hello mama"}]
+    service = AIService()
+
+    service.chat_with_ai("what fruit is good?", user, client_history)
+    service.chat_with_ai("and vegetables?", user, client_history)
+
+    assert backend.histories[0] == (('user', "hi"), ('assistant', "Hello mama"))
+    assert backend.histories[1][0] == ('user', "what fruit is good?")
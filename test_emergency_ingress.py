@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Emergency Ingress Tests for MAMA-AI
+Checks that emergencies are answered before any database work and that the
+journalled logs, user and alert are applied afterwards.
+"""
+
+import pytest
+from flask import Flask
+from src.models import db, User, MessageLog, EmergencyAlert
+from src.services import alert_service, emergency_ingress
+from src.services.container import reset_services
+from src.services.sms_service import SMSService
+from src.services.ussd_service import USSDService
+from src.utils.catalog import render
+from src.utils.language_utils import is_emergency_message
+from src.utils.response_registry import response_text
+
+
+class FakeSender:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message, recipients, sender_id=None):
+        self.sent.append((recipients[0], message))
+        return {'SMSMessageData': {'Recipients': []}}
+
+
+@pytest.fixture(autouse=True)
+def fresh_services(journals):
+    reset_services()
+    yield
+    reset_services()
+
+
+@pytest.fixture
+def broken_db(tmp_path):
+    # The directory does not exist, so every connection attempt fails
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'missing' / 'ingress.db'}"
+    db.init_app(app)
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+def test_screen_matches_whole_emergency_words_only():
+    assert is_emergency_message("Nina  DAMU NYINGI tangu asubuhi")
+    assert is_emergency_message("I have severe bleeding")
+    assert not is_emergency_message("help")
+    assert not is_emergency_message("Can I send a photo of my scan?")
+    assert not is_emergency_message("")
+
+
+@pytest.mark.parametrize('text', ["Is hot tea safe in pregnancy?", "Nimenunua miwani mpya",
+                                  "I had a fever last week"])
+def test_single_red_flag_words_take_the_normal_path(app, text):
+    sms = SMSService()
+    sms.sms = FakeSender()
+
+    result = sms.handle_incoming_sms('+254700000001', '985', text, None)
+
+    assert 'emergency' not in result
+    assert emergency_ingress.get_ingress_journal().pending()[0] == []
+
+
+def test_stop_is_handled_before_the_screen(app):
+    db.session.add(User(phone_number='+254700000001', preferred_language='en', is_active=True))
+    db.session.commit()
+    sms = SMSService()
+    sms.sms = FakeSender()
+
+    result = sms.handle_incoming_sms('+254700000001', '985', "Stop sending messages, the severe bleeding stopped", None)
+
+    assert 'emergency' not in result
+    assert not User.query.filter_by(phone_number='+254700000001').one().is_active
+
+
+def test_ussd_emergency_is_answered_without_the_database(broken_db):
+    ussd = USSDService()
+
+    assert ussd.handle_request('s1', '0700000001', '4', '*384#').startswith('END ')
+    assert ussd.handle_request('s2', '0700000001', '2*1*severe bleeding', '*384#') == \
+        f"END {response_text('emergency_symptoms', 'en')}"
+
+    records, _ = emergency_ingress.get_ingress_journal().pending()
+    assert [record['kind'] for record in records] == ['ussd_menu', 'ussd_symptoms']
+    assert records[1]['phone_number'] == '+254700000001'
+
+
+def test_sms_emergency_is_sent_without_the_database(broken_db):
+    sms = SMSService()
+    sms.sms = FakeSender()
+
+    result = sms.handle_incoming_sms('+254700000001', '985', "Maji yamevunjika na damu nyingi", None)
+
+    assert result == {"status": "processed", "response_sent": True, "emergency": True}
+    assert sms.sms.sent == [('+254700000001', response_text('emergency_symptoms', 'sw'))]
+
+
+def test_known_users_are_answered_in_their_language(app):
+    db.session.add(User(phone_number='+254700000001', preferred_language='sw'))
+    db.session.commit()
+    ussd = USSDService()
+    ussd._get_or_create_user('+254700000001')
+
+    assert ussd.handle_request('s1', '0700000001', '2*1*severe bleeding', '*384#') == \
+        f"END {response_text('emergency_symptoms', 'sw')}"
+
+
+def test_reply_language_never_reads_the_database(app):
+    db.session.add(User(phone_number='+254700000001', preferred_language='sw'))
+    db.session.commit()
+    ussd = USSDService()
+
+    # This worker has not seen the user, so the stored preference is not used yet
+    assert ussd.handle_request('s1', '0700000001', '4', '*384#') == \
+        f"END {render('en', 'emergency_response')}"
+    assert emergency_ingress.reply_language('+254700000002', "Nina damu nyingi sana") == 'sw'
+
+    # Opening the menu, or applying the journal, loads the user
+    ussd.handle_request('s2', '0700000001', '', '*384#')
+    assert ussd.handle_request('s2', '0700000001', '4', '*384#') == \
+        f"END {render('sw', 'emergency_response')}"
+
+
+def test_flush_and_replay_log_once_and_text_the_contact_once(app, monkeypatch):
+    sent = []
+    monkeypatch.setattr(SMSService, 'send_sms', lambda self, phone, message: sent.append(phone))
+    db.session.add(User(phone_number='+254700000001', preferred_language='en',
+                        emergency_contact='+254700000002'))
+    db.session.commit()
+    ussd = USSDService()
+    ussd.handle_request('s1', '0700000001', '4', '*384#')
+    ussd.handle_request('s2', '0700000003', '1*1*severe bleeding', '*384#')
+
+    journal = emergency_ingress.get_ingress_journal()
+    records, _ = journal.pending()
+    journal.flush()
+    emergency_ingress.persist_ingress(records)    # a replay after a crash
+    alert_service.get_alert_journal().flush()
+
+    assert sent == ['+254700000002']
+    assert User.query.filter_by(phone_number='+254700000003').count() == 1
+    assert MessageLog.query.count() == 4
+    assert sorted((alert.alert_type, alert.occurrences) for alert in EmergencyAlert.query.all()) == \
+        [('severe_symptoms', 1), ('ussd_emergency', 1)]
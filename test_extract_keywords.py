@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Keyword Extraction Tests for MAMA-AI
+Checks the bundled stopwords and regex tokenizer, and that NLTK stays unloaded.
+"""
+
+import subprocess
+import sys
+from src.utils import language_utils
+from src.utils.language_utils import extract_keywords, tokenize
+
+
+def test_english_keywords_skip_stopwords_and_punctuation():
+    keywords = extract_keywords("I have had a terrible headache since Monday, don't know why!")
+
+    assert keywords == ['terrible', 'headache', 'since', 'monday', 'know']
+
+
+def test_swahili_uses_its_own_stopwords():
+    keywords = extract_keywords("Nina maumivu ya kichwa tangu jana na damu nyingi", 'sw')
+
+    assert keywords == ['nina', 'maumivu', 'kichwa', 'jana', 'damu', 'nyingi']
+    assert extract_keywords("", 'sw') == []
+
+
+def test_tokenizer_keeps_apostrophes_and_drops_digits():
+    assert tokenize("Can't sleep 2 nights, 38.5C fever") == ["can't", 'sleep', 'nights', 'c', 'fever']
+
+
+def test_nltk_is_not_imported_by_default():
+    assert language_utils.USE_NLTK is False
+    result = subprocess.run(
+        [sys.executable, '-c', "import sys, src.utils.language_utils; print('nltk' in sys.modules)"],
+        capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == 'False'
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Intent Router Tests for MAMA-AI
+Checks word-boundary routing and priority order of the shared intent table.
+"""
+
+from src.services import intent_router
+from src.services.intent_router import Intent, IntentRouter, get_intent_router
+
+
+def route_name(text, contexts):
+    route = get_intent_router().route(text, contexts)
+    return route.intent.name if route.intent else None
+
+
+def test_greeting_does_not_match_inside_words():
+    assert route_name("this thing", ('text',)) is None
+    assert route_name("hi mama", ('text',)) == 'greeting'
+    assert route_name("Habari yako", ('text',)) == 'greeting'
+
+
+def test_sms_commands_take_priority_over_free_text():
+    assert route_name("help me please", ('sms', 'text')) == 'help'
+    assert route_name("stop", ('sms', 'text')) == 'stop'
+    assert route_name("hi, when is my clinic visit", ('sms', 'text')) == 'appointment'
+    assert route_name("hello there", ('sms', 'text')) == 'greeting'
+
+
+def test_symptoms_outrank_greeting_and_appointments():
+    assert route_name("hi, I have pain", ('text',)) == 'symptoms'
+    assert route_name("nina maumivu, nataka miadi", ('sms', 'text')) == 'symptoms'
+
+
+def test_context_fallback_and_defaults():
+    router = get_intent_router()
+
+    sms_route = router.route("hello", ('sms', 'text'))
+    assert sms_route.context == 'text'
+    assert sms_route.handler == '_greeting_response'
+
+    default_route = router.route("asdf", ('sms', 'text'))
+    assert default_route.intent is None
+    assert default_route.handler == '_default_response'
+
+    question_route = router.route("is it safe to eat eggs", ('question',))
+    assert question_route.handler == '_safety_advice'
+    assert router.route("which foods are best", ('question',)).handler == '_food_advice'
+
+
+def test_custom_table_is_compiled_once(monkeypatch):
+    compiled = []
+
+    class CountingMatcher(intent_router.KeywordMatcher):
+        def __init__(self, lexicon, whole_words=False):
+            compiled.append(lexicon)
+            super().__init__(lexicon, whole_words)
+
+    monkeypatch.setattr(intent_router, 'KeywordMatcher', CountingMatcher)
+    table = (
+        Intent('kicks', 10, {'en': ('kicks',), 'sw': ('mateke',)}, {'text': '_kick_advice'}, False),
+        Intent('baby', 20, {'en': ('baby',), 'sw': ('mtoto',)}, {'text': '_baby_advice'}, False),
+    )
+    router = IntentRouter(table)
+
+    assert router.route("mtoto anapiga mateke", ('text',)).handler == '_kick_advice'
+    assert router.route("my baby", ('text',)).intent.name == 'baby'
+    assert router.route("hi mama", ('text',)).intent is None
+    assert compiled == [{'kicks': ('kicks', 'mateke'), 'baby': ('baby', 'mtoto')}]
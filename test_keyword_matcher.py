@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Tests for MAMA-AI
+Checks the compiled triage automaton against the substring semantics it replaces.
+"""
+
+import pytest
+from src.utils.keyword_matcher import KeywordMatcher, KeywordMatch
+from src.utils.fuzzy_index import DeletionIndex
+from src.services.ai_service import (
+    get_triage_matcher, top_tier, TOPIC_TIERS, analyze_message, reset_matchers
+)
+
+
+def test_reports_every_keyword_with_label_and_position():
+    matcher = KeywordMatcher({'emergency': ['severe bleeding'], 'high_risk': ['bleeding']})
+
+    matches = matcher.find_all("I have Severe Bleeding")
+
+    assert KeywordMatch('severe bleeding', 'emergency', 7, 22) in matches
+    assert KeywordMatch('bleeding', 'high_risk', 14, 22) in matches
+    assert len(matches) == 2
+
+
+def test_overlapping_keywords_use_failure_links():
+    matcher = KeywordMatcher({'a': ['he', 'she', 'his', 'hers']})
+
+    found = sorted((m.keyword, m.start) for m in matcher.find_all("ushers"))
+
+    assert found == [('he', 2), ('hers', 2), ('she', 1)]
+
+
+def test_whole_words_skips_hits_inside_longer_words():
+    matcher = KeywordMatcher({'greeting': ['hi']}, whole_words=True)
+
+    assert matcher.labels("this is it") == set()
+    assert matcher.labels("hi there") == {'greeting'}
+    assert matcher.labels("oh, hi!") == {'greeting'}
+
+
+def test_triage_tiers_match_previous_substring_checks():
+    matcher = get_triage_matcher()
+
+    assert top_tier(matcher.find_all("I have heavy bleeding")) == 'emergency'
+    assert top_tier(matcher.find_all("some spotting today")) == 'high_risk'
+    assert top_tier(matcher.find_all("nina maumivu ya mgongo")) == 'back_pain'
+    assert top_tier(matcher.find_all("morning sickness again")) == 'nausea'
+    assert top_tier(matcher.find_all("vomiting since morning"), TOPIC_TIERS) == 'nausea'
+    assert top_tier(matcher.find_all("all good today")) is None
+
+
+def test_deletion_index_catches_typos_within_allowed_distance():
+    index = DeletionIndex({'emergency': ['damu nyingi', 'fever'], 'high_risk': ['bleeding']})
+
+    assert [(m.keyword, m.distance) for m in index.find_all("bleedin")] == [('bleeding', 1)]
+    assert index.find_all("damu nyinyi")[0].label == 'emergency'
+    # Short terms are exact-only so ordinary words do not trigger alerts
+    assert index.find_all("I never said that") == []
+
+
+def test_long_messages_scan_the_priority_label_first():
+    index = DeletionIndex({'emergency': ['damu nyingi'], 'high_risk': ['bleeding']},
+                          max_queries=34, priority=('emergency',))
+    message = "bleedin " + "kidogo " * 30 + "damu nyinyi"
+
+    assert [match.label for match in index.find_all(message)] == ['emergency']
+    assert index.stats()['truncated'] == 1
+    assert [match.label for match in index.find_all("bleedin and damu nyinyi")] == ['emergency', 'high_risk']
+    assert index.stats()['truncated'] == 1
+
+
+def test_typos_reach_the_triage_tier():
+    reset_matchers()
+    assert top_tier(analyze_message("bad hedache today").triage_matches) == 'high_risk'
+    assert top_tier(analyze_message("damu nyngi").triage_matches) == 'emergency'
+    assert top_tier(analyze_message("severe bleedng").triage_matches) == 'emergency'
+
+
+def test_known_words_are_not_corrected():
+    index = DeletionIndex({'emergency': ['severe bleeding'], 'high_risk': ['bleeding', 'swelling']},
+                          known_words={'selling', 'breeding'})
+
+    assert index.find_all("I am selling vegetables") == []
+    assert index.find_all("severe breeding") == []
+    assert [m.keyword for m in index.find_all("my feet are swellng")] == ['swelling']
+
+
+@pytest.mark.parametrize('text', [
+    "I am selling vegetables", "the kitchen is smelling of smoke", "we went camping",
+    "stop spitting on the floor", "cattle breeding at home", "damu nyinyi",
+])
+def test_real_words_do_not_reach_the_triage_tier(text):
+    reset_matchers()
+    assert analyze_message(text).triage_matches == ()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Kick Count Tests for MAMA-AI
+Checks the append-only movement series, its rolling aggregates and trend escalation.
+"""
+
+from datetime import date, datetime, timedelta
+import pytest
+from sqlalchemy import insert
+from src.models import db, User, Pregnancy, KickCount, KickTrend, EmergencyAlert
+from src.services import alert_service, kick_counts
+from src.services.ai_service import AIService
+from src.services.kick_counts import get_kick_trend, parse_bucket, record_kick_count
+from src.utils.response_registry import response_text
+
+START = datetime(2025, 6, 1, 9, 0)
+
+
+pytestmark = pytest.mark.usefixtures('journals')
+
+
+@pytest.fixture
+def user(app):
+    user = User(phone_number='+254700000001', preferred_language='en')
+    db.session.add(user)
+    db.session.commit()
+    db.session.add(Pregnancy(user_id=user.id, due_date=date(2025, 8, 1), weeks_pregnant=31))
+    db.session.commit()
+    return user
+
+
+def test_parse_bucket_accepts_only_menu_choices():
+    assert [parse_bucket(answer) for answer in ('1', ' 2', '3')] == [1, 2, 3]
+    assert parse_bucket('4') is None
+    assert parse_bucket('many') is None
+
+
+def test_rolling_aggregates_match_a_history_scan(user):
+    buckets = [3, 3, 2, 3, 2, 2, 3, 3, 2, 2, 1, 2, 2, 3, 2, 2, 3, 2]
+    for day, bucket in enumerate(buckets):
+        trend = record_kick_count(user.id, bucket, START + timedelta(days=day))
+    today = (START + timedelta(days=len(buckets) - 1)).date()
+
+    def scan(first_day, last_day):
+        rows = [row.bucket for row in KickCount.query.filter_by(user_id=user.id)
+                if first_day <= (today - row.recorded_at.date()).days <= last_day]
+        return sum(rows) / len(rows)
+
+    assert KickCount.query.count() == len(buckets)
+    assert trend.mean_7d == pytest.approx(scan(0, 6))
+    assert trend.previous_mean_7d == pytest.approx(scan(7, 13))
+    assert trend.trend == pytest.approx(scan(0, 6) - scan(7, 13), abs=1e-3)
+    assert trend.reports_7d == 7 and trend.reports == len(buckets)
+    assert get_kick_trend(user.id, today) == trend
+
+
+def test_reads_age_the_window_without_new_reports(user):
+    record_kick_count(user.id, 3, START)
+    record_kick_count(user.id, 2, START + timedelta(hours=5))
+
+    assert get_kick_trend(user.id, START.date()).mean_7d == 2.5
+    later = get_kick_trend(user.id, START.date() + timedelta(days=8))
+    assert later.mean_7d is None and later.previous_mean_7d == 2.5
+    assert get_kick_trend(user.id, START.date() + timedelta(days=30)).previous_mean_7d is None
+
+
+def test_falling_trend_escalates_with_enough_reports(user):
+    for day in range(7):
+        record_kick_count(user.id, 3, START + timedelta(days=day))
+    trend = record_kick_count(user.id, 2, START + timedelta(days=14))
+    assert trend.trend == -1 and not trend.escalate  # one report is not a trend yet
+    trend = record_kick_count(user.id, 2, START + timedelta(days=15))
+    assert trend.trend == -1 and trend.escalate
+
+
+def test_low_reports_in_a_row_escalate_through_ussd_answer(user):
+    service = AIService()
+
+    assert service.analyze_baby_movement('1', user) == response_text('movement_low', 'en')
+    assert service.analyze_baby_movement('1', user) == response_text('movement_declining', 'en')
+    assert service.analyze_baby_movement('1', user) == response_text('movement_declining', 'en')
+    assert service.analyze_baby_movement('3', user) == response_text('movement_good', 'en')
+    assert service.analyze_baby_movement('9', user) == response_text('movement_good', 'en')
+
+    alert_service.get_alert_journal().flush()
+    alert = EmergencyAlert.query.one()
+    assert alert.alert_type == 'reduced_movement_trend'
+    assert alert.occurrences == 2
+    assert alert.severity_score == 8
+    assert 'late_reduced_movement=1' in alert.severity_features
+    assert KickCount.query.count() == 4
+    assert get_kick_trend(user.id).consecutive_low == 0
+
+
+def test_concurrent_first_reports_update_one_trend_row(user, monkeypatch):
+    real_locked_trend = kick_counts._locked_trend
+    calls = []
+
+    def racing_locked_trend(user_id):
+        calls.append(user_id)
+        if len(calls) == 1:
+            # Another request inserts the row after this one looked for it
+            with db.engine.begin() as connection:
+                connection.execute(insert(KickTrend).values(
+                    user_id=user_id, last_report_on=START.date(), day_sums='2' + ',0' * 13,
+                    day_counts='1' + ',0' * 13, consecutive_low=0, reports=1))
+            return None
+        return real_locked_trend(user_id)
+    monkeypatch.setattr(kick_counts, '_locked_trend', racing_locked_trend)
+
+    trend = record_kick_count(user.id, 1, START)
+
+    assert KickTrend.query.one().reports == 2
+    assert KickCount.query.count() == 1
+    assert trend.reports == 2
+    assert len(calls) == 2
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Language Identification Tests for MAMA-AI
+Checks the n-gram naive Bayes model, its saved form and the batch path.
+"""
+
+import pytest
+from src.utils.language_id import NgramLanguageModel, bundled_corpus
+from src.utils.language_utils import LanguageDetector
+
+
+@pytest.fixture(scope='module')
+def model():
+    texts, labels = zip(*bundled_corpus())
+    return NgramLanguageModel.train(texts, labels)
+
+
+MESSAGES = [
+    ("my ankles look puffy tonight", 'en'),
+    ("the nurse said my blood pressure is high", 'en'),
+    ("tumbo linauma sana tangu asubuhi", 'sw'),
+    ("mtoto wangu hachezi kama kawaida", 'sw'),
+    ("nikona headache tangu jana", 'sw'),
+    ("nimebook appointment ya wiki ijayo", 'sw'),
+]
+
+
+def test_detects_english_swahili_and_code_switched_text(model):
+    for text, lang in MESSAGES:
+        predicted, probability = model.predict(text)
+        assert predicted == lang, text
+        assert 0.5 < probability <= 1.0
+
+
+def test_batch_matches_single_text_scoring(model):
+    texts = [text for text, _ in MESSAGES] + ['', '1*2*3', 'zzqx']
+    batch = model.predict_batch(texts)
+
+    assert [lang for lang, _ in batch] == [model.predict(text)[0] for text in texts]
+    for (_, batch_probability), text in zip(batch, texts):
+        assert batch_probability == pytest.approx(model.predict(text)[1], abs=1e-4)
+    assert batch[-3] == ('en', 0.5) and batch[-2] == ('en', 0.5)
+    assert model.predict_batch([]) == []
+
+
+def test_saved_model_scores_the_same(model, tmp_path):
+    path = str(tmp_path / 'langid.npz')
+    model.save(path)
+    loaded = NgramLanguageModel.load(path)
+
+    assert loaded.languages == model.languages
+    for text, _ in MESSAGES:
+        assert loaded.scores(text) == pytest.approx(model.scores(text))
+
+
+def test_language_detector_uses_the_model(model):
+    detector = LanguageDetector(model)
+
+    assert detector.detect_language('') == 'en'
+    assert detector.detect_language("habari, nina maumivu ya mgongo") == 'sw'
+    assert detector.detect_batch(["good morning doctor", "asante sana"]) == ['en', 'sw']
+    confidence = detector.get_confidence("asante sana", 'sw')
+    assert confidence > 0.5
+    assert detector.get_confidence("asante sana", 'en') == pytest.approx(1 - confidence, abs=1e-6)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Language Auto-Switch Tests for MAMA-AI
+Checks the per-user language estimate, its hysteresis and the single preference write.
+"""
+
+import pytest
+from sqlalchemy import event
+from src.models import db, User
+from src.services.language_switch import LanguageTracker, reset_language_tracker
+from src.services.sms_service import SMSService
+from src.utils.response_registry import render_response
+
+SWAHILI = ["nina maumivu ya mgongo sana", "tumbo linauma tangu asubuhi",
+           "nimechoka sana leo", "mtoto anacheza sana usiku"]
+ENGLISH = ["my back hurts a lot", "i feel very tired today",
+           "the baby is kicking a lot tonight", "when is my next clinic visit"]
+
+
+@pytest.fixture(autouse=True)
+def fresh_tracker():
+    yield
+    reset_language_tracker()
+
+
+@pytest.fixture
+def user(app):
+    user = User(phone_number='+254700000001', preferred_language='en')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def user_updates(app):
+    updates = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('UPDATE users'):
+            updates.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    yield updates
+    event.remove(db.engine, 'before_cursor_execute', count)
+
+
+def test_switches_once_after_consistent_messages(user, user_updates):
+    tracker = LanguageTracker()
+
+    switched = [tracker.observe(user, text) for text in SWAHILI]
+
+    assert switched == [None, None, 'sw', None]
+    assert db.session.get(User, user.id).preferred_language == 'sw'
+    assert len(user_updates) == 1
+    assert tracker.stats()['switches'] == 1
+
+
+def test_mixed_messages_do_not_flip_the_preference(user, user_updates):
+    tracker = LanguageTracker()
+
+    for swahili, english in zip(SWAHILI, ENGLISH):
+        assert tracker.observe(user, swahili) is None
+        assert tracker.observe(user, english) is None
+
+    assert user.preferred_language == 'en'
+    assert user_updates == []
+
+
+def test_commands_and_unknown_text_are_not_scored(user):
+    tracker = LanguageTracker()
+
+    for text in ('HELP', '1', '123 456', ''):
+        assert tracker.observe(user, text) is None
+    assert tracker.stats()['size'] == 0
+
+
+def test_preference_changed_elsewhere_restarts_the_estimate(user):
+    tracker = LanguageTracker()
+    tracker.observe(user, SWAHILI[0])
+    tracker.observe(user, SWAHILI[1])
+
+    user.preferred_language = 'sw'  # e.g. chosen from the USSD settings menu
+    db.session.commit()
+    assert tracker.estimate(user).weights == {'en': 0.0, 'sw': 1.0}
+    assert tracker.estimate(user).messages == 0
+
+
+def test_incoming_sms_is_answered_in_the_detected_language(user, monkeypatch):
+    sent = []
+    monkeypatch.setattr(SMSService, 'send_sms', lambda self, phone, message: sent.append(message))
+    service = SMSService()
+
+    for text in ["habari yako dada", "habari za asubuhi leo", "habari za jioni mama"]:
+        service.handle_incoming_sms(user.phone_number, '985', text, None)
+
+    assert user.preferred_language == 'sw'
+    assert sent[0] == render_response('greeting', 'en', name='Mama')
+    assert sent[-1] == render_response('greeting', 'sw', name='Mama')
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Lexicon Bundle Tests for MAMA-AI
+Checks compiling the keyword/content bundle, mapping it and hot-swapping new versions.
+"""
+
+import json
+import os
+import pytest
+from src.services.ai_service import analyze_message, top_tier
+from src.utils import lexicon_bundle
+from src.utils.language_utils import get_translation, get_emergency_keywords
+from src.utils.lexicon_bundle import (
+    Lexicon, LexiconError, LexiconStore, compile_bundle, load_source, reset_lexicon_store
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def write_bundle(path, version, extra_emergency=(), main_menu=None):
+    bundle = load_source()
+    bundle['version'] = version
+    bundle['triage']['emergency'] += list(extra_emergency)
+    if main_menu:
+        bundle['translations']['en']['main_menu'] = main_menu
+    path.write_text(json.dumps(bundle), encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def store(tmp_path):
+    clock = FakeClock()
+    source = write_bundle(tmp_path / 'lexicon.json', 1)
+    compile_bundle(str(source), str(tmp_path / 'lexicon.bin'))
+    store = LexiconStore(path=str(tmp_path / 'lexicon.bin'), source=str(source), check_interval=5, clock=clock)
+    store.clock = clock
+    reset_lexicon_store(store)
+    yield store
+    reset_lexicon_store()
+
+
+def test_artifact_round_trips_the_normalised_bundle(tmp_path):
+    source = tmp_path / 'lexicon.json'
+    bundle = load_source()
+    bundle['triage']['high_risk'].append('  Itchy Palms ')
+    bundle['triage']['high_risk'].append('itchy palms')
+    source.write_text(json.dumps(bundle), encoding='utf-8')
+
+    compile_bundle(str(source), str(tmp_path / 'lexicon.bin'))
+    lexicon = Lexicon.open(str(tmp_path / 'lexicon.bin'))
+
+    assert lexicon.version == bundle['version']
+    assert lexicon.triage['high_risk'][-1] == 'itchy palms'
+    assert lexicon.triage['high_risk'].count('itchy palms') == 1
+    assert lexicon.translations == load_source()['translations']
+    assert lexicon.section('triage') is lexicon.triage
+
+
+def test_messages_are_read_in_place_per_language(tmp_path):
+    source = tmp_path / 'lexicon.json'
+    bundle = load_source()
+    bundle['translations']['luo'] = {'main_menu': "Oyawore MAMA-AI", 'ñ_key': "ŋ"}
+    bundle['translations']['en']['ñ_key'] = "n"
+    source.write_text(json.dumps(bundle), encoding='utf-8')
+    compile_bundle(str(source), str(tmp_path / 'lexicon.bin'))
+
+    lexicon = Lexicon.open(str(tmp_path / 'lexicon.bin'))
+    luo = lexicon.messages['luo']
+
+    assert set(lexicon.languages) == {'en', 'sw', 'luo'}
+    assert len(luo) == 2
+    assert luo.get('main_menu') == "Oyawore MAMA-AI"
+    assert luo.get('ñ_key') == "ŋ"
+    assert luo.get('help_text') is None and 'help_text' not in luo
+    assert lexicon.messages['sw'].get('next_appointment') == bundle['translations']['sw']['next_appointment']
+
+
+def test_malformed_bundles_and_artifacts_are_rejected(tmp_path):
+    source = tmp_path / 'lexicon.json'
+    source.write_text(json.dumps({'version': 2, 'triage': {'emergency': ['x']}}), encoding='utf-8')
+    with pytest.raises(LexiconError):
+        compile_bundle(str(source), str(tmp_path / 'lexicon.bin'))
+    assert not (tmp_path / 'lexicon.bin').exists()
+
+    (tmp_path / 'junk.bin').write_bytes(b'not a lexicon at all')
+    with pytest.raises(LexiconError):
+        Lexicon.open(str(tmp_path / 'junk.bin'))
+
+
+def test_new_version_is_swapped_in_after_the_check_interval(store, tmp_path):
+    message = "i think i am having an eclampsia fit"
+    assert store.current().version == 1
+    assert top_tier(analyze_message(message).triage_matches) is None
+
+    source = write_bundle(tmp_path / 'v2.json', 2, ['eclampsia fit'], "MAMA-AI v2 menu")
+    compile_bundle(str(source), store.path)
+    assert store.current().version == 1  # not checked again yet
+
+    store.clock.now += 5
+    assert store.current().version == 2
+    assert store.swaps == 1
+    assert top_tier(analyze_message(message).triage_matches) == 'emergency'
+    assert get_translation('en', 'main_menu', '') == "MAMA-AI v2 menu"
+    assert 'dharura' in get_emergency_keywords()['sw']
+
+
+def test_bad_artifact_keeps_the_current_version(store, tmp_path):
+    store.current()
+    (tmp_path / 'junk.bin').write_bytes(b'MAMALEX1 truncated')
+    os.replace(tmp_path / 'junk.bin', tmp_path / 'lexicon.bin')
+
+    store.clock.now += 5
+    assert store.current().version == 1
+    assert store.errors == 1
+
+
+def test_missing_artifact_is_compiled_on_first_use(tmp_path):
+    store = LexiconStore(path=str(tmp_path / 'sub' / 'lexicon.bin'))
+
+    lexicon = store.current()
+    assert lexicon.origin == store.path
+    assert lexicon.version == load_source(lexicon_bundle.LEXICON_SOURCE)['version']
+
+
+def test_artifact_older_than_the_source_is_recompiled(tmp_path):
+    compile_bundle(str(write_bundle(tmp_path / 'old.json', 1)), str(tmp_path / 'lexicon.bin'))
+    source = write_bundle(tmp_path / 'lexicon.json', 3, main_menu="MAMA-AI v3 menu")
+    store = LexiconStore(path=str(tmp_path / 'lexicon.bin'), source=str(source))
+
+    lexicon = store.current()
+    assert (lexicon.version, lexicon.origin) == (3, store.path)
+    assert lexicon.messages['en'].get('main_menu') == "MAMA-AI v3 menu"
+    assert Lexicon.open(store.path).version == 3
+
+
+def test_stale_artifact_that_cannot_be_rewritten_falls_back_to_the_source(tmp_path, monkeypatch):
+    compile_bundle(str(write_bundle(tmp_path / 'old.json', 1)), str(tmp_path / 'lexicon.bin'))
+    source = write_bundle(tmp_path / 'lexicon.json', 3)
+    store = LexiconStore(path=str(tmp_path / 'lexicon.bin'), source=str(source))
+
+    def read_only(*args):
+        raise PermissionError("read-only file system")
+    monkeypatch.setattr(lexicon_bundle, 'compile_bundle', read_only)
+
+    lexicon = store.current()
+    assert (lexicon.version, lexicon.origin) == (3, str(source))
+
+
+def test_invalid_newer_source_keeps_the_artifact(tmp_path):
+    compile_bundle(str(write_bundle(tmp_path / 'old.json', 1)), str(tmp_path / 'lexicon.bin'))
+    source = tmp_path / 'lexicon.json'
+    source.write_text(json.dumps({'version': 3}), encoding='utf-8')
+    store = LexiconStore(path=str(tmp_path / 'lexicon.bin'), source=str(source), check_interval=0)
+
+    assert store.current().version == 1
+    assert store.current().version == 1
+    assert store.errors == 1
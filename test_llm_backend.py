@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+LLM Backend Tests for MAMA-AI
+Runs the model gateway against a local stub server that injects latency and
+errors, and checks budgets, keyword fallback and prompt coalescing.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.services.ai_service import AIService, fit_ussd
+from src.services.llm_backend import LLMBackend, LLMGateway, OpenAIBackend, set_llm_gateway
+from src.utils.weekly_content import USSD_MAX_LENGTH
+
+
+class StubModelServer(ThreadingHTTPServer):
+    """OpenAI-compatible chat completions server with adjustable delay and status"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.delay = 0.0
+        self.status = 200
+        self.requests = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append(payload)
+        time.sleep(self.server.delay)
+
+        prompt = payload['messages'][-1]['content']
+        body = json.dumps({'choices': [{'message': {'content': f"model: {prompt}"}}]}).encode()
+        self.send_response(self.server.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeUser:
+    id = 1
+    name = 'Amina'
+    preferred_language = 'en'
+
+
+@pytest.fixture
+def server():
+    server = StubModelServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def gateway(server):
+    backend = OpenAIBackend('test-key', base_url=server.url, timeout=5)
+    gateway = LLMGateway(backend, budgets={'ussd': 0.3, 'chat': 2}, max_workers=2, max_pending=4)
+    yield gateway
+    gateway.shutdown()
+
+
+def test_answer_comes_from_the_model_within_budget(gateway, server):
+    answer = gateway.ask("can I drink tea?", 'chat', lambda: 'keyword')
+
+    assert answer == "model: can I drink tea?"
+    assert server.requests[0]['model'] == 'gpt-3.5-turbo'
+    assert gateway.stats()['answered'] == 1
+
+
+def test_slow_model_falls_back_inside_the_ussd_budget(gateway, server):
+    server.delay = 1.0
+
+    start = time.perf_counter()
+    answer = gateway.ask("can I drink tea?", 'ussd', lambda: 'keyword')
+
+    assert answer == 'keyword'
+    assert time.perf_counter() - start < 0.6
+    assert gateway.stats()['timeouts'] == 1
+
+
+def test_server_errors_fall_back_to_keywords(gateway, server):
+    server.status = 500
+
+    assert gateway.ask("can I drink tea?", 'chat', lambda: 'keyword') == 'keyword'
+    assert gateway.stats()['errors'] == 1
+
+
+def test_identical_concurrent_prompts_share_one_call(gateway, server):
+    server.delay = 0.3
+    answers = []
+    threads = [
+        threading.Thread(target=lambda: answers.append(gateway.ask("is fish safe?", 'chat', lambda: 'keyword')))
+        for _ in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert answers == ["model: is fish safe?"] * 6
+    assert len(server.requests) == 1
+    assert gateway.stats()['coalesced'] == 5
+
+
+def test_full_pool_rejects_instead_of_queueing(gateway, server):
+    server.delay = 0.5
+    for i in range(4):
+        threading.Thread(target=gateway.ask, args=(f"question {i}", 'chat', lambda: 'keyword')).start()
+    time.sleep(0.1)
+
+    start = time.perf_counter()
+    assert gateway.ask("one more", 'chat', lambda: 'keyword') == 'keyword'
+    assert time.perf_counter() - start < 0.1
+    assert gateway.stats()['rejected'] == 1
+
+
+def test_ai_service_keeps_danger_signs_off_the_model(gateway, server):
+    set_llm_gateway(gateway)
+    service = AIService()
+    try:
+        assert service.answer_with_model("what fruit is good?", FakeUser(), 'chat',
+                                         lambda: 'keyword') == "model: what fruit is good?"
+        assert service.answer_with_model("heavy bleeding", FakeUser(), 'chat',
+                                         lambda: 'keyword') == 'keyword'
+        assert len(server.requests) == 1
+    finally:
+        set_llm_gateway(None)
+
+
+def test_backends_must_implement_complete():
+    class Incomplete(LLMBackend):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        Incomplete('key', base_url='http://localhost')
+
+
+def test_ussd_model_answers_fit_one_screen(gateway, server):
+    set_llm_gateway(gateway)
+    service = AIService()
+    question = "Is it safe to drink tea? " * 8
+    try:
+        answer = service.answer_with_model(question, FakeUser(), 'ussd', lambda: 'keyword')
+        long_answer = service.answer_with_model("x" * 200 + " why", FakeUser(), 'ussd', lambda: 'keyword')
+    finally:
+        set_llm_gateway(None)
+
+    assert len(answer) <= USSD_MAX_LENGTH
+    assert answer.startswith("model: Is it safe to drink tea? Is it safe")
+    assert answer.endswith("?")
+    assert fit_ussd("one. two. three.", 10) == "one. two."
+    assert len(long_answer) <= USSD_MAX_LENGTH and long_answer.endswith('…')
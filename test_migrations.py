@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Migration Tests for MAMA-AI
+Checks that the Alembic revisions build the schema the models describe, and
+that databases created by create_all before migrations upgrade in place.
+"""
+
+import os
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import Migrate, upgrade
+from sqlalchemy import text
+from src.models import db
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+BASELINE = 'e0376b8cfb0e'
+
+
+@pytest.fixture
+def app(bare_app):
+    Migrate(bare_app, db, directory=MIGRATIONS, render_as_batch=True)
+    return bare_app
+
+
+def test_head_matches_the_models(app):
+    upgrade(directory=MIGRATIONS)
+
+    with db.engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), db.metadata) == []
+
+
+def test_pre_migration_database_upgrades_in_place(app):
+    # What `init-db` used to leave behind: the original tables and no version
+    upgrade(directory=MIGRATIONS, revision=BASELINE)
+    with db.engine.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+        connection.execute(text("INSERT INTO users (id, phone_number) VALUES (1, '+254700000001')"))
+        connection.execute(text("INSERT INTO emergency_alerts (user_id, alert_type, created_at) "
+                                "VALUES (1, 'severe_symptoms', '2025-01-01 08:00:00')"))
+        connection.execute(text("INSERT INTO pregnancies (user_id, due_date) VALUES (1, '2026-01-01')"))
+
+    upgrade(directory=MIGRATIONS)
+
+    with db.engine.connect() as connection:
+        assert connection.execute(text("SELECT occurrences, last_seen_at IS NOT NULL FROM emergency_alerts")).one() == (1, 1)
+        assert connection.execute(text("SELECT is_past_term FROM pregnancies")).scalar() == 0
+        assert connection.execute(text("SELECT count(*) FROM kick_trends")).scalar() == 0
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Phone Number Normalizer Tests for MAMA-AI
+Checks E.164 normalization for the default and other regions, the cached
+single path, the bulk path and region-aware validation.
+"""
+
+import pytest
+from src.utils import phone
+from src.utils.language_utils import format_phone_number, validate_phone_number
+from src.utils.phone import normalize_many, normalize_phone, phone_cache_stats, reset_phone_cache
+
+KENYAN = ['0712345678', '0712 345 678', '712345678', '254712345678', '+254712345678',
+          '+254 712-345-678', '+254 (0)712345678']
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    reset_phone_cache()
+    yield
+    reset_phone_cache()
+
+
+def test_kenyan_forms_normalize_to_one_number():
+    assert {normalize_phone(number) for number in KENYAN} == {'+254712345678'}
+    assert format_phone_number('0712 345 678') == '+254712345678'
+
+
+def test_national_numbers_follow_the_region():
+    assert normalize_phone('0772123456', 'UG') == '+256772123456'
+    assert normalize_phone('(650) 253-0000', 'US') == '+16502530000'
+    assert normalize_phone('+255 712 345 678') == '+255712345678'
+
+
+def test_region_default_is_configurable(monkeypatch):
+    monkeypatch.setattr(phone, 'DEFAULT_PHONE_REGION', 'TZ')
+
+    assert normalize_phone('0712345678') == '+255712345678'
+
+
+def test_unparseable_senders_keep_a_stable_key():
+    assert normalize_phone('MAMA-AI') == 'MAMAAI'
+    assert normalize_phone('') == ''
+
+
+def test_single_path_is_cached():
+    before = phone_cache_stats()
+    normalize_phone('0712345678')
+    normalize_phone('0712345678')
+
+    after = phone_cache_stats()
+    assert (after['hits'] - before['hits'], after['misses'] - before['misses']) == (1, 1)
+
+
+def test_normalize_many_matches_the_single_path():
+    numbers = KENYAN + ['+16502530000', '0202345678', '07123', 'MAMA-AI', '', '0712345678']
+
+    assert normalize_many(numbers) == [normalize_phone(number) for number in numbers]
+    assert normalize_many(['0772123456'], 'UG') == ['+256772123456']
+
+
+def test_validation_is_region_aware():
+    assert validate_phone_number('0712345678')
+    assert not validate_phone_number('07123')
+    assert not validate_phone_number('+256772123456')
+    assert validate_phone_number('+256772123456', 'UG')
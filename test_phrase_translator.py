@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Phrase Translator Tests for MAMA-AI
+Checks single-pass, word-boundary, case-preserving phrase substitution and
+loading phrase tables from a file.
+"""
+
+import json
+import pytest
+from src.utils import phrase_translator
+from src.utils.language_utils import translate_text
+from src.utils.phrase_translator import PhraseTableError, PhraseTranslator, load_phrase_tables, reset_translators
+
+
+@pytest.fixture(autouse=True)
+def bundled_tables():
+    reset_translators()
+    yield
+    reset_translators()
+
+
+def test_whole_words_only():
+    assert translate_text("This was helpful, please help", 'sw') == "This was helpful, please msaada"
+    assert translate_text("babyhood baby's pain", 'sw') == "babyhood mtoto's maumivu"
+
+
+def test_case_is_preserved():
+    assert translate_text("Hello Doctor, this is an EMERGENCY", 'sw') == "Halo Daktari, this is an DHARURA"
+
+
+def test_longest_phrase_wins_and_spacing_is_flexible():
+    translator = PhraseTranslator({'thank': 'shukuru', 'thank you': 'asante', 'you': 'wewe'})
+
+    assert translator.translate("Thank  you, thank me, you") == "Asante, shukuru me, wewe"
+
+
+def test_replacements_are_not_translated_again():
+    translator = PhraseTranslator({'pain': 'maumivu', 'maumivu': 'pain'})
+
+    assert translator.translate("pain maumivu") == "maumivu pain"
+
+
+def test_english_and_unknown_languages_are_unchanged():
+    assert translate_text("Hello HELP", 'en') == "Hello HELP"
+    assert translate_text("Hello HELP", 'luo') == "Hello HELP"
+
+
+def test_translate_many_matches_translate():
+    translator = PhraseTranslator(load_phrase_tables()['sw'])
+    texts = ["Hello mother", "Call the doctor", "Hello mother"]
+
+    assert translator.translate_many(texts) == [translator.translate(text) for text in texts]
+
+
+def test_tables_load_from_a_file(tmp_path, monkeypatch):
+    path = tmp_path / 'phrases.json'
+    path.write_text(json.dumps({'sw': {'clinic': 'kliniki'}}), encoding='utf-8')
+    monkeypatch.setattr(phrase_translator, 'PHRASES_PATH', str(path))
+    reset_translators()
+
+    assert translate_text("Go to the Clinic", 'sw') == "Go to the Kliniki"
+
+    path.write_text(json.dumps({'sw': ['clinic']}), encoding='utf-8')
+    with pytest.raises(PhraseTableError):
+        load_phrase_tables(str(path))
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Pregnancy Weeks Job Tests for MAMA-AI
+Checks the set-based weeks_pregnant recompute against the per-row formula.
+"""
+
+from datetime import date, timedelta
+from src.models import db, User, Pregnancy
+from src.jobs.pregnancy_weeks import gestational_week, recompute_pregnancy_weeks
+
+TODAY = date(2025, 6, 1)
+
+
+def test_gestational_week_formula():
+    assert gestational_week(TODAY + timedelta(days=280), TODAY) == 0
+    assert gestational_week(TODAY + timedelta(days=140), TODAY) == 20
+    assert gestational_week(TODAY + timedelta(days=141), TODAY) == 19
+    assert gestational_week(TODAY, TODAY) == 40
+    assert gestational_week(TODAY - timedelta(days=400), TODAY) == 42
+
+
+def test_set_based_update_matches_formula_across_chunks(app):
+    user = User(phone_number='+254700000001')
+    db.session.add(user)
+    db.session.commit()
+    offsets = range(-40, 300, 3)
+    db.session.add_all(
+        Pregnancy(user_id=user.id, due_date=TODAY + timedelta(days=offset), weeks_pregnant=20)
+        for offset in offsets
+    )
+    db.session.add(Pregnancy(user_id=user.id, due_date=TODAY, weeks_pregnant=7, is_active=False))
+    db.session.commit()
+
+    changed = recompute_pregnancy_weeks(today=TODAY, chunk_size=17)
+
+    for pregnancy in Pregnancy.query.filter_by(is_active=True):
+        assert pregnancy.weeks_pregnant == gestational_week(pregnancy.due_date, TODAY)
+        assert pregnancy.is_past_term == (pregnancy.due_date <= TODAY - timedelta(days=14))
+    assert Pregnancy.query.filter_by(is_active=False).one().weeks_pregnant == 7
+    # Rows already at week 20 and not past term are left alone
+    expected = sum(
+        1 for offset in offsets
+        if gestational_week(TODAY + timedelta(days=offset), TODAY) != 20 or offset <= -14
+    )
+    assert changed == expected
+
+    # Nothing to do until the calendar moves on
+    assert recompute_pregnancy_weeks(today=TODAY, chunk_size=17) == 0
+    assert recompute_pregnancy_weeks(today=TODAY + timedelta(days=7)) > 0
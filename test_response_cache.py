@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Response Cache Tests for MAMA-AI
+Checks question fingerprints, the byte cap, the shared tier and which model answers get cached.
+"""
+
+import pytest
+from src.services.ai_service import AIService
+from src.services.llm_backend import LLMBackend, LLMError, LLMGateway, set_llm_gateway
+from src.utils.response_cache import (
+    ResponseCache, get_response_cache, question_fingerprint, reset_response_cache
+)
+from src.utils.ttl_cache import TTLCache
+
+
+class CountingBackend(LLMBackend):
+    name = 'counting'
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    def complete(self, prompt, system=None, history=()):
+        self.calls += 1
+        if self.fail:
+            raise LLMError("down")
+        return f"model: {prompt}"
+
+
+class DictStore:
+    """Stands in for a redis client: get(key) and set(key, value, ex=)"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode('utf-8')
+
+
+class BrokenStore:
+    def get(self, key):
+        raise ConnectionError("shared tier down")
+
+    def set(self, key, value, ex=None):
+        raise ConnectionError("shared tier down")
+
+
+class FakeUser:
+    id = 1
+    name = 'Amina'
+    preferred_language = 'en'
+
+
+@pytest.fixture
+def backend():
+    backend = CountingBackend()
+    set_llm_gateway(LLMGateway(backend))
+    reset_response_cache(ResponseCache())
+    yield backend
+    set_llm_gateway(None)
+    reset_response_cache()
+
+
+def test_fingerprint_ignores_only_case_and_punctuation():
+    assert question_fingerprint("Is it safe to eat eggs?") == question_fingerprint("is it safe to eat eggs")
+    assert question_fingerprint("Naweza kula mayai?", 'sw') == question_fingerprint("naweza kula  mayai", 'sw')
+    assert question_fingerprint("eat eggs", 'en') != question_fingerprint("eat eggs", 'sw')
+    assert question_fingerprint("eat eggs", 'en', 'ussd') != question_fingerprint("eat eggs", 'en', 'chat')
+    assert question_fingerprint("?!") is None
+
+
+@pytest.mark.parametrize('first, second', [
+    ("Can I eat eggs when pregnant?", "When can I eat eggs?"),
+    ("Is bleeding normal when pregnant?", "Is bleeding normal?"),
+    ("How much water should I drink?", "Why should I drink water?"),
+    ("Is week 12 scan needed?", "Is week 20 scan needed?"),
+])
+def test_different_questions_get_different_fingerprints(first, second):
+    assert question_fingerprint(first) != question_fingerprint(second)
+
+
+def test_byte_cap_evicts_least_recently_used():
+    cache = TTLCache(maxsize=100, maxbytes=100, sizeof=lambda key, value: len(value))
+    cache.set('a', 'x' * 40)
+    cache.set('b', 'x' * 40)
+    cache.set('c', 'x' * 40)
+
+    assert cache.get('a') is None
+    assert cache.stats()['bytes'] == 80
+    cache.set('huge', 'x' * 101)
+    assert cache.get('huge') is None
+
+
+def test_shared_tier_warms_other_workers():
+    store = DictStore()
+    first, second = ResponseCache(shared=store), ResponseCache(shared=store)
+    first.set('en:chat:egg', "Eggs are safe when well cooked.")
+
+    assert second.get('en:chat:egg') == "Eggs are safe when well cooked."
+    assert second.get('en:chat:egg') == "Eggs are safe when well cooked."
+    assert second.stats()['shared_hits'] == 1
+    assert second.stats()['hits'] == 1
+    assert second.stats()['hit_rate'] == 1.0
+
+
+def test_shared_tier_failures_are_misses():
+    cache = ResponseCache(shared=BrokenStore())
+    cache.set('k', 'answer')
+
+    assert cache.get('missing') is None
+    assert cache.get('k') == 'answer'
+    assert cache.stats()['shared_errors'] == 2
+
+
+def test_repeat_questions_are_answered_from_cache(backend):
+    service = AIService()
+    first = service.answer_with_model("Is it safe to eat eggs?", FakeUser(), 'chat', lambda: 'keyword')
+    second = service.answer_with_model("is it safe to eat eggs", FakeUser(), 'chat', lambda: 'keyword')
+
+    assert first == second == "model: Is it safe to eat eggs?"
+    assert backend.calls == 1
+
+
+def test_fallbacks_and_danger_signs_are_not_cached(backend):
+    service = AIService()
+    backend.fail = True
+    assert service.answer_with_model("can I eat fish", FakeUser(), 'chat', lambda: 'keyword') == 'keyword'
+    backend.fail = False
+    assert service.answer_with_model("can I eat fish", FakeUser(), 'chat', lambda: 'keyword') == "model: can I eat fish"
+
+    for _ in range(2):
+        assert service.answer_with_model("heavy bleeding", FakeUser(), 'chat', lambda: 'keyword') == 'keyword'
+    assert backend.calls == 2
+    assert len(get_response_cache().local) == 1
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Response Registry Tests for MAMA-AI
+Checks precomputed reply metadata and SMS segment counting.
+"""
+
+from src.utils.response_registry import (
+    RESPONSES, get_response, render_response, describe_message, sms_segments
+)
+
+
+def test_entries_are_precomputed_once():
+    entry = get_response('nausea', 'sw')
+
+    assert entry is RESPONSES[('nausea', 'sw')]
+    assert entry.encoded == entry.text.encode('utf-8')
+    assert entry.length == len(entry.text)
+    assert describe_message(entry.text) is entry
+
+
+def test_missing_language_falls_back_to_english():
+    assert get_response('nausea', 'luo') is get_response('nausea', 'en')
+    assert render_response('greeting', 'luo', name='Amina').startswith("Hello Amina!")
+
+
+def test_greeting_template_is_personalised():
+    assert render_response('greeting', 'sw', name='Amina').startswith("Halo Amina! 👋")
+
+
+def test_sms_segments_follow_gsm7_and_ucs2_limits():
+    assert sms_segments("a" * 160) == 1
+    assert sms_segments("a" * 161) == 2
+    assert sms_segments("€" * 81) == 2
+    assert sms_segments("👋" * 35) == 1
+    assert sms_segments("👋" * 36) == 2
+    assert sms_segments("• " * 40) == 2
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Severity Scoring Tests for MAMA-AI
+Checks weighted keyword scores, co-occurrence and pregnancy-week rules, and scored alerts.
+"""
+
+import pytest
+from datetime import date
+from src.models import db, User, Pregnancy, EmergencyAlert
+from src.services.ai_service import AIService, analyze_message
+from src.services import alert_service
+from src.services.severity import score_matches, open_alert_queue
+
+
+pytestmark = pytest.mark.usefixtures('journals')
+
+
+def _score(text, weeks=None):
+    return score_matches(analyze_message(text).triage_matches, weeks)
+
+
+def test_strongest_keyword_sets_the_base_score():
+    assert _score("heavy bleeding").score == 9
+    assert _score("I feel hot").score == 3
+    assert _score("some spotting").score == 4
+    assert _score("nothing wrong").score == 1
+
+
+def test_co_occurrence_and_pregnancy_week_add_points():
+    score = _score("headache and blurred vision", weeks=32)
+
+    assert score.score == 10
+    assert ('preeclampsia_signs', 2) in score.features
+    assert ('late_pregnancy_preeclampsia', 1) in score.features
+    assert _score("contractions", weeks=30).score > _score("contractions", weeks=39).score
+
+
+def test_typo_matches_weigh_less():
+    assert _score("damu nyngi").score == _score("damu nyingi").score - 1
+
+
+def test_emergency_and_high_risk_alerts_are_scored(app):
+    users = [User(phone_number=f'+25470000000{i}', preferred_language='en') for i in (1, 2)]
+    db.session.add_all(users)
+    db.session.commit()
+    for user in users:
+        db.session.add(Pregnancy(user_id=user.id, due_date=date(2027, 4, 1), weeks_pregnant=12, is_active=True))
+    db.session.commit()
+
+    service = AIService()
+    service.analyze_symptoms("some spotting today", users[0])
+    service.analyze_symptoms("severe bleeding and sharp pain", users[1])
+    assert EmergencyAlert.query.count() == 0
+    alert_service.get_alert_journal().flush()
+
+    queue = open_alert_queue()
+    assert [alert.alert_type for alert in queue] == ['severe_symptoms', 'high_risk_symptoms']
+    assert queue[0].severity_score == 10
+    assert 'bleeding_with_pain=2' in queue[0].severity_features
+    assert queue[1].severity_score == 5
+    assert 'early_pregnancy_bleeding=1' in queue[1].severity_features
+    assert EmergencyAlert.query.count() == 2
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Weekly Content Tests for MAMA-AI
+Checks the 1-42 week table, its SMS/USSD length limits and the weekly SMS push.
+"""
+
+from datetime import date, timedelta
+from src.models import db, User, Pregnancy
+from src.services.ai_service import AIService
+from src.services.sms_service import SMSService
+from src.services.ussd_service import USSDService
+from src.utils.response_registry import describe_message
+from src.utils.weekly_content import WEEKLY_CONTENT, USSD_MAX_LENGTH, weekly_content
+
+
+def test_every_week_has_both_languages_within_channel_limits():
+    assert len(WEEKLY_CONTENT) == 42 * 2
+    for content in WEEKLY_CONTENT.values():
+        assert content.sms.segments == 1, content.sms.text
+        assert content.ussd.length <= USSD_MAX_LENGTH, content.ussd.text
+        assert describe_message(content.sms.text) is content.sms
+
+
+def test_lookup_clamps_weeks_and_falls_back_to_english():
+    assert weekly_content(0).week == 1
+    assert weekly_content(50).week == 42
+    assert weekly_content(20, 'luo') is weekly_content(20, 'en')
+    assert weekly_content(20, 'sw').text.text.startswith("Wiki ya 20 - Miezi Mitatu ya Pili")
+
+
+def test_swahili_users_get_swahili_weekly_info():
+    service = AIService()
+
+    assert service.get_weekly_info(8, 'sw').startswith("Wiki ya 8")
+    assert service.get_weekly_info(30, 'en', 'ussd').startswith("Week 30:")
+
+
+def test_weekly_push_sends_each_week_once(app, monkeypatch):
+    sent = []
+    monkeypatch.setattr(SMSService, 'send_sms',
+                        lambda self, phone, message: sent.append((phone, message)) or {'ok': True})
+    for i, (lang, weeks) in enumerate([('en', 12), ('sw', 12), ('en', None)]):
+        user = User(phone_number=f'+25470000000{i}', preferred_language=lang)
+        db.session.add(user)
+        db.session.commit()
+        db.session.add(Pregnancy(user_id=user.id, due_date=date(2027, 1, 1), weeks_pregnant=weeks))
+    db.session.commit()
+
+    service = SMSService()
+    assert service.send_weekly_updates() == 2
+    assert service.send_weekly_updates() == 0
+    assert sent == [('+254700000000', weekly_content(12, 'en').sms.text),
+                    ('+254700000001', weekly_content(12, 'sw').sms.text)]
+
+    Pregnancy.query.filter_by(weeks_pregnant=12).update({'weeks_pregnant': 13})
+    db.session.commit()
+    assert service.send_weekly_updates() == 2
+
+
+def test_unset_weeks_are_computed_from_the_due_date(app):
+    user = User(phone_number='+254700000009', preferred_language='en')
+    db.session.add(user)
+    db.session.commit()
+    due_date = date.today() + timedelta(weeks=28)    # 12 weeks pregnant
+    db.session.add(Pregnancy(user_id=user.id, due_date=due_date, weeks_pregnant=None, is_active=True))
+    db.session.commit()
+
+    assert AIService()._baby_info(user) == weekly_content(12, 'en').text.text
+    assert USSDService().handle_request('s1', '+254700000009', '1*4', '*384#') == \
+        f"END {weekly_content(12, 'en').ussd.text}"
+
+    Pregnancy.query.update({'weeks_pregnant': 0})
+    db.session.commit()
+    assert AIService()._baby_info(user) == weekly_content(1, 'en').text.text
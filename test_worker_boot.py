@@ -0,0 +1,87 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import pytest
+from src.services.container import ServiceContainer
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Cold-start budget for `import app`, as reported by `python -X importtime`.
+# Measured at ~650 ms on a development machine (Flask-SQLAlchemy and
+# Flask-Migrate are most of it); override on slower CI runners.
+IMPORT_BUDGET_MS = float(os.getenv('APP_IMPORT_BUDGET_MS', '1500'))
+
+# Modules a worker must not pay for until a request needs them
+DEFERRED_MODULES = ('africastalking', 'requests', 'numpy', 'nltk')
+
+REPORT = (
+    "import json, sys, app; "
+    "print(json.dumps({'built': app.services.built(), "
+    "'modules': [name for name in %r if name in sys.modules]}))"
+) % (DEFERRED_MODULES,)
+
+
+@pytest.fixture(scope='module')
+def cold_import(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp('boot')
+    env = dict(os.environ)
+    env.update({
+        'PYTHONPATH': ROOT,
+        'DATABASE_URL': f"sqlite:///{workdir / 'boot.db'}",
+        'ALERT_JOURNAL_PATH': str(workdir / 'alerts.jsonl'),
+        'EMERGENCY_INGRESS_JOURNAL_PATH': str(workdir / 'ingress.jsonl'),
+        'LEXICON_PATH': str(workdir / 'lexicon.bin'),
+        'LANGID_MODEL_PATH': str(workdir / 'langid.npz'),
+        'AFRICASTALKING_API_KEY': 'not-a-real-key',
+        'AFRICASTALKING_USERNAME': 'sandbox',
+    })
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', REPORT], cwd=workdir,
+                            env=env, check=True, capture_output=True, text=True)
+    return workdir, result
+
+
+def import_time_ms(stderr, module):
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and line.endswith(f'| {module}'):
+            return int(line.split('|')[1]) / 1000
+    raise AssertionError(f"{module} not in -X importtime output")
+
+
+def test_import_app_within_budget(cold_import):
+    _, result = cold_import
+    elapsed = import_time_ms(result.stderr, 'app')
+    assert elapsed < IMPORT_BUDGET_MS, f"import app took {elapsed:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
+
+
+def test_import_builds_no_services_and_skips_heavy_modules(cold_import):
+    _, result = cold_import
+    report = json.loads(result.stdout.splitlines()[-1])
+    assert report == {'built': [], 'modules': []}
+
+
+def test_import_creates_no_tables(cold_import):
+    workdir, _ = cold_import
+    database = workdir / 'boot.db'
+    if database.exists():
+        with sqlite3.connect(database) as conn:
+            assert conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall() == []
+
+
+def test_container_builds_each_service_once_and_shares_ai(monkeypatch):
+    monkeypatch.delenv('AFRICASTALKING_API_KEY', raising=False)
+    services = ServiceContainer()
+    assert services.built() == []
+
+    ussd = services.ussd
+    assert services.ussd is ussd
+    assert ussd.ai_service is services.ai
+    assert services.built() == ['ai', 'ussd']
+
+
+def test_container_skips_africastalking_without_credentials(monkeypatch):
+    monkeypatch.delenv('AFRICASTALKING_API_KEY', raising=False)
+    services = ServiceContainer()
+    assert services.at_initialized is False
+    assert services.at_initialized is False